@@ -1,20 +1,167 @@
 import sys
+import math
+import argparse
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
 from openhrv.view import View
 from openhrv.model import Model
+from openhrv.diagnostics import start_logging, stop_logging
+from openhrv.config import (
+    IBI_HISTORY_DURATION,
+    HRV_HISTORY_DURATION,
+    MIN_HISTORY_DURATION,
+    MAX_HISTORY_DURATION,
+    MAX_IBI_HISTORY_DURATION,
+    SCAN_TIMEOUT,
+    STREAM_HOST,
+    RENDERERS,
+    RENDERER,
+    REPLAY_SPEEDS,
+    PROFILE_SHORTCUT,
+)
+
+
+def history_duration(value: str, maximum: int = MAX_HISTORY_DURATION) -> int:
+    duration = int(value)
+    if not MIN_HISTORY_DURATION <= duration <= maximum:
+        raise argparse.ArgumentTypeError(
+            f"must be between {MIN_HISTORY_DURATION} and {maximum} seconds"
+        )
+    return duration
+
+
+def ibi_history_duration(value: str) -> int:
+    return history_duration(value, MAX_IBI_HISTORY_DURATION)
+
+
+def replay_speed(value: str) -> float:
+    if value == "max":
+        return math.inf
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("must be a positive number or 'max'")
+    return speed
+
+
+def parse_args(args: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="openhrv",
+        description="HRV biofeedback training with ECG chest straps.",
+    )
+    parser.add_argument(
+        "--ibi-history",
+        type=ibi_history_duration,
+        metavar="SECONDS",
+        help="duration of the IBI chart"
+        f" (default: last used or {IBI_HISTORY_DURATION})",
+    )
+    parser.add_argument(
+        "--hrv-history",
+        type=history_duration,
+        metavar="SECONDS",
+        help="duration of the HRV chart"
+        f" (default: last used or {HRV_HISTORY_DURATION})",
+    )
+    parser.add_argument(
+        "--scan-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="stop searching for sensors after this duration"
+        f" (default: {SCAN_TIMEOUT / 1000:g})",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=RENDERERS,
+        default=RENDERER,
+        help="render charts in software or with OpenGL, which reduces CPU load"
+        f" on large displays (default: {RENDERER})",
+    )
+    parser.add_argument(
+        "--stream-port",
+        type=int,
+        metavar="PORT",
+        help="stream live data as newline-delimited JSON to TCP subscribers"
+        " on this port (default: don't stream)",
+    )
+    parser.add_argument(
+        "--stream-host",
+        default=STREAM_HOST,
+        metavar="ADDRESS",
+        help="address to stream on, e.g., 0.0.0.0 to accept subscribers from"
+        f" other machines on the network (default: {STREAM_HOST})",
+    )
+    parser.add_argument(
+        "--outlet-port",
+        type=int,
+        metavar="PORT",
+        help="publish timestamped samples for synchronization with other"
+        " recordings on this UDP port (default: don't publish)",
+    )
+    parser.add_argument(
+        "--database",
+        metavar="PATH",
+        help="store sessions in this SQLite database, in addition to recordings"
+        " (default: don't store sessions)",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="replay a recording (or its manifest) instead of connecting a sensor",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=replay_speed,
+        default=REPLAY_SPEEDS[0],
+        metavar="SPEED",
+        help="replay at this multiple of the recorded pace, or as fast as"
+        f" possible with 'max' (default: {REPLAY_SPEEDS[0]:g})",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="time the handling of each beat, rendering, and recording, and save"
+        " the timings to this file when OpenHRV closes (profiling can also be"
+        f" started and stopped anytime with {PROFILE_SHORTCUT})",
+    )
+    return parser.parse_args(args)
 
 
 class Application(QApplication):
     def __init__(self, sys_argv):
         super(Application, self).__init__(sys_argv)
-        self._model = Model()
-        self._view = View(self._model)
+        # Qt removes the arguments it recognizes (e.g., -platform).
+        args = parse_args(self.arguments()[1:])
+        # Settings are persisted in a platform specific location, e.g.,
+        # ~/.config/OpenHRV/OpenHRV.conf on Linux.
+        self._model = Model(QSettings("OpenHRV", "OpenHRV"))
+        if args.ibi_history is not None:
+            self._model.update_ibi_history_duration(args.ibi_history)
+        if args.hrv_history is not None:
+            self._model.update_hrv_history_duration(args.hrv_history)
+        self._view = View(self._model, args.renderer)
+        if args.scan_timeout is not None:
+            self._view.scanner.set_timeout(round(args.scan_timeout * 1000))
+        if args.stream_port is not None:
+            self._view.start_streaming(args.stream_host, args.stream_port)
+        if args.outlet_port is not None:
+            self._view.start_outlet(args.outlet_port)
+        if args.database is not None:
+            self._view.open_database(args.database)
+        if args.profile is not None:
+            self._view.start_profiling(args.profile)
+        if args.replay is not None:
+            self._view.start_replay(args.replay, args.replay_speed)
 
 
 def main():
-    app = Application(sys.argv)
-    app._view.show()
-    sys.exit(app.exec())
+    listener = start_logging()
+    try:
+        app = Application(sys.argv)
+        app._view.show()
+        status: int = app.exec()
+    finally:
+        stop_logging(listener)  # write the remaining records
+    sys.exit(status)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+from typing import Union
+from openhrv.config import (
+    ARTIFACT_MIN_THRESHOLD,
+    ARTIFACT_THRESHOLD_FACTOR,
+    ARTIFACT_DISPERSION_WEIGHT,
+    ARTIFACT_MAX_CONSECUTIVE,
+)
+
+
+class ArtifactDetector:
+    """Detect and correct ectopic and missed beats as IBIs arrive, in constant
+    time and memory per beat.
+
+    Similar to Berntson et al. (1990) and Lipponen & Tarvainen (2019), an IBI
+    is an artifact if its difference to the previous (valid) IBI exceeds a
+    threshold relative to the typical successive difference. The latter is
+    estimated with an exponentially weighted moving average, such that the
+    threshold adapts to how variable the heart rhythm currently is.
+
+    Artifacts are classified as
+    - missed beats: the IBI is (about) a multiple of the previous IBI, e.g.,
+      because the sensor didn't detect a beat. The IBI is split into equal
+      parts, which preserves the timing of subsequent beats.
+    - ectopic beats: any other artifact, e.g., a premature beat or the
+      compensatory pause after it. Without waiting for the next IBI, the best
+      interpolation is the previous valid IBI, which replaces the artifact.
+
+    If there are more than ARTIFACT_MAX_CONSECUTIVE artifacts in a row, the
+    rhythm has most likely changed for real (e.g., standing up), in which case
+    the IBI is accepted as the new reference.
+
+    The corrected IBI(s) are held in `corrected`, a list that's reused for
+    every IBI, such that valid IBIs don't allocate anything.
+    """
+
+    MISSED_BEAT: str = "MissedBeat"
+    ECTOPIC_BEAT: str = "EctopicBeat"
+
+    def __init__(self):
+        self.corrected: list[int] = []
+        self.reset()
+
+    def reset(self):
+        self.previous_ibi: Union[None, int] = None
+        self.dispersion: float = 0.0  # EWMA of absolute successive differences
+        self.consecutive_artifacts: int = 0
+
+    def threshold(self) -> float:
+        return max(ARTIFACT_MIN_THRESHOLD, ARTIFACT_THRESHOLD_FACTOR * self.dispersion)
+
+    def correct(self, ibi: int) -> Union[None, str]:
+        """Replace `corrected` with the corrected IBI(s), and return the kind
+        of artifact, or None if `ibi` is valid."""
+        corrected: list[int] = self.corrected
+        corrected.clear()
+        if self.previous_ibi is None:
+            self.previous_ibi = ibi
+            corrected.append(ibi)
+            return None
+        threshold: float = self.threshold()
+        difference: int = abs(ibi - self.previous_ibi)
+        if difference <= threshold:
+            self.dispersion += ARTIFACT_DISPERSION_WEIGHT * (
+                difference - self.dispersion
+            )
+            self.consecutive_artifacts = 0
+            self.previous_ibi = ibi
+            corrected.append(ibi)
+            return None
+
+        self.consecutive_artifacts += 1
+        if self.consecutive_artifacts > ARTIFACT_MAX_CONSECUTIVE:
+            self.consecutive_artifacts = 0
+            self.previous_ibi = ibi
+            corrected.append(ibi)
+            return None
+
+        n_beats: int = round(ibi / self.previous_ibi)
+        if n_beats > 1 and abs(ibi - n_beats * self.previous_ibi) <= threshold:
+            part: int = ibi // n_beats
+            corrected.extend([part] * (n_beats - 1))
+            corrected.append(ibi - part * (n_beats - 1))
+            self.previous_ibi = corrected[-1]
+            return self.MISSED_BEAT
+
+        corrected.append(self.previous_ibi)
+        return self.ECTOPIC_BEAT
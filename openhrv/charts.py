@@ -0,0 +1,99 @@
+from typing import Iterable, Union
+from PySide6.QtCore import Qt, QMargins, QPointF
+from PySide6.QtGui import QColor, QBrush, QPen
+from PySide6.QtCharts import QChartView, QChart, QLineSeries, QValueAxis
+from openhrv.plot import BLUE, TARGET
+
+TARGET_SPAN: float = 1e6
+
+
+class XYSeriesWidget(QChartView):
+    """Chart that's rendered with OpenGL, see `openhrv.plot.PlotWidget` for the
+    software rendered counterpart (with the same interface).
+
+    The series is drawn as straight line segments by OpenGL, rather than
+    computing spline control points on the CPU and drawing them with QPainter.
+    OpenGL series are drawn on a separate surface on top of the chart, such
+    that updating the series doesn't repaint the axes and background.
+    """
+
+    def __init__(
+        self,
+        x_values: Iterable[float],
+        y_values: Iterable[float],
+        line_color: QColor = BLUE,
+    ):
+        super().__init__()
+
+        self.plot = QChart()
+        self.plot.legend().setVisible(False)
+        self.plot.setBackgroundRoundness(0)
+        self.plot.setMargins(QMargins(0, 0, 0, 0))
+
+        self.time_series = QLineSeries()
+        self.time_series.setUseOpenGL(True)
+        self.plot.addSeries(self.time_series)
+        pen = self.time_series.pen()
+        pen.setWidth(4)
+        pen.setColor(line_color)
+        self.time_series.setPen(pen)
+        self.replace_series(x_values, y_values)
+
+        self.x_axis = QValueAxis()
+        self.x_axis.setLabelFormat("%i")
+        self.plot.addAxis(self.x_axis, Qt.AlignBottom)
+        self.time_series.attachAxis(self.x_axis)
+
+        self.y_axis = QValueAxis()
+        self.y_axis.setLabelFormat("%i")
+        self.plot.addAxis(self.y_axis, Qt.AlignLeft)
+        self.time_series.attachAxis(self.y_axis)
+
+        self.target_series = QLineSeries()
+        self.plot.addSeries(self.target_series)
+        pen = QPen(TARGET, 2, Qt.DashLine)
+        self.target_series.setPen(pen)
+        self.target_series.attachAxis(self.x_axis)
+        self.target_series.attachAxis(self.y_axis)
+        self.target_series.setVisible(False)
+
+        self.setChart(self.plot)
+
+    def set_background(self, brush: QBrush):
+        """Fill the plot area (the area within the axes) with `brush`."""
+        self.plot.setPlotAreaBackgroundBrush(brush)
+        self.plot.setPlotAreaBackgroundVisible(True)
+
+    def set_target(self, target: Union[None, float]):
+        """Draw a dashed horizontal line at `target` (None removes it)."""
+        if target is None:
+            self.target_series.setVisible(False)
+            return
+        # Span more than any x range, the plot area clips the line.
+        self.target_series.replace(
+            [QPointF(-TARGET_SPAN, target), QPointF(TARGET_SPAN, target)]
+        )
+        self.target_series.setVisible(True)
+
+    def update_series(
+        self,
+        x_values: Iterable[float],
+        y_values: Iterable[float],
+        x_offset: float = 0.0,
+    ):
+        self.replace_series(x_values, y_values, x_offset)
+
+    def replace_series(
+        self,
+        x_values: Iterable[float],
+        y_values: Iterable[float],
+        x_offset: float = 0.0,
+    ):
+        """Replace all points at once, allowing for a varying number of points."""
+        self.time_series.replace(
+            [QPointF(x + x_offset, y) for x, y in zip(x_values, y_values)]
+        )
+
+    def plot_width(self) -> int:
+        """Width of the plot area in pixels."""
+        return int(self.plot.plotArea().width())
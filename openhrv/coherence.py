@@ -0,0 +1,165 @@
+import math
+from openhrv.config import (
+    COHERENCE_SAMPLING_RATE,
+    COHERENCE_WINDOW_SIZE,
+    COHERENCE_PEAK_WIDTH,
+    COHERENCE_MIN_FREQUENCY,
+    COHERENCE_MAX_FREQUENCY,
+)
+
+
+class RealFFT:
+    """Plan for the power spectrum of real signals with `n_samples` (a power
+    of two) samples.
+
+    Everything that only depends on `n_samples` (bit reversal permutation,
+    twiddle factors, buffers) is computed once, such that repeated
+    transforms don't allocate. The `n_samples` real samples are packed into
+    `n_samples / 2` complex samples (even samples as real, odd samples as
+    imaginary part), transformed with an iterative radix-2 FFT, and unpacked
+    into the spectrum of the real signal, which takes about half the work of
+    a complex FFT of size `n_samples`.
+    """
+
+    def __init__(self, n_samples: int):
+        if n_samples < 4 or n_samples & (n_samples - 1):
+            raise ValueError(f"{n_samples} isn't a power of two >= 4.")
+        self.n_samples = n_samples
+        half: int = n_samples // 2
+        self.half = half
+        n_bits: int = half.bit_length() - 1
+        self.bit_reversed: list[int] = [
+            int(f"{i:0{n_bits}b}"[::-1], 2) for i in range(half)
+        ]
+        # Butterflies of all stages, as (top index, bottom index, cos, sin).
+        self.butterflies: list[tuple[int, int, float, float]] = []
+        size: int = 2
+        while size <= half:
+            step: int = half // size
+            for start in range(0, half, size):
+                for k in range(size // 2):
+                    angle: float = -2 * math.pi * k * step / half
+                    self.butterflies.append(
+                        (
+                            start + k,
+                            start + k + size // 2,
+                            math.cos(angle),
+                            math.sin(angle),
+                        )
+                    )
+            size *= 2
+        self.unpack_cos: list[float] = [
+            math.cos(2 * math.pi * k / n_samples) for k in range(half + 1)
+        ]
+        self.unpack_sin: list[float] = [
+            math.sin(2 * math.pi * k / n_samples) for k in range(half + 1)
+        ]
+        self.re: list[float] = [0.0] * half
+        self.im: list[float] = [0.0] * half
+        self.power: list[float] = [0.0] * (half + 1)
+
+    def power_spectrum(self, samples: list[float]) -> list[float]:
+        """Return |X[k]|^2 for k in [0, n_samples / 2]. The returned list is
+        reused by the next transform."""
+        re, im = self.re, self.im
+        for i, j in enumerate(self.bit_reversed):
+            re[j] = samples[2 * i]
+            im[j] = samples[2 * i + 1]
+        for top, bottom, c, s in self.butterflies:
+            bottom_re: float = re[bottom] * c - im[bottom] * s
+            bottom_im: float = re[bottom] * s + im[bottom] * c
+            re[bottom] = re[top] - bottom_re
+            im[bottom] = im[top] - bottom_im
+            re[top] += bottom_re
+            im[top] += bottom_im
+
+        half: int = self.half
+        power: list[float] = self.power
+        for k in range(half + 1):
+            a, b = re[k % half], im[k % half]
+            c, d = re[(half - k) % half], im[(half - k) % half]
+            even_re, even_im = (a + c) / 2, (b - d) / 2
+            odd_re, odd_im = (b + d) / 2, (c - a) / 2
+            cos_k, sin_k = self.unpack_cos[k], self.unpack_sin[k]
+            x_re: float = even_re + cos_k * odd_re + sin_k * odd_im
+            x_im: float = even_im + cos_k * odd_im - sin_k * odd_re
+            power[k] = x_re * x_re + x_im * x_im
+        return power
+
+
+class CoherenceEstimator:
+    """Estimate how much of the IBI series' variability oscillates at the
+    breathing rate (cardiac coherence).
+
+    IBIs are resampled at COHERENCE_SAMPLING_RATE by linear interpolation
+    between beats into a ring buffer of the last COHERENCE_WINDOW_SIZE
+    samples. Coherence is the power within COHERENCE_PEAK_WIDTH of the
+    breathing rate, relative to the power between COHERENCE_MIN_FREQUENCY
+    and COHERENCE_MAX_FREQUENCY, of the Hann windowed, mean-centered samples.
+    It ranges from 0 (no oscillation at the breathing rate) to 1 (all
+    variability oscillates at the breathing rate).
+    """
+
+    def __init__(
+        self,
+        sampling_rate: float = COHERENCE_SAMPLING_RATE,
+        window_size: int = COHERENCE_WINDOW_SIZE,
+    ):
+        self.sampling_rate = sampling_rate
+        self.fft = RealFFT(window_size)
+        self.hann: list[float] = [
+            0.5 - 0.5 * math.cos(2 * math.pi * i / window_size)
+            for i in range(window_size)
+        ]
+        self.samples: list[float] = [0.0] * window_size
+        self.windowed: list[float] = [0.0] * window_size
+        self.resolution: float = sampling_rate / window_size  # Hz per bin
+        self.reset()
+
+    def reset(self):
+        """Start over, e.g., after a gap in the data."""
+        self.n_samples: int = 0  # resampled so far
+        self.beat_time: float = 0.0  # seconds
+        self.sample_time: float = 0.0  # seconds
+        self.last_ibi: float = 0.0
+
+    def is_ready(self) -> bool:
+        return self.n_samples >= len(self.samples)
+
+    def update(self, ibi: int):
+        if not self.last_ibi:  # first beat
+            self.last_ibi = ibi
+            return
+        next_beat_time: float = self.beat_time + ibi / 1000
+        window_size: int = len(self.samples)
+        while self.sample_time <= next_beat_time:
+            fraction: float = (self.sample_time - self.beat_time) / (ibi / 1000)
+            self.samples[self.n_samples % window_size] = (
+                self.last_ibi + (ibi - self.last_ibi) * fraction
+            )
+            self.n_samples += 1
+            self.sample_time += 1 / self.sampling_rate
+        self.beat_time = next_beat_time
+        self.last_ibi = ibi
+
+    def coherence(self, breathing_rate: float) -> float:
+        """Coherence at `breathing_rate` (breaths per minute)."""
+        samples, windowed, hann = self.samples, self.windowed, self.hann
+        window_size: int = len(samples)
+        oldest: int = self.n_samples % window_size
+        mean: float = sum(samples) / window_size
+        for i in range(window_size):
+            windowed[i] = (samples[(oldest + i) % window_size] - mean) * hann[i]
+        power: list[float] = self.fft.power_spectrum(windowed)
+
+        breathing_bin: float = breathing_rate / 60 / self.resolution
+        peak_width: float = COHERENCE_PEAK_WIDTH / self.resolution
+        first_bin: int = max(math.ceil(COHERENCE_MIN_FREQUENCY / self.resolution), 1)
+        last_bin: int = math.floor(COHERENCE_MAX_FREQUENCY / self.resolution)
+        peak_power: float = 0.0
+        total_power: float = 0.0
+        for k in range(first_bin, last_bin + 1):
+            total_power += power[k]
+            if abs(k - breathing_bin) <= peak_width:
+                peak_power += power[k]
+        return peak_power / total_power if total_power else 0.0
@@ -1,5 +1,5 @@
 from typing import Final
-from math import ceil
+from math import ceil, inf
 
 
 IBI_MEDIAN_WINDOW: Final[int] = 11  # samples
@@ -17,15 +17,112 @@ MIN_IBI: Final[int] = ceil(60_000 / max_heart_rate)
 MAX_IBI: Final[int] = ceil(60_000 / min_heart_rate)
 MIN_PLOT_IBI: Final[int] = 300
 MAX_PLOT_IBI: Final[int] = 1500
+HRV_PLOT_HEADROOM: Final[float] = 1.2  # HRV axis extends beyond the target
 
-# IBI buffer must hold enough samples such that even if IBIs (on average) were
-# MIN_IBI long, there'd be enough samples to display for IBI_HISTORY_DURATION seconds.
+# Artifacts are IBIs whose difference to the previous IBI exceeds the larger of
+# ARTIFACT_MIN_THRESHOLD and ARTIFACT_THRESHOLD_FACTOR times the typical
+# successive difference (see artifacts.py).
+ARTIFACT_MIN_THRESHOLD: Final[int] = 150  # msec
+ARTIFACT_THRESHOLD_FACTOR: Final[float] = 4.5
+ARTIFACT_DISPERSION_WEIGHT: Final[float] = 0.05  # EWMA weight of current sample
+ARTIFACT_MAX_CONSECUTIVE: Final[int] = 3
+# Coherence is estimated from the spectrum of the last 64 seconds of IBIs
+# (see coherence.py).
+COHERENCE_SAMPLING_RATE: Final[float] = 4.0  # Hz
+COHERENCE_WINDOW_SIZE: Final[int] = 256  # samples, power of two
+COHERENCE_PEAK_WIDTH: Final[float] = 0.015  # Hz on either side of breathing rate
+COHERENCE_MIN_FREQUENCY: Final[float] = 0.0033  # Hz
+COHERENCE_MAX_FREQUENCY: Final[float] = 0.4  # Hz
+COHERENCE_HISTORY_DURATION: Final[int] = 120  # seconds
+# Windows over which mean heart rate, SDNN, RMSSD, and pNN50 are computed.
+METRICS_WINDOWS: Final[list[int]] = [30, 60, 300]  # seconds
+# The metrics are updated every beat, but only emitted (i.e., recorded and
+# streamed) every METRICS_INTERVAL seconds of IBIs. Coherence is estimated at
+# the same interval.
+METRICS_INTERVAL: Final[int] = 10  # seconds
+
+
+def history_buffer_size(history_duration: int) -> int:
+    """Buffers must hold enough samples such that even if IBIs (on average)
+    were MIN_IBI long, there'd be enough samples to display for
+    `history_duration` seconds."""
+    return ceil(history_duration / (MIN_IBI / 1000))  # samples
+
+
+# Default history durations. They can be adjusted at runtime, in which case
+# the IBI buffers are resized accordingly (see Model.update_ibi_history_duration).
+# The HRV buffers always hold HRV_HISTORY_DURATION, longer durations are plotted
+# from the HRV history (see Model.update_hrv_history_duration).
+MIN_HISTORY_DURATION: Final[int] = 10  # seconds
+MAX_HISTORY_DURATION: Final[int] = 10800  # seconds
 IBI_HISTORY_DURATION: Final[int] = 60  # seconds
-IBI_BUFFER_SIZE: Final[int] = ceil(IBI_HISTORY_DURATION / (MIN_IBI / 1000))  # samples
+IBI_BUFFER_SIZE: Final[int] = history_buffer_size(IBI_HISTORY_DURATION)
+IBI_HISTORY_DURATIONS: Final[list[int]] = [30, IBI_HISTORY_DURATION, 120, 300]
+# The IBI chart plots every sample, hence its duration is limited to the menu's.
+MAX_IBI_HISTORY_DURATION: Final[int] = max(IBI_HISTORY_DURATIONS)  # seconds
 HRV_HISTORY_DURATION: Final[int] = 120  # seconds
-HRV_BUFFER_SIZE: Final[int] = ceil(HRV_HISTORY_DURATION / (MIN_IBI / 1000))  # samples
+HRV_BUFFER_SIZE: Final[int] = history_buffer_size(HRV_HISTORY_DURATION)
+# Beyond HRV_HISTORY_DURATION, the HRV chart can display trends over the whole
+# session. Longer durations are displayed at lower resolution (see history.py).
+HRV_HISTORY_DURATIONS: Final[list[int]] = [
+    HRV_HISTORY_DURATION,
+    600,
+    1800,
+    3600,
+    10800,
+]  # seconds
+HRV_HISTORY_CAPACITY: Final[int] = 1024  # samples per resolution level
+HRV_HISTORY_LEVELS: Final[int] = 6
+HRV_HISTORY_DECIMATION: Final[int] = 4  # ratio of samples between adjacent levels
+
+# Charts are rendered in "software" (QPainter) or with "opengl".
+RENDERERS: Final[list[str]] = ["software", "opengl"]
+RENDERER: Final[str] = "software"
+# The pacer is redrawn at the display's frame rate, but published to
+# subscribers (see server.py and outlet.py) at a fixed rate.
+PACER_PUBLISH_INTERVAL: Final[float] = 1 / 8  # seconds
+# Without a sensor or replay, the pacer and the logger's flush timers are paused
+# after IDLE_TIMEOUT without interaction (see View.enter_idle_mode).
+IDLE_TIMEOUT: Final[int] = 60_000  # msec
 
 COMPATIBLE_SENSORS: Final[list[str]] = ["Polar", "Decathlon Dual HR"]
+SCAN_TIMEOUT: Final[int] = 10_000  # msec
+RECONNECT_INITIAL_DELAY: Final[int] = 1000  # msec
+RECONNECT_MAX_DELAY: Final[int] = 30_000  # msec
+
+STREAM_HOST: Final[str] = "127.0.0.1"
+STREAM_QUEUE_SIZE: Final[int] = 256  # frames per subscriber
+STREAM_MAX_PENDING_BYTES: Final[int] = 64 * 1024  # per subscriber
+OUTLET_HOST: Final[str] = "127.0.0.1"
+OUTLET_SUBSCRIPTION_TIMEOUT: Final[float] = 10.0  # seconds
+
+DATABASE_BATCH_SIZE: Final[int] = 256  # events per transaction
+DATABASE_FLUSH_INTERVAL: Final[int] = 5000  # msec
+
+# Recordings are split into segments of at most RECORDING_SEGMENT_SIZE or
+# RECORDING_SEGMENT_DURATION, whichever is reached first (see recording.py).
+RECORDING_SEGMENT_SIZE: Final[int] = 16 * 1024 * 1024  # bytes, uncompressed
+RECORDING_SEGMENT_DURATION: Final[int] = 60 * 60  # seconds
+RECORDING_QUEUE_SIZE: Final[int] = 256  # rows
+RECORDING_FLUSH_INTERVAL: Final[int] = 5000  # msec
+RECORDING_INDEX_INTERVAL: Final[float] = 10.0  # seconds between index entries
+
+# Recordings can be replayed at these multiples of the recorded pace, inf
+# being as fast as possible (in batches of REPLAY_BATCH_SIZE rows).
+REPLAY_SPEEDS: Final[list[float]] = [1.0, 10.0, inf]
+REPLAY_BATCH_SIZE: Final[int] = 100  # rows
+EXPORT_ROW_GROUP_SIZE: Final[int] = 64 * 1024  # rows
+
+# Slots are timed while profiling (see profiling.py), which PROFILE_SHORTCUT
+# starts and stops.
+PROFILE_SHORTCUT: Final[str] = "Ctrl+Shift+P"
+
+# Diagnostics are logged from a background thread (see diagnostics.py), with at
+# most one message per LOG_RATE_LIMIT_INTERVAL from the same place in the code
+# (tracking at most LOG_RATE_LIMIT_SITES places).
+LOG_FORMAT: Final[str] = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+LOG_RATE_LIMIT_INTERVAL: Final[float] = 10.0  # seconds
+LOG_RATE_LIMIT_SITES: Final[int] = 256
 
 
 def tick_to_breathing_rate(tick: int) -> float:
@@ -0,0 +1,121 @@
+import sqlite3
+from typing import Union
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    ended REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    session INTEGER NOT NULL REFERENCES sessions(id),
+    time REAL NOT NULL,
+    event TEXT NOT NULL,
+    value
+);
+CREATE INDEX IF NOT EXISTS events_session_time ON events(session, time);
+CREATE INDEX IF NOT EXISTS events_event_time ON events(event, time);
+CREATE TABLE IF NOT EXISTS minute_summary (
+    session INTEGER NOT NULL REFERENCES sessions(id),
+    minute INTEGER NOT NULL,
+    pacer_rate REAL NOT NULL,
+    beats INTEGER NOT NULL,
+    ibi_sum REAL NOT NULL,
+    hrv_count INTEGER NOT NULL,
+    hrv_sum REAL NOT NULL,
+    PRIMARY KEY (session, minute, pacer_rate)
+);
+CREATE INDEX IF NOT EXISTS minute_summary_rate_minute
+    ON minute_summary(pacer_rate, minute);
+"""
+
+UPSERT_SUMMARY: str = """
+INSERT INTO minute_summary VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (session, minute, pacer_rate) DO UPDATE SET
+    beats = beats + excluded.beats,
+    ibi_sum = ibi_sum + excluded.ibi_sum,
+    hrv_count = hrv_count + excluded.hrv_count,
+    hrv_sum = hrv_sum + excluded.hrv_sum
+"""
+
+
+class SessionStore:
+    """Store sessions in an SQLite database, in addition to (or instead of)
+    recording them to CSV files.
+
+    Events are buffered and inserted in a single transaction per batch.
+    Along with the events, a summary per minute and breathing rate is
+    maintained (number of beats, mean IBI, mean HRV), such that queries
+    across many sessions don't have to aggregate individual events.
+
+    SQLite connections can only be used on the thread that created them, i.e.,
+    the store must be created on the thread that adds events (the logger's).
+    """
+
+    def __init__(self, path: str, pacer_rate: float, started: float):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        with self.connection:
+            session: Union[None, int] = self.connection.execute(
+                "INSERT INTO sessions (started) VALUES (?)", (started,)
+            ).lastrowid
+        assert session is not None  # an INSERT sets the row's id
+        self.session: int = session
+        self.pacer_rate: float = pacer_rate
+        self.events: list[tuple] = []
+        # (minute, pacer rate): [beats, IBI sum, HRV count, HRV sum]
+        self.summary: dict[tuple[int, float], list] = {}
+
+    def add_event(self, event: str, value, time: float):
+        self.events.append((self.session, time, event, value))
+        if event == "PacerRate":
+            self.pacer_rate = value
+        elif event in ("InterBeatInterval", "HeartRateVariability"):
+            minute: int = int(time // 60 * 60)
+            summary: list = self.summary.setdefault(
+                (minute, self.pacer_rate), [0, 0.0, 0, 0.0]
+            )
+            if event == "InterBeatInterval":
+                summary[0] += 1
+                summary[1] += value
+            else:
+                summary[2] += 1
+                summary[3] += value
+
+    def flush(self):
+        """Insert the buffered events and update the summary."""
+        if not self.events:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO events VALUES (?, ?, ?, ?)", self.events
+            )
+            self.connection.executemany(
+                UPSERT_SUMMARY,
+                [
+                    (self.session, minute, rate, *summary)
+                    for (minute, rate), summary in self.summary.items()
+                ],
+            )
+        self.events = []
+        self.summary = {}
+
+    def close(self, ended: float):
+        self.flush()
+        with self.connection:
+            self.connection.execute(
+                "UPDATE sessions SET ended = ? WHERE id = ?", (ended, self.session)
+            )
+        self.connection.close()
+
+
+def mean_hrv(
+    connection: sqlite3.Connection, pacer_rate: float, since: float
+) -> Union[None, float]:
+    """Mean HRV across all sessions at `pacer_rate` since `since` (seconds
+    since the epoch)."""
+    return connection.execute(
+        "SELECT SUM(hrv_sum) / SUM(hrv_count) FROM minute_summary"
+        " WHERE pacer_rate = ? AND minute >= ?",
+        (pacer_rate, since // 60 * 60),
+    ).fetchone()[0]
@@ -0,0 +1,83 @@
+import logging
+import queue
+import time
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO, Union
+from openhrv.config import LOG_FORMAT, LOG_RATE_LIMIT_INTERVAL, LOG_RATE_LIMIT_SITES
+
+
+class RateLimiter(logging.Filter):
+    """Let through at most one message per `interval` seconds from each call
+    site, i.e., per logger and message template (e.g., "Correcting outlier
+    IBI %d to %d"), and drop the others. The next message that's let through
+    reports how many were dropped in the meantime.
+
+    Only the `max_sites` most recently logged sites are tracked. Messages
+    logged with `extra={"rate_limit": False}` (e.g., the status messages,
+    which are formatted already and hence each a site of their own) are
+    always let through."""
+
+    def __init__(
+        self,
+        interval: float = LOG_RATE_LIMIT_INTERVAL,
+        max_sites: int = LOG_RATE_LIMIT_SITES,
+    ):
+        super().__init__()
+        self.interval = interval
+        self.max_sites = max_sites
+        # (logger, template): [time.monotonic() of last message, dropped messages],
+        # least recently logged first.
+        self.sites: OrderedDict[tuple[str, str], list] = OrderedDict()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "rate_limit", True):
+            return True
+        now: float = time.monotonic()
+        key: tuple[str, str] = (record.name, record.msg)
+        site: Union[None, list] = self.sites.get(key)
+        if site is None:
+            if len(self.sites) >= self.max_sites:
+                self.sites.popitem(last=False)
+            self.sites[key] = [now, 0]
+            return True
+        if now - site[0] < self.interval:
+            site[1] += 1
+            return False
+        if site[1]:
+            record.msg = f"{record.msg} ({site[1]} similar messages dropped)"
+        site[:] = [now, 0]
+        self.sites.move_to_end(key)
+        return True
+
+
+def start_logging(
+    level: int = logging.INFO, stream: Union[None, TextIO] = None
+) -> QueueListener:
+    """Log to `stream` (stderr by default) from a background thread.
+
+    Loggers only put records in a queue, such that logging never blocks the
+    GUI thread on a slow terminal or pipe. Records are rate limited (see
+    RateLimiter) before they're queued. Returns the listener that writes the
+    records, pass it to `stop_logging`.
+    """
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = QueueHandler(records)
+    handler.addFilter(RateLimiter())
+    output = logging.StreamHandler(stream)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(records, output)
+    root: logging.Logger = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(handler)
+    listener.start()
+    return listener
+
+
+def stop_logging(listener: QueueListener):
+    """Write the remaining records and stop the background thread."""
+    root: logging.Logger = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+    listener.stop()
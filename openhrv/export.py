@@ -0,0 +1,120 @@
+import argparse
+from datetime import datetime
+from pathlib import Path
+from openhrv.recording import read_recording
+from openhrv.config import EXPORT_ROW_GROUP_SIZE
+
+# Table: (events, columns). Each table has a timestamp column, followed by
+# the columns of the event's value, see `parse_value`. Events that aren't
+# listed are exported to the "events" table with their value as string.
+TABLES: dict[str, tuple[tuple[str, ...], tuple[tuple[str, str], ...]]] = {
+    "beats": (("InterBeatInterval",), (("ibi", "int32"),)),
+    "hrv": (("HeartRateVariability",), (("hrv", "float64"),)),
+    "settings": (
+        ("PacerRate", "HrvTarget"),
+        (("setting", "string"), ("value", "float64")),
+    ),
+    "annotations": (("Annotation",), (("annotation", "string"),)),
+    "events": ((), (("event", "string"), ("value", "string"))),
+}
+
+
+def parse_value(table: str, event: str, value: str) -> tuple:
+    if table == "beats":
+        return (int(float(value)),)
+    if table == "hrv":
+        return (float(value),)
+    if table == "settings":
+        return (event, float(value))
+    if table == "annotations":
+        return (value,)
+    return (event, value)
+
+
+def export_parquet(
+    recording_path: str, directory: str, row_group_size: int = EXPORT_ROW_GROUP_SIZE
+) -> list[str]:
+    """Export the recording at `recording_path` (a segment or a manifest, see
+    `openhrv.recording.read_recording`) to one Parquet file per table in
+    `directory`, returning their paths.
+
+    Rows are read one at a time and written in row groups of
+    `row_group_size` rows, such that memory doesn't grow with the length of
+    the recording. Requires pyarrow, which is an optional dependency
+    (`pip install OpenHRV[export]`).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Exporting to Parquet requires pyarrow (pip install OpenHRV[export])."
+        ) from e
+
+    table_of_event: dict[str, str] = {
+        event: table for table, (events, _) in TABLES.items() for event in events
+    }
+    schemas: dict = {
+        table: pa.schema(
+            [("timestamp", pa.timestamp("us"))]
+            + [(name, pa.type_for_alias(kind)) for name, kind in columns]
+        )
+        for table, (_, columns) in TABLES.items()
+    }
+    paths: dict[str, str] = {
+        table: str(Path(directory) / f"{table}.parquet") for table in TABLES
+    }
+    writers: dict = {
+        table: pq.ParquetWriter(paths[table], schemas[table]) for table in TABLES
+    }
+    buffers: dict[str, list[list]] = {
+        table: [[] for _ in schemas[table]] for table in TABLES
+    }
+
+    def write_row_group(table: str):
+        columns: list[list] = buffers[table]
+        if not columns[0]:
+            return
+        writers[table].write_batch(
+            pa.record_batch(columns, schema=schemas[table]),
+            row_group_size=row_group_size,
+        )
+        for column in columns:
+            column.clear()
+
+    try:
+        for event, value, timestamp in read_recording(recording_path):
+            table: str = table_of_event.get(event, "events")
+            row: tuple = (datetime.fromisoformat(timestamp),) + parse_value(
+                table, event, value
+            )
+            columns: list[list] = buffers[table]
+            for column, field in zip(columns, row):
+                column.append(field)
+            if len(columns[0]) >= row_group_size:
+                write_row_group(table)
+        for table in TABLES:
+            write_row_group(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return list(paths.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export an OpenHRV recording to Parquet files."
+    )
+    parser.add_argument(
+        "recording", help="recording (.csv, .csv.gz, .csv.xz) or its manifest (.json)"
+    )
+    parser.add_argument("directory", help="directory for the Parquet files")
+    args = parser.parse_args()
+    Path(args.directory).mkdir(parents=True, exist_ok=True)
+    for path in export_parquet(args.recording, args.directory):
+        print(f"Exported {path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from collections import deque
+
+# A bucket summarizes consecutive samples by their minimum and maximum (each
+# with the time at which it occurred) as well as their mean:
+# (time_min, value_min, time_max, value_max, mean)
+Bucket = tuple[float, float, float, float, float]
+
+
+class DecimatedHistory:
+    """Multi-resolution store for long time series.
+
+    Level 0 is a ring buffer of raw samples. Each bucket at level k summarizes
+    `factor ** k` consecutive raw samples. All levels are updated incrementally
+    as samples are appended, and each holds at most `capacity` buckets, so that
+    memory is bounded while the highest level spans the whole session.
+
+    Plotting the minimum and maximum of each bucket preserves peaks that
+    would get lost when simply dropping samples.
+    """
+
+    def __init__(self, capacity: int, n_levels: int, factor: int):
+        self.levels: list[deque[Bucket]] = [
+            deque(maxlen=capacity) for _ in range(n_levels)
+        ]
+        self._bucket_sizes: list[int] = [factor**k for k in range(n_levels)]
+        # Per level, the bucket that is currently being filled:
+        # [time_min, value_min, time_max, value_max, sum, count]
+        self._partial: list[list[float]] = [
+            [0.0, 0.0, 0.0, 0.0, 0.0, 0] for _ in range(n_levels)
+        ]
+
+    def append(self, time: float, value: float):
+        self.levels[0].append((time, value, time, value, value))
+        for level, partial, bucket_size in zip(
+            self.levels[1:], self._partial[1:], self._bucket_sizes[1:]
+        ):
+            if not partial[5]:
+                partial[:] = [time, value, time, value, value, 1]
+            else:
+                if value < partial[1]:
+                    partial[0], partial[1] = time, value
+                if value > partial[3]:
+                    partial[2], partial[3] = time, value
+                partial[4] += value
+                partial[5] += 1
+            if partial[5] == bucket_size:
+                level.append(
+                    (
+                        partial[0],
+                        partial[1],
+                        partial[2],
+                        partial[3],
+                        partial[4] / bucket_size,
+                    )
+                )
+                partial[5] = 0
+
+    def select(self, start: float, max_points: int) -> tuple[list[float], list[float]]:
+        """Return the times and values of all samples since `start` from the
+        finest level that covers `start` with no more than `max_points` points.
+        Falls back to the coarsest level if none does."""
+        for k, level in enumerate(self.levels):
+            points_per_bucket: int = 1 if k == 0 else 2
+            if len(level) == level.maxlen and level[0][0] > start:
+                continue  # older buckets were already discarded
+            n_points: int = points_per_bucket * (self._partial[k][5] > 0)
+            for bucket in reversed(level):
+                if max(bucket[0], bucket[2]) < start:
+                    break
+                n_points += points_per_bucket
+                if n_points > max_points:
+                    break
+            if n_points <= max_points:
+                return self._points(k, start)
+
+        return self._points(len(self.levels) - 1, start)
+
+    def _points(self, k: int, start: float) -> tuple[list[float], list[float]]:
+        buckets: list[Bucket] = []
+        for bucket in reversed(self.levels[k]):
+            if max(bucket[0], bucket[2]) < start:
+                break
+            buckets.append(bucket)
+        buckets.reverse()
+        partial = self._partial[k]
+        if k and partial[5]:
+            buckets.append(
+                (
+                    partial[0],
+                    partial[1],
+                    partial[2],
+                    partial[3],
+                    partial[4] / partial[5],
+                )
+            )
+
+        times: list[float] = []
+        values: list[float] = []
+        for time_min, value_min, time_max, value_max, _ in buckets:
+            if k == 0:
+                times.append(time_min)
+                values.append(value_min)
+            elif time_min <= time_max:
+                times += [time_min, time_max]
+                values += [value_min, value_max]
+            else:
+                times += [time_max, time_min]
+                values += [value_max, value_min]
+
+        return times, values
@@ -1,6 +1,15 @@
 from datetime import datetime
-from PySide6.QtCore import QObject, Signal
-from openhrv.utils import NamedSignal
+from typing import Union
+from PySide6.QtCore import QObject, Signal, QTimer
+from openhrv.utils import NamedSignal, latest_value
+from openhrv.database import SessionStore
+from openhrv.profiling import profiled
+from openhrv.recording import SegmentedRecording, manifest_path
+from openhrv.config import (
+    DATABASE_BATCH_SIZE,
+    DATABASE_FLUSH_INTERVAL,
+    RECORDING_FLUSH_INTERVAL,
+)
 
 
 class Logger(QObject):
@@ -9,36 +18,112 @@ class Logger(QObject):
 
     def __init__(self):
         super().__init__()
-        self.file = None
+        self.recording: Union[None, SegmentedRecording] = None
+        self.recording_timer: Union[None, QTimer] = None
+        self.database: Union[None, SessionStore] = None
+        self.database_timer: Union[None, QTimer] = None
+        self.idle: bool = False  # see self.set_idle
 
     def start_recording(self, file_path: str):
-        if self.file:
-            self.status_update.emit(f"Already writing to a file at {self.file.name}.")
-            return  # only write to one file at a time
-        self.file = open(file_path, "a+")
-        self.file.write("event,value,timestamp\n")  # header
+        """Must be called on the logger's thread, since the flush timer
+        can only be started on the thread it belongs to."""
+        if self.recording:
+            self.status_update.emit(
+                f"Already writing to a file at {self.recording.name}."
+            )
+            return  # only write to one recording at a time
+        try:
+            self.recording = SegmentedRecording(file_path)
+        except OSError as e:
+            self.status_update.emit(f"Couldn't start recording to {file_path}: {e}")
+            return
+        # Write rows in batches rather than every beat.
+        self.recording_timer = QTimer()
+        self.recording_timer.timeout.connect(self.recording.flush)
+        self.recording_timer.setInterval(RECORDING_FLUSH_INTERVAL)
+        if not self.idle:
+            self.recording_timer.start()
         self.recording_status.emit(0)
-        self.status_update.emit(f"Started recording to {self.file.name}.")
+        self.status_update.emit(f"Started recording to {self.recording.name}.")
 
     def save_recording(self):
         """Called when:
         1. User saves recording.
         2. User closes app while recording
         """
-        if not self.file:
+        if not self.recording:
             return
-        self.file.close()
+        if self.recording_timer is not None:
+            self.recording_timer.stop()
+        self.recording.close()
         self.recording_status.emit(1)
-        self.status_update.emit(f"Saved recording at {self.file.name}.")
-        self.file = None
+        n_segments: int = len(self.recording.segments)
+        if n_segments == 1:
+            self.status_update.emit(f"Saved recording at {self.recording.name}.")
+        else:
+            self.status_update.emit(
+                f"Saved recording in {n_segments} files, listed in"
+                f" {manifest_path(self.recording.name)}."
+            )
+        self.recording = None
+
+    def open_database(self, database_path: str, pacer_rate: float):
+        """Must be called on the logger's thread, since the database
+        connection can only be used on the thread that opened it."""
+        if self.database:
+            return
+        try:
+            self.database = SessionStore(
+                database_path, pacer_rate, datetime.now().timestamp()
+            )
+        except Exception as e:
+            self.status_update.emit(f"Couldn't open database at {database_path}: {e}")
+            return
+        # Insert events in batches rather than committing every beat.
+        self.database_timer = QTimer()
+        self.database_timer.timeout.connect(self.database.flush)
+        self.database_timer.setInterval(DATABASE_FLUSH_INTERVAL)
+        if not self.idle:
+            self.database_timer.start()
+        self.status_update.emit(f"Storing session in {database_path}.")
+
+    def close_database(self):
+        """Called when the user closes the app."""
+        if not self.database:
+            return
+        if self.database_timer is not None:
+            self.database_timer.stop()
+        self.database.close(datetime.now().timestamp())
+        self.database = None
+
+    def set_idle(self, idle: bool):
+        """Stop the flush timers while the app is idle (see View.enter_idle_mode),
+        after flushing what's queued, and restart them once it isn't. Must be
+        called on the logger's thread, like the methods starting the timers."""
+        self.idle = idle
+        if self.recording is not None and self.recording_timer is not None:
+            if idle:
+                self.recording.flush()
+                self.recording_timer.stop()
+            else:
+                self.recording_timer.start()
+        if self.database is not None and self.database_timer is not None:
+            if idle:
+                self.database.flush()
+                self.database_timer.stop()
+            else:
+                self.database_timer.start()
 
+    @profiled("Logger.write_to_file")
     def write_to_file(self, data: NamedSignal):
-        if not self.file:
+        if not self.recording and not self.database:
             return
         key, val = data
-        if isinstance(val, list):
-            val = val[-1]
-        if isinstance(val, tuple):
-            val = val[-1][-1]
-        timestamp = datetime.now().isoformat()
-        self.file.write(f"{key},{val},{timestamp}\n")
+        val = latest_value(val)
+        now = datetime.now()
+        if self.recording:
+            self.recording.write(key, val, now)
+        if self.database:
+            self.database.add_event(key, val, now.timestamp())
+            if len(self.database.events) >= DATABASE_BATCH_SIZE:
+                self.database.flush()
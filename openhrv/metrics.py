@@ -0,0 +1,86 @@
+import math
+from collections import deque
+from typing import Union
+
+
+class SlidingWindowMetrics:
+    """Time-domain HRV metrics over the IBIs of the last `window` seconds,
+    updated in constant time per beat.
+
+    IBIs enter the window on the right and leave it on the left as soon as
+    the IBIs in the window span more than `window` seconds. Running sums of
+    the IBIs, their squares, the squared successive differences, and the
+    number of successive differences larger than 50 msec are updated as IBIs
+    enter and leave the window. Since IBIs are integer milliseconds, the sums
+    are exact, i.e., unlike floating point running sums (or Welford's
+    algorithm with removal) they don't accumulate rounding errors over long
+    sessions.
+
+    A successive difference belongs to the later of its two IBIs. After
+    `mark_gap`, the next IBI has no successive difference.
+    """
+
+    def __init__(self, window: int):
+        self.window: int = window * 1000  # msec
+        # IBIs in the window, and their successive differences. Separate
+        # deques rather than one of (IBI, diff) tuples don't allocate per beat.
+        self.ibis: deque[int] = deque()
+        self.diffs: deque[Union[None, int]] = deque()
+        self.duration: int = 0
+        self.sum: int = 0
+        self.sum_squares: int = 0
+        self.n_diffs: int = 0
+        self.sum_squared_diffs: int = 0
+        self.n_diffs_over_50: int = 0
+        self.previous_ibi: Union[None, int] = None
+
+    def mark_gap(self):
+        self.previous_ibi = None
+
+    def update(self, ibi: int):
+        diff: Union[None, int] = None
+        if self.previous_ibi is not None:
+            diff = ibi - self.previous_ibi
+            self.n_diffs += 1
+            self.sum_squared_diffs += diff * diff
+            self.n_diffs_over_50 += abs(diff) > 50
+        self.previous_ibi = ibi
+        self.ibis.append(ibi)
+        self.diffs.append(diff)
+        self.duration += ibi
+        self.sum += ibi
+        self.sum_squares += ibi * ibi
+
+        while self.duration > self.window and len(self.ibis) > 1:
+            old_ibi: int = self.ibis.popleft()
+            old_diff: Union[None, int] = self.diffs.popleft()
+            self.duration -= old_ibi
+            self.sum -= old_ibi
+            self.sum_squares -= old_ibi * old_ibi
+            if old_diff is not None:
+                self.n_diffs -= 1
+                self.sum_squared_diffs -= old_diff * old_diff
+                self.n_diffs_over_50 -= abs(old_diff) > 50
+
+    def mean_hr(self) -> float:
+        """Beats per minute."""
+        return 60_000 * len(self.ibis) / self.sum if self.ibis else 0.0
+
+    def sdnn(self) -> float:
+        """Standard deviation of IBIs (msec)."""
+        n: int = len(self.ibis)
+        if n < 2:
+            return 0.0
+        return math.sqrt((n * self.sum_squares - self.sum**2) / (n * (n - 1)))
+
+    def rmssd(self) -> float:
+        """Root mean square of successive differences (msec)."""
+        if not self.n_diffs:
+            return 0.0
+        return math.sqrt(self.sum_squared_diffs / self.n_diffs)
+
+    def pnn50(self) -> float:
+        """Percentage of successive differences larger than 50 msec."""
+        if not self.n_diffs:
+            return 0.0
+        return 100 * self.n_diffs_over_50 / self.n_diffs
@@ -1,23 +1,45 @@
+import logging
 import statistics
 import math
+import time
 from collections import deque
 from itertools import islice
-from PySide6.QtCore import QObject, Signal, Slot
+from typing import Union
+from PySide6.QtCore import QObject, Signal, Slot, QSettings
 from PySide6.QtBluetooth import QBluetoothDeviceInfo
 from openhrv.utils import get_sensor_address, sign, NamedSignal
+from openhrv.history import DecimatedHistory
+from openhrv.artifacts import ArtifactDetector
+from openhrv.metrics import SlidingWindowMetrics
+from openhrv.coherence import CoherenceEstimator
+from openhrv.profiling import profiled
 from openhrv.config import (
     tick_to_breathing_rate,
+    history_buffer_size,
+    HRV_HISTORY_DURATION,
     HRV_BUFFER_SIZE,
-    IBI_BUFFER_SIZE,
+    HRV_HISTORY_CAPACITY,
+    HRV_HISTORY_LEVELS,
+    HRV_HISTORY_DECIMATION,
+    IBI_HISTORY_DURATION,
+    MIN_BREATHING_RATE,
     MAX_BREATHING_RATE,
+    MIN_HISTORY_DURATION,
+    MAX_HISTORY_DURATION,
+    MAX_IBI_HISTORY_DURATION,
     MIN_IBI,
     MAX_IBI,
     IBI_MEDIAN_WINDOW,
     MIN_HRV_TARGET,
     MAX_HRV_TARGET,
     EWMA_WEIGHT_CURRENT_SAMPLE,
+    METRICS_WINDOWS,
+    METRICS_INTERVAL,
+    COHERENCE_HISTORY_DURATION,
 )
 
+log = logging.getLogger(__name__)
+
 
 class Model(QObject):
     ibis_buffer_update = Signal(NamedSignal)
@@ -25,28 +47,110 @@ class Model(QObject):
     addresses_update = Signal(NamedSignal)
     pacer_rate_update = Signal(NamedSignal)
     hrv_target_update = Signal(NamedSignal)
+    ibi_history_update = Signal(NamedSignal)
+    hrv_history_update = Signal(NamedSignal)
+    gap_update = Signal(NamedSignal)
+    artifact_update = Signal(NamedSignal)
+    metrics_update = Signal(NamedSignal)
+    coherence_update = Signal(NamedSignal)
+    corrections_update = Signal(NamedSignal)
 
-    def __init__(self):
+    def __init__(self, settings: Union[None, QSettings] = None):
+        """If `settings` are provided, settings and the last connected sensor
+        are restored from and persisted to them."""
         super().__init__()
+        self.settings = settings
         self.sensors: list[QBluetoothDeviceInfo] = []
-        self.breathing_rate: float = float(MAX_BREATHING_RATE)
-        self.hrv_target: int = math.ceil((MIN_HRV_TARGET + MAX_HRV_TARGET) / 2)
+        self.breathing_rate: float = self._load_setting(
+            "breathing_rate",
+            float(MAX_BREATHING_RATE),
+            MIN_BREATHING_RATE,
+            MAX_BREATHING_RATE,
+        )
+        self.hrv_target: int = self._load_setting(
+            "hrv_target",
+            math.ceil((MIN_HRV_TARGET + MAX_HRV_TARGET) / 2),
+            MIN_HRV_TARGET,
+            MAX_HRV_TARGET,
+        )
+        self.ibi_history_duration: int = self._load_setting(
+            "ibi_history_duration",
+            IBI_HISTORY_DURATION,
+            MIN_HISTORY_DURATION,
+            MAX_IBI_HISTORY_DURATION,
+        )
+        self.hrv_history_duration: int = self._load_setting(
+            "hrv_history_duration",
+            HRV_HISTORY_DURATION,
+            MIN_HISTORY_DURATION,
+            MAX_HISTORY_DURATION,
+        )
+        self.last_sensor: tuple[str, str] = (
+            self._load_setting("last_sensor_name", ""),
+            self._load_setting("last_sensor_address", ""),
+        )
         self.reset_buffers()
 
+    def _load_setting(self, key: str, default, minimum=None, maximum=None):
+        """Return the persisted value of setting `key`, falling back to
+        `default` if it doesn't exist or is out of range."""
+        if self.settings is None:
+            return default
+        try:
+            value = self.settings.value(key, default, type=type(default))
+        except (TypeError, ValueError):  # setting was corrupted
+            return default
+        if minimum is not None and not minimum <= value <= maximum:
+            return default
+        return value
+
+    def _save_setting(self, key: str, value):
+        if self.settings is None:
+            return
+        self.settings.setValue(key, value)
+
     def reset_buffers(self):
         """Reset the IBI/HRV data buffers and derived state to their initial
         values, e.g. to start a new session (issue #11). Sensor selection and
-        settings (breathing rate, HRV target) are preserved."""
+        settings (breathing rate, HRV target, history durations) are preserved."""
+        ibi_buffer_size: int = history_buffer_size(self.ibi_history_duration)
         # Once a bounded length deque is full, when new items are added,
         # a corresponding number of items are discarded from the opposite end.
-        self.ibis_buffer: deque[int] = deque([1000] * IBI_BUFFER_SIZE, IBI_BUFFER_SIZE)
+        # Buffers are only ever appended to, such that a beat doesn't allocate
+        # anything but the new samples. Hence, samples are timed in seconds
+        # since the start of the session (self.ibi_time and self.hrv_time are
+        # the times of the most recent samples), rather than relative to the
+        # most recent sample, which would require shifting all of them.
+        self.ibis_buffer: deque[int] = deque([1000] * ibi_buffer_size, ibi_buffer_size)
         self.ibis_seconds: deque[float] = deque(
-            map(float, range(-IBI_BUFFER_SIZE, 1)), IBI_BUFFER_SIZE
+            map(float, range(-ibi_buffer_size, 1)), ibi_buffer_size
         )
+        # The HRV buffers hold the most recent HRV_HISTORY_DURATION, regardless
+        # of self.hrv_history_duration. Longer durations are plotted from
+        # self.hrv_history, which holds the HRV of the whole session at
+        # multiple resolutions, indexed by seconds since the start of the session.
         self.hrv_buffer: deque[float] = deque([-1] * HRV_BUFFER_SIZE, HRV_BUFFER_SIZE)
         self.hrv_seconds: deque[float] = deque(
             map(float, range(-HRV_BUFFER_SIZE, 1)), HRV_BUFFER_SIZE
         )
+        self.hrv_history = DecimatedHistory(
+            HRV_HISTORY_CAPACITY, HRV_HISTORY_LEVELS, HRV_HISTORY_DECIMATION
+        )
+        self.ibi_time: float = 0.0
+        self.hrv_time: float = 0.0
+        # Coherence is estimated every METRICS_INTERVAL seconds.
+        coherence_buffer_size: int = (
+            math.ceil(COHERENCE_HISTORY_DURATION / METRICS_INTERVAL) + 1
+        )
+        self.coherence_buffer: deque[float] = deque(
+            [0.0] * coherence_buffer_size, coherence_buffer_size
+        )
+        self.coherence_seconds: deque[float] = deque(
+            (float(METRICS_INTERVAL * i) for i in range(-coherence_buffer_size, 1)),
+            coherence_buffer_size,
+        )
+        self.coherence_estimator = CoherenceEstimator()
+        self._coherence_elapsed: int = 0  # msec since coherence was estimated
 
         # Exponentially Weighted Moving Average:
         # - https://en.wikipedia.org/wiki/Moving_average#Exponential_moving_average
@@ -54,29 +158,91 @@ class Model(QObject):
         # - http://nestedsoftware.com/2018/04/04/exponential-moving-average-on-streaming-data-4hhl.24876.html
         self.ewma_hrv: float = 1.0
         self._last_ibi_phase: int = -1
-        self._last_ibi_extreme: int = 0
+        self._last_ibi_extreme: Union[None, int] = 0
         self._duration_current_phase: int = 0
+        self._last_ibi_time: Union[None, float] = None
+        self._gap: bool = False
+        self.artifact_detector = ArtifactDetector()
+        # Number of IBIs (outliers and artifacts) and HRVs (outliers) that
+        # were corrected since the start of the session.
+        self.corrected_ibis: int = 0
+        self.corrected_hrvs: int = 0
+        self.metrics: list[SlidingWindowMetrics] = [
+            SlidingWindowMetrics(window) for window in METRICS_WINDOWS
+        ]
+        # Formatted once, rather than on every beat.
+        self.metrics_names: list[tuple[str, str, str, str]] = [
+            (
+                f"MeanHR_{window}s",
+                f"SDNN_{window}s",
+                f"RMSSD_{window}s",
+                f"pNN50_{window}s",
+            )
+            for window in METRICS_WINDOWS
+        ]
+        self._metrics_elapsed: int = 0  # msec since the metrics were emitted
 
     @Slot(int)
+    @profiled("Model.update_ibis_buffer")
     def update_ibis_buffer(self, ibi: int):
+        ibi_time: float = time.monotonic()
+        if self._gap and self._last_ibi_time is not None:
+            gap_duration: float = round(ibi_time - self._last_ibi_time, 3)
+            self.gap_update.emit(NamedSignal("Gap", gap_duration))
+        self._last_ibi_time = ibi_time
         validated_ibi = self.validate_ibi(ibi)
-        self.update_ibis_seconds(validated_ibi / 1000)
-        self.ibis_buffer.append(validated_ibi)
-        self.ibis_buffer_update.emit(
-            NamedSignal("InterBeatInterval", (self.ibis_seconds, self.ibis_buffer))
-        )
-        self.compute_local_hrv()
+        artifact: Union[None, str] = self.artifact_detector.correct(validated_ibi)
+        if artifact is not None:
+            log.info(
+                "Correcting %s %d to %s",
+                artifact,
+                validated_ibi,
+                self.artifact_detector.corrected,
+            )
+            self.artifact_update.emit(NamedSignal(artifact, validated_ibi))
+            self.corrected_ibis += 1
+            self.emit_corrections()
+        for validated_ibi in self.artifact_detector.corrected:
+            self.update_ibis_seconds(validated_ibi / 1000)
+            self.ibis_buffer.append(validated_ibi)
+            self.ibis_buffer_update.emit(
+                NamedSignal("InterBeatInterval", (self.ibis_seconds, self.ibis_buffer))
+            )
+            self.compute_local_hrv()
+            self.update_metrics(validated_ibi)
+            self.update_coherence_buffer(validated_ibi)
 
     @Slot(int)
     def update_breathing_rate(self, breathing_tick: int):
         self.breathing_rate = tick_to_breathing_rate(breathing_tick)
+        self._save_setting("breathing_rate", self.breathing_rate)
         self.pacer_rate_update.emit(NamedSignal("PacerRate", self.breathing_rate))
 
     @Slot(int)
     def update_hrv_target(self, hrv_target: int):
         self.hrv_target = hrv_target
+        self._save_setting("hrv_target", hrv_target)
         self.hrv_target_update.emit(NamedSignal("HrvTarget", hrv_target))
 
+    @Slot(int)
+    def update_ibi_history_duration(self, duration: int):
+        """Replace the IBI buffers with resized copies, keeping the most recent
+        samples."""
+        self.ibi_history_duration = duration
+        self._save_setting("ibi_history_duration", duration)
+        self.ibis_buffer, self.ibis_seconds = resize_buffers(
+            self.ibis_buffer, self.ibis_seconds, history_buffer_size(duration), 1000
+        )
+        self.ibi_history_update.emit(NamedSignal("IbiHistoryDuration", duration))
+
+    @Slot(int)
+    def update_hrv_history_duration(self, duration: int):
+        """The HRV buffers aren't resized, the HRV chart plots any duration
+        from self.hrv_history (see View.plot_hrv_history)."""
+        self.hrv_history_duration = duration
+        self._save_setting("hrv_history_duration", duration)
+        self.hrv_history_update.emit(NamedSignal("HrvHistoryDuration", duration))
+
     @Slot(object)
     def update_sensors(self, sensors: list[QBluetoothDeviceInfo]):
         self.sensors = sensors
@@ -86,6 +252,27 @@ class Model(QObject):
             )
         )
 
+    @Slot()
+    def mark_gap(self):
+        """Mark a gap in the data, e.g., because the connection to the sensor
+        was lost. The next IBI isn't treated as continuous with the previous
+        one. Instead, phase tracking for the local HRV restarts."""
+        if self._last_ibi_time is None:
+            return  # there's no data yet
+        self._gap = True
+        self.artifact_detector.reset()
+        for metrics in self.metrics:
+            metrics.mark_gap()
+        self.coherence_estimator.reset()
+
+    @Slot(object)
+    def update_last_sensor(self, sensor: QBluetoothDeviceInfo):
+        """Remember the connected sensor, in order to offer connecting to it
+        without scanning next time."""
+        self.last_sensor = (sensor.name(), get_sensor_address(sensor))
+        self._save_setting("last_sensor_name", self.last_sensor[0])
+        self._save_setting("last_sensor_address", self.last_sensor[1])
+
     def validate_ibi(self, ibi: int) -> int:
         validated_ibi: int = ibi
         if ibi < MIN_IBI or ibi > MAX_IBI:
@@ -104,7 +291,9 @@ class Model(QObject):
                 validated_ibi = MAX_IBI
             else:
                 validated_ibi = median_ibi
-            print(f"Correcting outlier IBI {ibi} to {validated_ibi}")
+            log.info("Correcting outlier IBI %d to %d", ibi, validated_ibi)
+            self.corrected_ibis += 1
+            self.emit_corrections()
 
         return validated_ibi
 
@@ -112,13 +301,25 @@ class Model(QObject):
         validated_hrv: int = hrv
         if hrv > MAX_HRV_TARGET:
             validated_hrv = min(math.ceil(self.ewma_hrv), MAX_HRV_TARGET)
-            print(f"Correcting outlier HRV {hrv} to {validated_hrv}")
+            log.info("Correcting outlier HRV %d to %d", hrv, validated_hrv)
+            self.corrected_hrvs += 1
+            self.emit_corrections()
 
         return validated_hrv
 
+    def emit_corrections(self):
+        self.corrections_update.emit(
+            NamedSignal("Corrections", (self.corrected_ibis, self.corrected_hrvs))
+        )
+
     def compute_local_hrv(self):
         """https://doi.org/10.1038/s41598-019-44201-7 (Figure 2)"""
         self._duration_current_phase += self.ibis_buffer[-1]
+        if self._gap:
+            # The previous IBI precedes the gap, don't compare to it.
+            self._gap = False
+            self._last_ibi_phase = 0
+            return
         # 1: IBI rises, -1: IBI falls, 0: IBI constant
         current_ibi_phase: int = sign(self.ibis_buffer[-1] - self.ibis_buffer[-2])
         if current_ibi_phase == 0:
@@ -126,17 +327,57 @@ class Model(QObject):
         if current_ibi_phase == self._last_ibi_phase:
             return
 
-        current_ibi_extreme: int = self.ibis_buffer[-2]
-        local_hrv: int = abs(self._last_ibi_extreme - current_ibi_extreme)
-        self.update_hrv_buffer(local_hrv)
-
-        seconds_current_phase: float = self._duration_current_phase / 1000
-        self.update_hrv_seconds(seconds_current_phase)
-        self._duration_current_phase = 0
+        # Right after a gap, the previous IBI merely starts the first phase,
+        # it's not an extreme. Local HRV is computed once there are two extremes.
+        current_ibi_extreme: Union[None, int] = (
+            self.ibis_buffer[-2] if self._last_ibi_phase else None
+        )
+        if current_ibi_extreme is not None and self._last_ibi_extreme is not None:
+            local_hrv: int = abs(self._last_ibi_extreme - current_ibi_extreme)
+            seconds_current_phase: float = self._duration_current_phase / 1000
+            self.update_hrv_seconds(seconds_current_phase)
+            self._duration_current_phase = 0
+            self.update_hrv_buffer(local_hrv)
 
         self._last_ibi_extreme = current_ibi_extreme
         self._last_ibi_phase = current_ibi_phase
 
+    def update_metrics(self, ibi: int):
+        """Emit mean heart rate, SDNN, RMSSD, and pNN50 for each window, e.g.,
+        "RMSSD_60s", every METRICS_INTERVAL seconds."""
+        for metrics in self.metrics:
+            metrics.update(ibi)
+        self._metrics_elapsed += ibi
+        if self._metrics_elapsed < METRICS_INTERVAL * 1000:
+            return
+        self._metrics_elapsed = 0
+        for metrics, (mean_hr, sdnn, rmssd, pnn50) in zip(
+            self.metrics, self.metrics_names
+        ):
+            self.metrics_update.emit(NamedSignal(mean_hr, round(metrics.mean_hr(), 1)))
+            self.metrics_update.emit(NamedSignal(sdnn, round(metrics.sdnn(), 1)))
+            self.metrics_update.emit(NamedSignal(rmssd, round(metrics.rmssd(), 1)))
+            self.metrics_update.emit(NamedSignal(pnn50, round(metrics.pnn50(), 1)))
+
+    def update_coherence_buffer(self, ibi: int):
+        """Resample the IBIs every beat, but only estimate (and emit) coherence
+        every METRICS_INTERVAL seconds, since it takes an FFT of the whole
+        window."""
+        self.coherence_estimator.update(ibi)
+        self._coherence_elapsed += ibi
+        if (
+            self._coherence_elapsed < METRICS_INTERVAL * 1000
+            or not self.coherence_estimator.is_ready()
+        ):
+            return
+        self._coherence_elapsed = 0
+        coherence: float = self.coherence_estimator.coherence(self.breathing_rate)
+        self.coherence_seconds.append(self.ibi_time)  # timed like the IBIs
+        self.coherence_buffer.append(round(100 * coherence, 1))  # percent
+        self.coherence_update.emit(
+            NamedSignal("Coherence", (self.coherence_seconds, self.coherence_buffer))
+        )
+
     def update_hrv_buffer(self, local_hrv: int):
         self.ewma_hrv = (
             EWMA_WEIGHT_CURRENT_SAMPLE * self.validate_hrv(local_hrv)
@@ -144,18 +385,34 @@ class Model(QObject):
         )
 
         self.hrv_buffer.append(self.ewma_hrv)
+        self.hrv_history.append(self.hrv_time, self.ewma_hrv)
         self.hrv_update.emit(
             NamedSignal("HeartRateVariability", (self.hrv_seconds, self.hrv_buffer))
         )
 
     def update_ibis_seconds(self, seconds: float):
-        self.ibis_seconds = deque(
-            [i - seconds for i in self.ibis_seconds], IBI_BUFFER_SIZE
-        )
-        self.ibis_seconds.append(0.0)
+        self.ibi_time += seconds
+        self.ibis_seconds.append(self.ibi_time)
 
     def update_hrv_seconds(self, seconds: float):
-        self.hrv_seconds = deque(
-            [i - seconds for i in self.hrv_seconds], HRV_BUFFER_SIZE
-        )
-        self.hrv_seconds.append(0.0)
+        self.hrv_time += seconds
+        self.hrv_seconds.append(self.hrv_time)
+
+
+def resize_buffers(
+    buffer: deque, seconds: deque[float], size: int, baseline: float
+) -> tuple[deque, deque[float]]:
+    """Return copies of `buffer` and its `seconds` that hold `size` samples,
+    keeping the most recent ones. When growing, the buffers are padded at the
+    beginning with `baseline` samples that are one second apart (like in
+    Model.reset_buffers)."""
+    n_padding: int = max(size - len(buffer), 0)
+    first_second: float = seconds[0]
+    resized_buffer: deque = deque([baseline] * n_padding, size)
+    resized_buffer.extend(buffer)
+    resized_seconds: deque[float] = deque(
+        (first_second - i for i in range(n_padding, 0, -1)), size
+    )
+    resized_seconds.extend(seconds)
+
+    return resized_buffer, resized_seconds
@@ -0,0 +1,219 @@
+import json
+import logging
+import time
+import queue
+import socket
+import selectors
+import threading
+from typing import Union
+from openhrv.utils import NamedSignal, latest_value
+from openhrv.config import OUTLET_HOST, OUTLET_SUBSCRIPTION_TIMEOUT
+
+log = logging.getLogger(__name__)
+
+
+def local_clock() -> float:
+    """Seconds on the monotonic clock that all processes on this machine
+    share (like Lab Streaming Layer's `local_clock`)."""
+    return time.monotonic()
+
+
+class Outlet:
+    """Publish samples to subscribers (e.g., recording software that also
+    receives EEG or EDA), similar to a Lab Streaming Layer outlet.
+
+    Samples are stamped with `local_clock` in the thread that pushes them,
+    i.e., as soon as they're received from the sensor. They're sent as UDP
+    datagrams containing one JSON object each, from the outlet's own thread,
+    such that rendering the GUI doesn't delay delivery.
+
+    Subscribers send the following datagrams to the outlet:
+    - {"type": "subscribe"}: receive samples for the next
+      OUTLET_SUBSCRIPTION_TIMEOUT seconds, subscribe again to keep receiving.
+    - {"type": "unsubscribe"}
+    - {"type": "time", "t0": <subscriber's clock>}: the outlet replies with
+      t0 and its own clock when it received (t1) and replied (t2) to the
+      probe, from which subscribers estimate the offset between the clocks
+      (see `Inlet.time_correction`).
+    """
+
+    def __init__(self, port: int, host: str = OUTLET_HOST):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+        self.samples: queue.SimpleQueue = queue.SimpleQueue()
+        self.subscribers: dict[tuple[str, int], float] = {}  # address: expiry
+        self._wake_receiver, self._wake_sender = socket.socketpair()
+        self._wake_receiver.setblocking(False)
+        self._wake_sender.setblocking(False)  # never block the pushing thread
+        self._running = False
+        self._thread = threading.Thread(target=self._run, name="Outlet", daemon=True)
+
+    def address(self) -> tuple[str, int]:
+        return self.socket.getsockname()
+
+    def start(self):
+        self._running = True
+        self._thread.start()
+
+    def close(self):
+        if not self._running:
+            return
+        self._running = False
+        self._wake()
+        self._thread.join()
+        for s in (self.socket, self._wake_receiver, self._wake_sender):
+            s.close()
+
+    def push(self, data: NamedSignal):
+        """Queue the latest sample of `data`. Can be called from any thread.
+        Samples that are pushed after `close` are dropped."""
+        if not self._running:
+            return
+        key, val = data
+        self.samples.put((key, latest_value(val), local_clock()))
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_sender.send(b"\0")
+        except BlockingIOError:
+            pass  # the buffer is full, i.e., the thread will wake up anyway
+
+    def _run(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        selector.register(self._wake_receiver, selectors.EVENT_READ)
+        while self._running:
+            for key, _ in selector.select():
+                if key.fileobj is self.socket:
+                    self._receive()
+                else:
+                    self._wake_receiver.recv(4096)
+            self._send_samples()
+        selector.close()
+
+    def _receive(self):
+        while True:
+            try:
+                datagram, address = self.socket.recvfrom(4096)
+            except BlockingIOError:
+                return
+            received: float = local_clock()
+            try:
+                message = json.loads(datagram)
+            except ValueError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            request: str = message.get("type", "")
+            if request == "subscribe":
+                self.subscribers[address] = received + OUTLET_SUBSCRIPTION_TIMEOUT
+            elif request == "unsubscribe":
+                self.subscribers.pop(address, None)
+            elif request == "time":
+                reply: dict = {
+                    "type": "time",
+                    "t0": message.get("t0"),
+                    "t1": received,
+                    "t2": local_clock(),
+                }
+                self._send(json.dumps(reply).encode(), address)
+
+    def _send_samples(self):
+        now: float = local_clock()
+        for address, expiry in list(self.subscribers.items()):
+            if expiry < now:
+                del self.subscribers[address]
+        while True:
+            try:
+                name, value, timestamp = self.samples.get_nowait()
+            except queue.Empty:
+                return
+            sample: bytes = json.dumps(
+                {"type": "sample", "stream": name, "value": value, "t": timestamp}
+            ).encode()
+            for address in list(self.subscribers):
+                self._send(sample, address)
+
+    def _send(self, datagram: bytes, address: tuple[str, int]):
+        try:
+            self.socket.sendto(datagram, address)
+        except OSError as e:
+            log.warning("Couldn't send to %s: %s", address, e)
+            self.subscribers.pop(address, None)
+
+
+class Inlet:
+    """Minimal subscriber to an `Outlet`, e.g., to receive samples in
+    another Python process or to test the outlet."""
+
+    def __init__(self, address: tuple[str, int]):
+        self.address = address
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((address[0], 0))
+        self._subscribed: float = -OUTLET_SUBSCRIPTION_TIMEOUT
+
+    def close(self):
+        self._request({"type": "unsubscribe"})
+        self.socket.close()
+
+    def subscribe(self):
+        self._request({"type": "subscribe"})
+        self._subscribed = local_clock()
+
+    def pull_sample(
+        self, timeout: float = 1.0
+    ) -> Union[None, tuple[str, object, float]]:
+        """Return the next sample as (stream, value, timestamp) with timestamp
+        on the outlet's clock, or None after `timeout` seconds."""
+        if local_clock() - self._subscribed > OUTLET_SUBSCRIPTION_TIMEOUT / 2:
+            self.subscribe()  # renew subscription before it expires
+        message = self._receive("sample", timeout)
+        if message is None:
+            return None
+        return (message["stream"], message["value"], message["t"])
+
+    def time_correction(
+        self, n_probes: int = 8, timeout: float = 1.0
+    ) -> Union[None, float]:
+        """Estimate the offset (in seconds) that must be added to the outlet's
+        timestamps in order to map them to this process' `local_clock`.
+
+        Like NTP, the offset of each probe is estimated assuming symmetric
+        network delays. The probe with the shortest round trip is the least
+        affected by asymmetric delays.
+        """
+        best_offset: Union[None, float] = None
+        best_round_trip: float = float("inf")
+        for _ in range(n_probes):
+            self._request({"type": "time", "t0": local_clock()})
+            reply = self._receive("time", timeout)
+            t3: float = local_clock()
+            if reply is None:
+                continue
+            t0, t1, t2 = reply["t0"], reply["t1"], reply["t2"]
+            round_trip: float = (t3 - t0) - (t2 - t1)
+            if round_trip < best_round_trip:
+                best_round_trip = round_trip
+                best_offset = ((t0 - t1) + (t3 - t2)) / 2
+        return best_offset
+
+    def _request(self, message: dict):
+        self.socket.sendto(json.dumps(message).encode(), self.address)
+
+    def _receive(self, message_type: str, timeout: float) -> Union[None, dict]:
+        deadline: float = local_clock() + timeout
+        while (remaining := deadline - local_clock()) > 0:
+            self.socket.settimeout(remaining)
+            try:
+                datagram, _ = self.socket.recvfrom(4096)
+            except socket.timeout:
+                return None
+            try:
+                message = json.loads(datagram)
+            except ValueError:
+                continue  # not from an outlet
+            if isinstance(message, dict) and message.get("type") == message_type:
+                return message
+        return None
@@ -12,6 +12,7 @@ class Pacer(QObject):
         theta: list[float] = [i * increment for i in range(n_samples + 1)]
         self.cos_theta: list[float] = list(map(math.cos, theta))
         self.sin_theta: list[float] = list(map(math.sin, theta))
+        self.radius: float = 0.0
 
     def breathing_pattern(self, breathing_rate: float, time: float) -> float:
         """Returns radius of pacer disk.
@@ -21,14 +22,20 @@ class Pacer(QObject):
         """
         return 0.5 + 0.5 * math.sin(2 * math.pi * breathing_rate / 60 * time)
 
-    def update(self, breathing_rate: float) -> tuple[list[float], list[float]]:
+    def update_radius(self, breathing_rate: float) -> float:
         """Update radius of pacer disc.
 
         Make current disk radius a function of real time (i.e., don't
         precompute radii with fixed time interval) in order to compensate for
         jitter or delay in QTimer calls.
         """
-        radius = self.breathing_pattern(breathing_rate, time.time())
+        self.radius = self.breathing_pattern(breathing_rate, time.time())
+        return self.radius
+
+    def update(self, breathing_rate: float) -> tuple[list[float], list[float]]:
+        """Update radius of pacer disc, returning the coordinates of its
+        circumference."""
+        radius = self.update_radius(breathing_rate)
         x: list[float] = [i * radius for i in self.cos_theta]
         y: list[float] = [i * radius for i in self.sin_theta]
 
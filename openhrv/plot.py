@@ -0,0 +1,314 @@
+from itertools import islice
+from math import inf
+from typing import Iterable, Sequence, Union
+from PySide6.QtWidgets import QWidget, QSizePolicy
+from PySide6.QtCore import Qt, QPointF, QRectF, QSize
+from PySide6.QtGui import (
+    QPainter,
+    QPen,
+    QColor,
+    QBrush,
+    QPixmap,
+    QPolygonF,
+    QTransform,
+    QFontMetrics,
+)
+from openhrv.profiling import profiled
+
+BLUE = QColor(135, 206, 250)
+BACKGROUND = QColor(255, 255, 255)
+GRID = QColor(224, 224, 224)
+LABEL = QColor(64, 64, 64)
+TARGET = QColor(64, 64, 64)
+PADDING: int = 6  # pixels
+
+
+class Axis:
+    """Value axis with evenly spaced ticks. Method names match
+    QtCharts' QValueAxis, such that plots can be configured either way."""
+
+    def __init__(self, plot: "PlotWidget"):
+        self._plot = plot
+        self.minimum: float = 0.0
+        self.maximum: float = 1.0
+        self.title: str = ""
+        self.tick_count: int = 5
+
+    def setRange(self, minimum: float, maximum: float):
+        self.minimum, self.maximum = float(minimum), float(maximum)
+        self._plot.invalidate()
+
+    def setTitleText(self, title: str):
+        self.title = title
+        self._plot.invalidate()
+
+    def setTickCount(self, tick_count: int):
+        self.tick_count = tick_count
+        self._plot.invalidate()
+
+    def ticks(self) -> list[float]:
+        step: float = (self.maximum - self.minimum) / (self.tick_count - 1)
+        return [self.minimum + i * step for i in range(self.tick_count)]
+
+
+class PlotWidget(QWidget):
+    """Line plot that's cheap to update and to repaint.
+
+    The series is held in a QPolygonF in data coordinates, which is updated
+    in place and mapped to pixels by the painter's transform, such that
+    neither resizing nor changing axis ranges requires touching the data.
+    Everything but the series (background, grid, ticks, labels, target line)
+    is rendered into a pixmap once, at the screen's device pixel ratio, and
+    only re-rendered after the widget is resized or the axes or target change.
+    Updating the series only repaints the plot area, where the cached pixmap
+    is composited with the series, and only touches the points that were
+    added since the last update (see update_series). The series can be offset
+    along the x axis (e.g., in order to plot times relative to the most
+    recent sample), which is applied by the transform as well.
+    """
+
+    def __init__(
+        self,
+        x_values: Iterable[float],
+        y_values: Iterable[float],
+        line_color: QColor = BLUE,
+    ):
+        super().__init__()
+        self.setAttribute(Qt.WA_OpaquePaintEvent)  # static layer covers widget
+
+        self.x_axis = Axis(self)
+        self.y_axis = Axis(self)
+        self.background: Union[None, QBrush] = None
+        self.target: Union[None, float] = None
+        self.pen = QPen(line_color, 4)
+        self.pen.setCosmetic(True)  # width in pixels regardless of transform
+        self.pen.setJoinStyle(Qt.RoundJoin)
+        self.polygon = QPolygonF()
+        self.last_x: float = -inf  # x value of the polygon's last point
+        self.x_offset: float = 0.0
+        self.static_layer: Union[None, QPixmap] = None
+        self.replace_series(x_values, y_values)
+
+    def set_background(self, brush: QBrush):
+        """Fill the plot area (the area within the axes) with `brush`."""
+        self.background = brush
+        self.invalidate()
+
+    def set_target(self, target: Union[None, float]):
+        """Draw a dashed horizontal line at `target` (None removes it)."""
+        self.target = target
+        self.invalidate()
+
+    def invalidate(self):
+        """Render the static layer again before the next paint."""
+        self.static_layer = None
+        self.update()
+
+    def update_series(
+        self,
+        x_values: Sequence[float],
+        y_values: Sequence[float],
+        x_offset: float = 0.0,
+    ):
+        """Plot the points (`x_values` + `x_offset`, `y_values`).
+
+        Meant for buffers of fixed length with ascending x values (e.g., the
+        model's deques): only the points with x values beyond the last
+        plotted one are appended to the polygon, and as many of the oldest
+        points are removed. Anything else (e.g., buffers that were reset or
+        resized) replaces all points."""
+        n_points: int = len(x_values)
+        n_new: int = 0
+        for x in reversed(x_values):
+            if x <= self.last_x:
+                break
+            n_new += 1
+        if (
+            self.polygon.size() != n_points
+            or n_new == n_points
+            or x_values[n_points - n_new - 1] != self.last_x
+        ):
+            self.replace_series(x_values, y_values, x_offset)
+            return
+        self.x_offset = x_offset
+        if n_new:
+            self.polygon.remove(0, n_new)
+            for x, y in islice(zip(x_values, y_values), n_points - n_new, None):
+                self.polygon.append(QPointF(x, y))
+            self.last_x = x_values[-1]
+        self.update(self.plot_area().toAlignedRect())
+
+    def replace_series(
+        self,
+        x_values: Iterable[float],
+        y_values: Iterable[float],
+        x_offset: float = 0.0,
+    ):
+        """Replace all points at once, allowing for a varying number of points."""
+        self.x_offset = x_offset
+        polygon: QPolygonF = self.polygon
+        # Clearing keeps the polygon's capacity, i.e., the points are written
+        # into the existing storage, which only grows if there are more points.
+        polygon.clear()
+        self.last_x = -inf
+        for x, y in zip(x_values, y_values):
+            polygon.append(QPointF(x, y))
+            self.last_x = x
+        self.update(self.plot_area().toAlignedRect())
+
+    def plot_area(self) -> QRectF:
+        metrics = QFontMetrics(self.font())
+        label_width: int = max(
+            metrics.horizontalAdvance(f"{tick:.0f}") for tick in self.y_axis.ticks()
+        )
+        left: int = PADDING + metrics.height() + PADDING + label_width + PADDING
+        bottom: int = PADDING + metrics.height() + PADDING + metrics.height()
+        top: int = PADDING + metrics.height() // 2
+        right: int = PADDING + label_width // 2
+        return QRectF(
+            left,
+            top,
+            max(self.width() - left - right, 1),
+            max(self.height() - top - bottom, 1),
+        )
+
+    def plot_width(self) -> int:
+        """Width of the plot area in pixels."""
+        return int(self.plot_area().width())
+
+    def data_transform(self, area: QRectF) -> QTransform:
+        """Map data coordinates to pixels within `area`."""
+        x_range: float = (self.x_axis.maximum - self.x_axis.minimum) or 1.0
+        y_range: float = (self.y_axis.maximum - self.y_axis.minimum) or 1.0
+        transform = QTransform()
+        transform.translate(area.left(), area.bottom())
+        transform.scale(area.width() / x_range, -area.height() / y_range)
+        transform.translate(-self.x_axis.minimum, -self.y_axis.minimum)
+        return transform
+
+    def render_static_layer(self) -> QPixmap:
+        pixel_ratio: float = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * pixel_ratio)
+        pixmap.setDevicePixelRatio(pixel_ratio)
+        pixmap.fill(BACKGROUND)
+        painter = QPainter(pixmap)
+        area: QRectF = self.plot_area()
+        if self.background is not None:
+            painter.fillRect(area, self.background)
+        metrics = QFontMetrics(self.font())
+        transform: QTransform = self.data_transform(area)
+
+        painter.setPen(QPen(GRID, 1))
+        for tick in self.x_axis.ticks():
+            x: float = transform.map(QPointF(tick, 0)).x()
+            painter.drawLine(QPointF(x, area.top()), QPointF(x, area.bottom()))
+        for tick in self.y_axis.ticks():
+            y: float = transform.map(QPointF(0, tick)).y()
+            painter.drawLine(QPointF(area.left(), y), QPointF(area.right(), y))
+
+        if self.target is not None:
+            painter.setPen(QPen(TARGET, 2, Qt.DashLine))
+            y = transform.map(QPointF(0, self.target)).y()
+            painter.drawLine(QPointF(area.left(), y), QPointF(area.right(), y))
+
+        painter.setPen(LABEL)
+        for tick in self.x_axis.ticks():
+            x = transform.map(QPointF(tick, 0)).x()
+            label: str = f"{tick:.0f}"
+            painter.drawText(
+                QPointF(
+                    x - metrics.horizontalAdvance(label) / 2,
+                    area.bottom() + PADDING + metrics.ascent(),
+                ),
+                label,
+            )
+        for tick in self.y_axis.ticks():
+            y = transform.map(QPointF(0, tick)).y()
+            label = f"{tick:.0f}"
+            painter.drawText(
+                QPointF(
+                    area.left() - PADDING - metrics.horizontalAdvance(label),
+                    y + metrics.ascent() / 2 - metrics.descent() / 2,
+                ),
+                label,
+            )
+        painter.drawText(
+            QRectF(
+                area.left(),
+                self.height() - metrics.height() - PADDING,
+                area.width(),
+                metrics.height(),
+            ),
+            Qt.AlignCenter,
+            self.x_axis.title,
+        )
+        painter.save()
+        painter.translate(PADDING, area.center().y())
+        painter.rotate(-90)
+        painter.drawText(
+            QRectF(-area.height() / 2, 0, area.height(), metrics.height()),
+            Qt.AlignCenter,
+            self.y_axis.title,
+        )
+        painter.restore()
+        painter.end()
+        return pixmap
+
+    @profiled("PlotWidget.paintEvent")
+    def paintEvent(self, _):
+        if (
+            self.static_layer is None
+            or self.static_layer.deviceIndependentSize().toSize() != self.size()
+            or self.static_layer.devicePixelRatio() != self.devicePixelRatioF()
+        ):
+            self.static_layer = self.render_static_layer()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.static_layer)
+        area: QRectF = self.plot_area()
+        painter.setClipRect(area)
+        painter.setRenderHint(QPainter.Antialiasing)
+        transform: QTransform = self.data_transform(area)
+        transform.translate(self.x_offset, 0)
+        painter.setTransform(transform)
+        painter.setPen(self.pen)
+        painter.drawPolyline(self.polygon)
+        painter.end()
+
+
+class PacerWidget(QWidget):
+    """Disk whose radius (between 0 and 1) follows the breathing pacer."""
+
+    def __init__(self, color: QColor = BLUE):
+        super().__init__()
+        self.setSizePolicy(
+            QSizePolicy(
+                QSizePolicy.Fixed,  # enforce self.sizeHint by fixing horizontal (width) policy
+                QSizePolicy.Preferred,
+            )
+        )
+        self.brush = QBrush(color)
+        self.radius: float = 0.0
+
+    def update_radius(self, radius: float):
+        self.radius = radius
+        self.update()
+
+    @profiled("PacerWidget.paintEvent")
+    def paintEvent(self, _):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.brush)
+        radius: float = self.radius * min(self.width(), self.height()) / 2
+        painter.drawEllipse(QRectF(self.rect()).center(), radius, radius)
+        painter.end()
+
+    def sizeHint(self):
+        height = self.size().height()
+        return QSize(height, height)  # force square aspect ratio
+
+    def resizeEvent(self, event):
+        if self.size().width() != self.size().height():
+            self.updateGeometry()  # adjusts geometry based on sizeHint
+        return super().resizeEvent(event)
@@ -0,0 +1,356 @@
+import gzip
+import json
+import lzma
+import os
+from bisect import bisect_right
+from collections import deque
+from math import inf
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, IO, Union
+from openhrv.config import (
+    RECORDING_SEGMENT_SIZE,
+    RECORDING_SEGMENT_DURATION,
+    RECORDING_QUEUE_SIZE,
+    RECORDING_INDEX_INTERVAL,
+)
+
+HEADER: str = "event,value,timestamp\n"
+# Recordings are compressed if their file name ends with one of these
+# extensions (e.g., `OpenHRV_2025-12-19-14-30.csv.gz`).
+COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    ".gz": gzip.compress,
+    ".xz": lzma.compress,
+}
+DECOMPRESSORS: dict[str, Callable[..., IO]] = {".gz": gzip.open, ".xz": lzma.open}
+
+
+def split_compression(file_path: str) -> tuple[Path, str]:
+    """Split `file_path` into the path of the uncompressed file and the
+    compression extension (empty if `file_path` isn't compressed)."""
+    path = Path(file_path)
+    if path.suffix in COMPRESSORS:
+        return path.with_suffix(""), path.suffix
+    return path, ""
+
+
+def manifest_path(file_path: str) -> str:
+    """The manifest of the recording that starts at `file_path`, e.g.,
+    `OpenHRV_2025-12-19-14-30.json` for `OpenHRV_2025-12-19-14-30.csv`."""
+    path, _ = split_compression(file_path)
+    return str(path.with_suffix(".json"))
+
+
+def index_path(file_path: str) -> str:
+    """The time index of the recording that starts at `file_path` (or of the
+    manifest at `file_path`), e.g., `OpenHRV_2025-12-19-14-30.index.csv`."""
+    path, _ = split_compression(file_path)
+    return str(path.with_name(f"{path.stem}.index.csv"))
+
+
+def segment_path(file_path: str, index: int) -> str:
+    """The first segment is `file_path` itself, subsequent segments are
+    numbered, e.g., `OpenHRV_2025-12-19-14-30.2.csv`."""
+    if index == 1:
+        return file_path
+    path, compression = split_compression(file_path)
+    return str(path.with_name(f"{path.stem}.{index}{path.suffix}{compression}"))
+
+
+def read_manifest(path: str) -> list[str]:
+    """Paths of the segments listed in the manifest at `path`, in order."""
+    with open(path) as f:
+        manifest: dict = json.load(f)
+    directory: Path = Path(path).parent
+    return [str(directory / segment["file"]) for segment in manifest["segments"]]
+
+
+def read_lines(path: str, batch: int = 0, offset: int = 0) -> Iterator[tuple[int, str]]:
+    """Complete lines of the segment at `path`, starting at `offset`, along
+    with the offset of each line. Offsets refer to the uncompressed data from
+    `batch` on, the position in the file of a complete gzip member or xz
+    stream (see SegmentedRecording), from which decompression starts. Lines
+    of compressed segments that were cut off (e.g., because the app crashed
+    while writing) are skipped."""
+    _, compression = split_compression(path)
+    with open(path, "rb") as file:
+        file.seek(batch)
+        f: IO[bytes] = DECOMPRESSORS[compression](file, "rb") if compression else file
+        with f:
+            f.seek(offset)
+            try:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # incomplete row
+                    yield offset, line.decode().rstrip("\r\n")
+                    offset += len(line)
+            except EOFError:  # incomplete compressed member
+                pass
+
+
+def parse_row(line: str) -> tuple[str, str, str]:
+    """Split a row into event, value, and timestamp. Values (e.g.,
+    annotations) can contain commas."""
+    event, rest = line.split(",", 1)
+    value, timestamp = rest.rsplit(",", 1)
+    return event, value, timestamp
+
+
+def read_recording(path: str) -> Iterator[tuple[str, str, str]]:
+    """Rows (event, value, timestamp) of the recording at `path`, which is
+    either a segment or a manifest (in which case all segments are read in
+    order)."""
+    paths: list[str] = read_manifest(path) if path.endswith(".json") else [path]
+    for segment in paths:
+        lines: Iterator[tuple[int, str]] = read_lines(segment)
+        next(lines, None)  # header
+        for _, line in lines:
+            yield parse_row(line)
+
+
+class RecordingReader:
+    """Read a recording (a segment or a manifest) from any point in time.
+
+    Reading uses a time index: the position (segment, batch, and offset, see
+    `read_lines`) of the first row of every `index_interval` seconds. Reading
+    from a point in time starts at the closest preceding position, rather
+    than at the beginning of the recording. The index is loaded from the
+    file that was written along with the recording (see `index_path`), if
+    `path` is a manifest, in which case compressed segments are decompressed
+    from the batch containing that position on. Otherwise, the recording is
+    scanned once in order to build the index, which only holds uncompressed
+    offsets, i.e., compressed segments are decompressed from their beginning.
+    """
+
+    def __init__(self, path: str, index_interval: float = RECORDING_INDEX_INTERVAL):
+        self.paths: list[str] = (
+            read_manifest(path) if path.endswith(".json") else [path]
+        )
+        self.index_interval = index_interval
+        self.start: Union[None, datetime] = None  # timestamp of the first row
+        self.duration: float = 0.0  # seconds
+        # (seconds since start, segment, batch, offset), in ascending order.
+        self.index: list[tuple[float, int, int, int]] = []
+        if path.endswith(".json") and Path(index_path(path)).exists():
+            self.load_index(index_path(path))
+        else:
+            self.scan()
+
+    def load_index(self, path: str):
+        lines: Iterator[tuple[int, str]] = read_lines(path)
+        next(lines, None)  # header
+        for _, line in lines:
+            timestamp, segment_text, batch_text, offset_text = line.split(",")
+            self.index.append(
+                (
+                    self.seconds(timestamp),
+                    int(segment_text),
+                    int(batch_text),
+                    int(offset_text),
+                )
+            )
+        if self.index:  # rows after the last entry aren't indexed yet
+            _, last_segment, last_batch, last_offset = self.index[-1]
+            self.scan(last_segment, last_batch, last_offset)
+
+    def scan(self, first_segment: int = 0, batch: int = 0, offset: int = 0):
+        """Index the rows from `offset` (from `batch`) in `first_segment`."""
+        for segment in range(first_segment, len(self.paths)):
+            lines: Iterator[tuple[int, str]] = read_lines(
+                self.paths[segment], batch, offset
+            )
+            if not (batch or offset):
+                next(lines, None)  # header
+            for row_offset, line in lines:
+                seconds: float = self.seconds(parse_row(line)[2])
+                if not self.index or seconds >= self.index[-1][0] + self.index_interval:
+                    self.index.append((seconds, segment, batch, row_offset))
+                self.duration = max(self.duration, seconds)
+            batch = offset = 0
+
+    def seconds(self, timestamp: str) -> float:
+        time: datetime = datetime.fromisoformat(timestamp)
+        if self.start is None:
+            self.start = time
+        return (time - self.start).total_seconds()
+
+    def rows(
+        self, start: float = 0.0, end: float = inf
+    ) -> Iterator[tuple[float, str, str]]:
+        """Rows (seconds since start, event, value) from `start` seconds
+        until (excluding) `end` seconds."""
+        if not self.index:
+            return
+        position: int = max(bisect_right(self.index, (start, inf, inf, inf)) - 1, 0)
+        _, first_segment, batch, offset = self.index[position]
+        for segment in range(first_segment, len(self.paths)):
+            lines: Iterator[tuple[int, str]] = read_lines(
+                self.paths[segment], batch, offset
+            )
+            if segment != first_segment:
+                next(lines, None)  # header
+            batch = offset = 0
+            for _, line in lines:
+                event, value, timestamp = parse_row(line)
+                seconds: float = self.seconds(timestamp)
+                if seconds >= end:
+                    return
+                if seconds >= start:
+                    yield seconds, event, value
+
+
+class SegmentedRecording:
+    """Record events to a sequence of CSV files (segments).
+
+    A new segment is started once the current one exceeds `max_bytes` or
+    spans more than `max_duration` seconds, such that individual files
+    remain tractable and a corrupted file only affects part of a session.
+    Each segment has its own header. The manifest (a JSON file next to the
+    first segment) lists the segments in order, with the time span and
+    number of events of each, and is updated whenever a segment is started
+    or finished. It's marked "complete" once the recording is closed.
+
+    Along with the recording, a time index (see `index_path`) is written: a
+    CSV file with the timestamp, segment (starting at 0), batch, and offset
+    of the first row of every `index_interval` seconds, such that readers
+    can jump to any point in time (see RecordingReader and `read_lines`).
+    The batch is the position in a compressed segment of the batch that
+    contains the row (0 for uncompressed segments), and the offset is the
+    position of the row in the uncompressed data from there.
+
+    Rows are queued and written in batches, when the queue holds
+    `queue_size` rows or `flush` is called (e.g., by a timer), which bounds
+    both memory and how many rows are lost if the app crashes.
+
+    If `file_path` ends with one of the COMPRESSORS' extensions, each batch
+    is written as a complete gzip member or xz stream. Files that consist of
+    several of those are valid and can be decompressed by standard tools,
+    and a file that was cut off in the middle of a batch remains readable
+    up to that batch.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        max_bytes: int = RECORDING_SEGMENT_SIZE,
+        max_duration: float = RECORDING_SEGMENT_DURATION,
+        queue_size: int = RECORDING_QUEUE_SIZE,
+        index_interval: float = RECORDING_INDEX_INTERVAL,
+    ):
+        self.file_path = file_path
+        self.compress: Union[None, Callable[[bytes], bytes]] = COMPRESSORS.get(
+            split_compression(file_path)[1]
+        )
+        self.max_bytes = max_bytes
+        self.max_duration = max_duration
+        self.queue_size = queue_size
+        self.index_interval = index_interval
+        self.queue: deque[str] = deque()
+        self.queue_bytes: int = 0  # uncompressed
+        self.index_queue: list[str] = []
+        self.last_indexed: Union[None, datetime] = None
+        self.segments: list[dict] = []
+        self.file: BinaryIO  # the current segment, see open_segment
+        self.segment_bytes: int = 0
+        self.segment_started: Union[None, datetime] = None
+        if Path(manifest_path(file_path)).exists():
+            raise FileExistsError(f"{manifest_path(file_path)} exists already.")
+        self.index_file = open(index_path(file_path), "x")
+        self.index_file.write("timestamp,segment,batch,offset\n")
+        self.index_file.flush()
+        try:
+            self.open_segment()
+        except OSError:  # e.g., the first segment exists already
+            self.index_file.close()
+            os.remove(index_path(file_path))
+            raise
+
+    @property
+    def name(self) -> str:
+        return self.file_path
+
+    def open_segment(self):
+        path: str = segment_path(self.file_path, len(self.segments) + 1)
+        # Never overwrite an existing recording.
+        self.file = open(path, "xb")
+        self.write_rows(HEADER)
+        self.segment_bytes = len(HEADER)
+        self.segment_started = None
+        self.segments.append(
+            {"file": Path(path).name, "start": None, "end": None, "events": 0}
+        )
+        self.write_manifest(complete=False)
+
+    def close_segment(self):
+        self.flush()
+        self.file.close()
+        self.segments[-1]["bytes"] = self.segment_bytes
+
+    def write(self, key: str, value, time: datetime):
+        if self.segment_started is None:
+            self.segment_started = time
+        elif (
+            self.segment_bytes >= self.max_bytes
+            or (time - self.segment_started).total_seconds() > self.max_duration
+        ):
+            self.close_segment()
+            self.open_segment()
+            self.segment_started = time
+        if (
+            self.last_indexed is None
+            or (time - self.last_indexed).total_seconds() >= self.index_interval
+        ):
+            self.last_indexed = time
+            # The queue is written as one batch, starting at the current end
+            # of the file. Uncompressed segments can be read from any offset.
+            batch, offset = (
+                (self.file.tell(), self.queue_bytes)
+                if self.compress
+                else (0, self.segment_bytes)
+            )
+            self.index_queue.append(
+                f"{time.isoformat()},{len(self.segments) - 1},{batch},{offset}\n"
+            )
+        row: str = f"{key},{value},{time.isoformat()}\n"
+        self.queue.append(row)
+        row_bytes: int = len(row.encode())  # offsets are in bytes
+        self.queue_bytes += row_bytes
+        self.segment_bytes += row_bytes
+        segment: dict = self.segments[-1]
+        if segment["start"] is None:
+            segment["start"] = time.isoformat()
+        segment["end"] = time.isoformat()
+        segment["events"] += 1
+        if len(self.queue) >= self.queue_size:
+            self.flush()
+
+    def flush(self):
+        """Write the queued rows and hand them to the operating system."""
+        if not self.queue:
+            return
+        self.write_rows("".join(self.queue))
+        self.queue.clear()
+        self.queue_bytes = 0
+        # Index rows only once they've been written.
+        if self.index_queue:
+            self.index_file.write("".join(self.index_queue))
+            self.index_file.flush()
+            self.index_queue.clear()
+
+    def write_rows(self, rows: str):
+        data: bytes = rows.encode()
+        self.file.write(self.compress(data) if self.compress else data)
+        self.file.flush()
+
+    def write_manifest(self, complete: bool):
+        path: str = manifest_path(self.file_path)
+        manifest: dict = {"segments": self.segments, "complete": complete}
+        # Replace the manifest atomically, readers never see a partial file.
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    def close(self):
+        self.close_segment()
+        self.index_file.close()
+        self.write_manifest(complete=True)
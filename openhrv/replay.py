@@ -0,0 +1,162 @@
+import lzma
+import math
+import threading
+import time
+from typing import Iterator, Union
+from PySide6.QtCore import QObject, Signal, QTimer
+from openhrv.recording import RecordingReader
+from openhrv.config import REPLAY_BATCH_SIZE
+
+
+class ReplayClient(QObject):
+    """Replay a recording as if it came from a sensor, at `speed` times the
+    recorded pace (`math.inf` replays as fast as possible).
+
+    The recorded IBIs are emitted like the sensor's (see SensorClient), such
+    that the model recomputes everything else. Changes of the breathing rate
+    and HRV target, annotations, and gaps are emitted as well.
+    """
+
+    ibi_update = Signal(object)
+    pacer_rate_update = Signal(float)
+    hrv_target_update = Signal(int)
+    annotation_update = Signal(str)
+    gap_update = Signal()
+    position_update = Signal(float)  # seconds since start of recording
+    status_update = Signal(str)
+    replay_started = Signal(float)  # duration of the recording in seconds
+    replay_finished = Signal()
+    reader_loaded = Signal(int, object)  # load, RecordingReader or exception
+
+    def __init__(self):
+        super().__init__()
+        self.reader: Union[None, RecordingReader] = None
+        self.load: int = 0  # incremented by every start and stop
+        self.loading: bool = False
+        self.path: str = ""
+        self.rows: Union[None, Iterator[tuple[float, str, str]]] = None
+        self.next_row: Union[None, tuple[float, str, str]] = None
+        self.speed: float = 1.0
+        self.position: float = 0.0  # seconds since start of recording
+        self.clock: float = 0.0  # time.monotonic() at self.position
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._replay)
+        self.reader_loaded.connect(self._start)
+
+    def start(self, path: str, speed: float = 1.0):
+        """Load the recording on a background thread, since indexing a long
+        recording that comes without an index takes a while (see
+        RecordingReader). The replay starts once it's loaded."""
+        self.stop()
+        self.speed = speed
+        self.path = path
+        self.position = 0.0
+        self.loading = True
+        self.status_update.emit(f"Loading {path}...")
+        threading.Thread(
+            target=self._load, args=(self.load, path), name="Replay", daemon=True
+        ).start()
+
+    def _load(self, load: int, path: str):
+        result: Union[RecordingReader, Exception]
+        try:
+            result = RecordingReader(path)
+        except (OSError, EOFError, lzma.LZMAError, ValueError, KeyError) as e:
+            result = ValueError(f"Couldn't replay {path}: {e}")
+        self.reader_loaded.emit(load, result)  # queued to the GUI thread
+
+    def _start(self, load: int, result: Union[RecordingReader, Exception]):
+        if load != self.load:  # stopped or restarted in the meantime
+            return
+        self.loading = False
+        if isinstance(result, Exception):
+            self.status_update.emit(str(result))
+            self.replay_finished.emit()
+            return
+        self.reader = result
+        self.status_update.emit(
+            f"Replaying {self.path} ({result.duration / 60:.0f} min)."
+        )
+        self.replay_started.emit(result.duration)
+        self.seek(self.position)  # sought while loading
+
+    def stop(self):
+        self.timer.stop()
+        self.load += 1
+        self.loading = False
+        self.reader = None
+        self.rows = None
+        self.next_row = None
+
+    def is_replaying(self) -> bool:
+        return self.loading or self.reader is not None
+
+    def set_speed(self, speed: float):
+        self.position = self._current_position()
+        self.clock = time.monotonic()
+        self.speed = speed
+        if self.reader is not None:
+            self._schedule()
+
+    def seek(self, seconds: float):
+        """Continue replaying from `seconds` since the start of the recording,
+        skipping all rows before."""
+        if self.reader is None:
+            if self.loading:
+                self.position = seconds  # see self._start
+            return
+        self.timer.stop()
+        self.rows = self.reader.rows(seconds)
+        self.next_row = next(self.rows, None)
+        self.position = seconds
+        self.clock = time.monotonic()
+        self.gap_update.emit()  # the IBIs before and after aren't consecutive
+        self._schedule()
+
+    def _current_position(self) -> float:
+        if math.isinf(self.speed):
+            return self.position
+        return self.position + (time.monotonic() - self.clock) * self.speed
+
+    def _schedule(self):
+        if self.next_row is None:
+            self.status_update.emit("Finished replay.")
+            self.reader = None
+            self.replay_finished.emit()
+            return
+        if math.isinf(self.speed):
+            self.timer.start(0)  # process events between batches
+            return
+        delay: float = (self.next_row[0] - self._current_position()) / self.speed
+        self.timer.start(max(round(delay * 1000), 0))
+
+    def _replay(self):
+        """Emit the rows that are due, or the next batch at maximum speed."""
+        if self.rows is None:
+            return
+        position: float = self._current_position()
+        n_rows: int = 0
+        while self.next_row is not None and n_rows < REPLAY_BATCH_SIZE:
+            seconds, event, value = self.next_row
+            if not math.isinf(self.speed) and seconds > position:
+                break
+            self._emit(event, value)
+            n_rows += 1
+            self.next_row = next(self.rows, None)
+            if math.isinf(self.speed):
+                self.position = seconds
+        self.position_update.emit(self._current_position())
+        self._schedule()
+
+    def _emit(self, event: str, value: str):
+        if event == "InterBeatInterval":
+            self.ibi_update.emit(round(float(value)))
+        elif event == "PacerRate":
+            self.pacer_rate_update.emit(float(value))
+        elif event == "HrvTarget":
+            self.hrv_target_update.emit(round(float(value)))
+        elif event == "Annotation":
+            self.annotation_update.emit(value)
+        elif event == "Gap":
+            self.gap_update.emit()
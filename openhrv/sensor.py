@@ -1,4 +1,5 @@
-from PySide6.QtCore import QObject, Signal, QByteArray
+import logging
+from PySide6.QtCore import QObject, Signal, QByteArray, QTimer
 from PySide6.QtBluetooth import (
     QBluetoothDeviceDiscoveryAgent,
     QLowEnergyController,
@@ -11,40 +12,84 @@ from PySide6.QtBluetooth import (
 from math import ceil
 from typing import Union
 from openhrv.utils import get_sensor_address, get_sensor_remote_address
-from openhrv.config import COMPATIBLE_SENSORS
+from openhrv.config import (
+    COMPATIBLE_SENSORS,
+    SCAN_TIMEOUT,
+    RECONNECT_INITIAL_DELAY,
+    RECONNECT_MAX_DELAY,
+)
+
+log = logging.getLogger(__name__)
+
+
+def is_compatible_sensor(sensor: QBluetoothDeviceInfo) -> bool:
+    """Sensors must be Bluetooth Low Energy devices that advertise the
+    "GATT Service 0x180D Heart Rate". Advertisements don't always include
+    service UUIDs (e.g., for devices that are already paired), in which case
+    sensors are identified by name."""
+    if not (
+        sensor.coreConfigurations()
+        & QBluetoothDeviceInfo.CoreConfiguration.LowEnergyCoreConfiguration
+    ):
+        return False
+    if sensor.rssi() > 0:  # https://www.mokoblue.com/measures-of-bluetooth-rssi/
+        return False
+    service_uuids: list[QBluetoothUuid] = sensor.serviceUuids()
+    if service_uuids:
+        return (
+            QBluetoothUuid(QBluetoothUuid.ServiceClassUuid.HeartRate) in service_uuids
+        )
+    return any(cs in sensor.name() for cs in COMPATIBLE_SENSORS)
 
 
 class SensorScanner(QObject):
+    """Report compatible sensors as soon as they're discovered, instead of
+    waiting for the discovery to finish."""
+
     sensor_update = Signal(object)
     status_update = Signal(str)
 
     def __init__(self):
         super().__init__()
+        self.sensors: list[QBluetoothDeviceInfo] = []
         self.scanner = QBluetoothDeviceDiscoveryAgent()
+        self.scanner.setLowEnergyDiscoveryTimeout(SCAN_TIMEOUT)
+        self.scanner.deviceDiscovered.connect(self._handle_discovered_sensor)
         self.scanner.finished.connect(self._handle_scan_result)
         self.scanner.errorOccurred.connect(self._handle_scan_error)
 
+    def set_timeout(self, timeout: int):
+        """Stop searching for sensors after `timeout` milliseconds."""
+        self.scanner.setLowEnergyDiscoveryTimeout(timeout)
+
     def scan(self):
         if self.scanner.isActive():
             self.status_update.emit("Already searching for sensors.")
             return
-        self.status_update.emit("Searching for sensors (this might take a while).")
-        self.scanner.start()
+        self.sensors = []
+        self.status_update.emit("Searching for sensors.")
+        self.scanner.start(
+            QBluetoothDeviceDiscoveryAgent.DiscoveryMethod.LowEnergyMethod
+        )
+
+    def _handle_discovered_sensor(self, sensor: QBluetoothDeviceInfo):
+        if not is_compatible_sensor(sensor):
+            return
+        address: str = get_sensor_address(sensor)
+        if any(get_sensor_address(s) == address for s in self.sensors):
+            return
+        self.sensors.append(sensor)
+        self.sensor_update.emit(list(self.sensors))
+        self.status_update.emit(f"Found {sensor.name()}. Still searching for sensors.")
 
     def _handle_scan_result(self):
-        sensors: list[QBluetoothDeviceInfo] = [
-            d
-            for d in self.scanner.discoveredDevices()
-            if (any(cs in d.name() for cs in COMPATIBLE_SENSORS)) and (d.rssi() <= 0)
-        ]  # https://www.mokoblue.com/measures-of-bluetooth-rssi/
-        if not sensors:
+        if not self.sensors:
             self.status_update.emit("Couldn't find sensors.")
             return
-        self.sensor_update.emit(sensors)
-        self.status_update.emit(f"Found {len(sensors)} sensor(s).")
+        self.status_update.emit(f"Found {len(self.sensors)} sensor(s).")
 
     def _handle_scan_error(self, error):
-        print(error)
+        log.warning("Scanning for sensors failed: %s", error)
 
 
 class SensorClient(QObject):
@@ -54,13 +99,25 @@ class SensorClient(QObject):
     OpenHRV. Pairing isn't implemented in Qt6.
 
     In Qt terminology client=central, server=peripheral.
+
+    If the connection is lost (rather than disconnected by the user), the
+    client keeps reconnecting to the sensor, doubling the delay between
+    attempts up to RECONNECT_MAX_DELAY.
     """
 
     ibi_update = Signal(object)
     status_update = Signal(str)
+    sensor_connected = Signal(object)
+    sensor_disconnected = Signal()
 
     def __init__(self):
         super().__init__()
+        self.sensor: Union[None, QBluetoothDeviceInfo] = None
+        self.reconnect: bool = False
+        self.reconnect_attempts: int = 0
+        self.reconnect_timer = QTimer()
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self._reconnect_client)
         self.client: Union[None, QLowEnergyController] = None
         self.hr_service: Union[None, QLowEnergyService] = None
         self.hr_notification: Union[None, QLowEnergyDescriptor] = None
@@ -87,6 +144,13 @@ class SensorClient(QObject):
         self.status_update.emit(
             f"Connecting to sensor at {get_sensor_address(sensor)} (this might take a while)."
         )
+        self.reconnect_timer.stop()
+        self.reconnect = True
+        self.reconnect_attempts = 0
+        self.sensor = sensor
+        self._create_client(sensor)
+
+    def _create_client(self, sensor: QBluetoothDeviceInfo):
         self.client = QLowEnergyController.createCentral(sensor)
         self.client.errorOccurred.connect(self._catch_error)
         self.client.connected.connect(self._discover_services)
@@ -95,10 +159,14 @@ class SensorClient(QObject):
         self.client.connectToDevice()
 
     def disconnect_client(self):
+        self.reconnect = False
+        if self.reconnect_timer.isActive():
+            self.reconnect_timer.stop()
+            self.status_update.emit("Stopped reconnecting to sensor.")
         if self.hr_notification is not None and self.hr_service is not None:
             if not self.hr_notification.isValid():
                 return
-            print("Unsubscribing from HR service.")
+            log.info("Unsubscribing from HR service.")
             self.hr_service.writeDescriptor(
                 self.hr_notification, self.DISABLE_NOTIFICATION
             )
@@ -119,12 +187,13 @@ class SensorClient(QObject):
             s for s in self.client.services() if s == self.HR_SERVICE
         ]
         if not hr_service:
-            print(f"Couldn't find HR service on {self._sensor_address()}.")
+            log.warning("Couldn't find HR service on %s.", self._sensor_address())
             return
         self.hr_service = self.client.createServiceObject(hr_service[0])
         if not self.hr_service:
-            print(
-                f"Couldn't establish connection to HR service on {self._sensor_address()}."
+            log.warning(
+                "Couldn't establish connection to HR service on %s.",
+                self._sensor_address(),
             )
             return
         self.hr_service.stateChanged.connect(self._start_hr_notification)
@@ -140,18 +209,45 @@ class SensorClient(QObject):
             self.HR_CHARACTERISTIC
         )
         if not hr_char.isValid():
-            print(f"Couldn't find HR characterictic on {self._sensor_address()}.")
+            log.warning(
+                "Couldn't find HR characterictic on %s.", self._sensor_address()
+            )
         self.hr_notification = hr_char.descriptor(
             QBluetoothUuid.DescriptorType.ClientCharacteristicConfiguration
         )
         if not self.hr_notification.isValid():
-            print("HR characteristic is invalid.")
+            log.warning("HR characteristic is invalid.")
         self.hr_service.writeDescriptor(self.hr_notification, self.ENABLE_NOTIFICATION)
+        self.reconnect_attempts = 0
+        self.sensor_connected.emit(self.sensor)
 
     def _reset_connection(self):
-        print(f"Discarding sensor at {self._sensor_address()}.")
+        log.info("Discarding sensor at %s.", self._sensor_address())
         self._remove_service()
         self._remove_client()
+        self.sensor_disconnected.emit()
+        if self.reconnect:
+            self._schedule_reconnect()
+
+    def _schedule_reconnect(self):
+        delay: int = min(
+            RECONNECT_INITIAL_DELAY * 2 ** min(self.reconnect_attempts, 16),
+            RECONNECT_MAX_DELAY,
+        )
+        self.reconnect_attempts += 1
+        self.status_update.emit(
+            f"Lost connection to sensor. Reconnecting in {delay / 1000:g} seconds"
+            f" (attempt {self.reconnect_attempts})."
+        )
+        self.reconnect_timer.start(delay)
+
+    def _reconnect_client(self):
+        if self.sensor is None or self.client is not None:
+            return
+        self.status_update.emit(
+            f"Reconnecting to sensor at {get_sensor_address(self.sensor)}."
+        )
+        self._create_client(self.sensor)
 
     def _remove_service(self):
         if self.hr_service is None:
@@ -159,7 +255,7 @@ class SensorClient(QObject):
         try:
             self.hr_service.deleteLater()
         except Exception as e:
-            print(f"Couldn't remove service: {e}")
+            log.warning("Couldn't remove service: %s", e)
         finally:
             self.hr_service = None
             self.hr_notification = None
@@ -171,7 +267,7 @@ class SensorClient(QObject):
             self.client.disconnected.disconnect()
             self.client.deleteLater()
         except Exception as e:
-            print(f"Couldn't remove client: {e}")
+            log.warning("Couldn't remove client: %s", e)
         finally:
             self.client = None
 
@@ -180,57 +276,65 @@ class SensorClient(QObject):
         self._reset_connection()
 
     def _data_handler(self, _, data: QByteArray):  # _ is unused but mandatory argument
-        """
-        `data` is formatted according to the
-        "GATT Characteristic and Object Type 0x2A37 Heart Rate Measurement"
-        which is one of the three characteristics included in the
-        "GATT Service 0x180D Heart Rate".
-
-        `data` can include the following bytes:
-        - flags
-            Always present.
-            - bit 0: HR format (uint8 vs. uint16)
-            - bit 1, 2: sensor contact status
-            - bit 3: energy expenditure status
-            - bit 4: RR interval status
-        - HR
-            Encoded by one or two bytes depending on flags/bit0. One byte is
-            always present (uint8). Two bytes (uint16) are necessary to
-            represent HR > 255.
-        - energy expenditure
-            Encoded by 2 bytes. Only present if flags/bit3.
-        - inter-beat-intervals (IBIs)
-            One IBI is encoded by 2 consecutive bytes. Up to 18 bytes depending
-            on presence of uint16 HR format and energy expenditure.
-        """
-        heart_rate_measurement_bytes: bytes = data.data()
-
-        byte0: int = heart_rate_measurement_bytes[0]
-        uint8_format: bool = (byte0 & 1) == 0
-        energy_expenditure: bool = ((byte0 >> 3) & 1) == 1
-        rr_interval: bool = ((byte0 >> 4) & 1) == 1
-
-        if not rr_interval:
-            return
-
-        first_rr_byte: int = 2
-        if uint8_format:
-            # hr = data[1]
-            pass
-        else:
-            # hr = (data[2] << 8) | data[1] # uint16
-            first_rr_byte += 1
-        if energy_expenditure:
-            # ee = (data[first_rr_byte + 1] << 8) | data[first_rr_byte]
-            first_rr_byte += 2
-
-        for i in range(first_rr_byte, len(heart_rate_measurement_bytes), 2):
-            ibi: int = (
-                heart_rate_measurement_bytes[i + 1] << 8
-            ) | heart_rate_measurement_bytes[i]
-            # Polar H7, H9, and H10 record IBIs in 1/1024 seconds format.
-            # Convert 1/1024 sec format to milliseconds.
-            # TODO: move conversion to model and only convert if sensor doesn't
-            # transmit data in milliseconds.
-            ibi = ceil(ibi / 1024 * 1000)
+        for ibi in decode_ibis(data.data()):
             self.ibi_update.emit(ibi)
+
+
+def decode_ibis(
+    heart_rate_measurement_bytes: Union[bytes, bytearray, memoryview],
+) -> list[int]:
+    """Return the IBIs (in milliseconds) contained in a heart rate measurement.
+
+    `heart_rate_measurement_bytes` are formatted according to the
+    "GATT Characteristic and Object Type 0x2A37 Heart Rate Measurement"
+    which is one of the three characteristics included in the
+    "GATT Service 0x180D Heart Rate".
+
+    The measurement can include the following bytes:
+    - flags
+        Always present.
+        - bit 0: HR format (uint8 vs. uint16)
+        - bit 1, 2: sensor contact status
+        - bit 3: energy expenditure status
+        - bit 4: RR interval status
+    - HR
+        Encoded by one or two bytes depending on flags/bit0. One byte is
+        always present (uint8). Two bytes (uint16) are necessary to
+        represent HR > 255.
+    - energy expenditure
+        Encoded by 2 bytes. Only present if flags/bit3.
+    - inter-beat-intervals (IBIs)
+        One IBI is encoded by 2 consecutive bytes. Up to 18 bytes depending
+        on presence of uint16 HR format and energy expenditure.
+    """
+    byte0: int = heart_rate_measurement_bytes[0]
+    uint8_format: bool = (byte0 & 1) == 0
+    energy_expenditure: bool = ((byte0 >> 3) & 1) == 1
+    rr_interval: bool = ((byte0 >> 4) & 1) == 1
+
+    if not rr_interval:
+        return []
+
+    first_rr_byte: int = 2
+    if uint8_format:
+        # hr = data[1]
+        pass
+    else:
+        # hr = (data[2] << 8) | data[1] # uint16
+        first_rr_byte += 1
+    if energy_expenditure:
+        # ee = (data[first_rr_byte + 1] << 8) | data[first_rr_byte]
+        first_rr_byte += 2
+
+    ibis: list[int] = []
+    for i in range(first_rr_byte, len(heart_rate_measurement_bytes), 2):
+        ibi: int = (
+            heart_rate_measurement_bytes[i + 1] << 8
+        ) | heart_rate_measurement_bytes[i]
+        # Polar H7, H9, and H10 record IBIs in 1/1024 seconds format.
+        # Convert 1/1024 sec format to milliseconds.
+        # TODO: move conversion to model and only convert if sensor doesn't
+        # transmit data in milliseconds.
+        ibis.append(ceil(ibi / 1024 * 1000))
+
+    return ibis
@@ -0,0 +1,122 @@
+import json
+import time
+from collections import deque
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QTcpServer, QTcpSocket, QHostAddress
+from openhrv.utils import NamedSignal, latest_value
+from openhrv.config import STREAM_QUEUE_SIZE, STREAM_MAX_PENDING_BYTES
+
+# Events that only change occasionally. Their latest values are sent to
+# subscribers as soon as they connect.
+STATE_EVENTS: tuple[str, ...] = ("PacerRate", "HrvTarget")
+
+
+def encode_frame(name: str, value, timestamp: float) -> bytes:
+    """Encode an event as a line of JSON (NDJSON)."""
+    frame = {"event": name, "value": value, "timestamp": round(timestamp, 6)}
+    return (json.dumps(frame, separators=(",", ":")) + "\n").encode()
+
+
+class StreamClient:
+    """A subscriber with a bounded queue of frames that are waiting to be sent.
+
+    Frames are written to the socket as long as Qt's write buffer holds fewer
+    than STREAM_MAX_PENDING_BYTES. Beyond that, frames are queued. If the
+    queue is full, the oldest frame is dropped, such that slow subscribers
+    get the most recent data rather than falling further behind.
+    """
+
+    def __init__(self, socket: QTcpSocket):
+        self.socket = socket
+        self.queue: deque[bytes] = deque(maxlen=STREAM_QUEUE_SIZE)
+        self.dropped: int = 0  # frames dropped since the last "Dropped" notice
+
+    def send(self, frame: bytes):
+        if not self.queue and self._can_write():
+            self.socket.write(frame)
+            return
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(frame)
+
+    def flush(self):
+        if self.dropped and self._can_write():
+            # Let the subscriber know that it missed data.
+            self.socket.write(encode_frame("Dropped", self.dropped, time.time()))
+            self.dropped = 0
+        while self.queue and self._can_write():
+            self.socket.write(self.queue.popleft())
+
+    def _can_write(self) -> bool:
+        return self.socket.bytesToWrite() < STREAM_MAX_PENDING_BYTES
+
+
+class StreamServer(QObject):
+    """Publish events to any number of subscribers on the local network.
+
+    Subscribers connect via TCP and receive one JSON object per line, e.g.,
+    {"event":"InterBeatInterval","value":912,"timestamp":1734616200.12}
+    with `timestamp` in seconds since the epoch. Each frame is encoded once,
+    regardless of the number of subscribers. The server is meant to run on
+    its own thread, so that slow subscribers don't stall the GUI.
+    """
+
+    status_update = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.server = QTcpServer(self)  # parent moves server along with self
+        self.server.newConnection.connect(self._add_clients)
+        self.clients: dict[QTcpSocket, StreamClient] = {}
+        self.state: dict[str, bytes] = {}
+
+    def listen(self, host: str, port: int):
+        if self.server.isListening():
+            self.status_update.emit(
+                f"Already streaming on port {self.server.serverPort()}."
+            )
+            return
+        if not self.server.listen(QHostAddress(host), port):
+            self.status_update.emit(
+                f"Couldn't stream on {host}:{port}: {self.server.errorString()}"
+            )
+            return
+        self.status_update.emit(f"Streaming on {host}:{self.server.serverPort()}.")
+
+    def close(self):
+        for client in list(self.clients.values()):
+            client.socket.disconnected.disconnect()
+            client.socket.abort()
+            client.socket.deleteLater()
+        self.clients.clear()
+        self.server.close()
+
+    def port(self) -> int:
+        return self.server.serverPort()
+
+    def publish(self, data: NamedSignal):
+        key, val = data
+        frame: bytes = encode_frame(key, latest_value(val), time.time())
+        if key in STATE_EVENTS:
+            self.state[key] = frame
+        for client in self.clients.values():
+            client.send(frame)
+
+    def _add_clients(self):
+        while self.server.hasPendingConnections():
+            socket: QTcpSocket = self.server.nextPendingConnection()
+            client = StreamClient(socket)
+            self.clients[socket] = client
+            socket.bytesWritten.connect(client.flush)
+            # Subscribers don't talk, discard anything they send.
+            socket.readyRead.connect(lambda s=socket: s.readAll())
+            socket.disconnected.connect(lambda s=socket: self._remove_client(s))
+            for frame in self.state.values():
+                client.send(frame)
+            self.status_update.emit(f"Streaming to {len(self.clients)} subscriber(s).")
+
+    def _remove_client(self, socket: QTcpSocket):
+        if self.clients.pop(socket, None) is None:
+            return
+        socket.deleteLater()
+        self.status_update.emit(f"Streaming to {len(self.clients)} subscriber(s).")
@@ -0,0 +1,136 @@
+import math
+import random
+from itertools import islice
+from typing import Iterator
+
+
+def encode_heart_rate_measurement(ibis: list[int], heart_rate: int) -> bytes:
+    """Encode IBIs (in milliseconds) as a "GATT Characteristic and Object Type
+    0x2A37 Heart Rate Measurement" (see `openhrv.sensor.decode_ibis`).
+
+    Like Polar sensors, use the uint8 HR format, flag sensor contact, and
+    transmit IBIs in 1/1024 seconds format.
+    """
+    flags: int = 0b0110  # sensor contact supported and detected
+    if ibis:
+        flags |= 0b10000  # RR intervals present
+    measurement = bytearray([flags, min(heart_rate, 255)])
+    for ibi in ibis:
+        ibi_1024: int = round(ibi / 1000 * 1024)
+        measurement += bytes([ibi_1024 & 0xFF, ibi_1024 >> 8])
+
+    return bytes(measurement)
+
+
+class SignalSimulator:
+    """Synthetic IBI stream for load and accuracy tests.
+
+    IBIs fluctuate around `mean_ibi` with respiratory sinus arrhythmia (RSA)
+    at `breathing_rate` and a low frequency (LF) drift, each spanning the
+    given peak-to-peak range in milliseconds. Without noise and artifacts,
+    local HRV settles at `rsa_range`.
+
+    On top of that, beats can be ectopic (a premature beat followed by a
+    compensatory one), or missed (two IBIs merge into one). Beats are bundled
+    into packets about every `packet_interval` seconds like Polar sensors do,
+    and packets get lost during dropouts of `dropout_duration` seconds.
+    Probabilities apply per beat (ectopic, missed) or per packet (dropout).
+
+    Pass a `seed` in order to make the stream reproducible.
+    """
+
+    ECTOPIC_PREMATURITY: float = 0.7  # premature beat relative to regular IBI
+
+    def __init__(
+        self,
+        mean_ibi: float = 900.0,
+        breathing_rate: float = 6.0,
+        rsa_range: float = 100.0,
+        lf_range: float = 0.0,
+        lf_frequency: float = 0.1,
+        noise: float = 0.0,
+        ectopic_probability: float = 0.0,
+        missed_probability: float = 0.0,
+        dropout_probability: float = 0.0,
+        dropout_duration: float = 5.0,
+        packet_interval: float = 1.0,
+        seed=None,
+    ):
+        # A missed beat (or a dropout) is followed by another one with these
+        # probabilities, at 1 no beat (or packet) would ever be received.
+        for name, probability in [
+            ("missed_probability", missed_probability),
+            ("dropout_probability", dropout_probability),
+        ]:
+            if not 0 <= probability < 1:
+                raise ValueError(f"{name} must be at least 0 and less than 1.")
+        self.mean_ibi = mean_ibi
+        self.breathing_rate = breathing_rate  # breaths per minute
+        self.rsa_range = rsa_range
+        self.lf_range = lf_range
+        self.lf_frequency = lf_frequency  # Hz
+        self.noise = noise  # standard deviation of Gaussian noise
+        self.ectopic_probability = ectopic_probability
+        self.missed_probability = missed_probability
+        self.dropout_probability = dropout_probability
+        self.dropout_duration = dropout_duration  # seconds
+        self.packet_interval = packet_interval  # seconds
+        self._random = random.Random(seed)
+        self._lf_phase: float = self._random.uniform(0, 2 * math.pi)
+
+    def _regular_ibi(self, time: float) -> float:
+        ibi: float = self.mean_ibi + (self.rsa_range / 2) * math.sin(
+            2 * math.pi * self.breathing_rate / 60 * time
+        )
+        ibi += (self.lf_range / 2) * math.sin(
+            2 * math.pi * self.lf_frequency * time + self._lf_phase
+        )
+        if self.noise:
+            ibi += self._random.gauss(0, self.noise)
+        return ibi
+
+    def beats(self) -> Iterator[tuple[float, int]]:
+        """Yield (time of beat in seconds, IBI in milliseconds) indefinitely."""
+        time: float = 0.0
+        while True:
+            ibi: float = self._regular_ibi(time)
+            if self._random.random() < self.ectopic_probability:
+                premature_ibi: float = self.ECTOPIC_PREMATURITY * ibi
+                time += premature_ibi / 1000
+                yield time, round(premature_ibi)
+                ibi = (2 - self.ECTOPIC_PREMATURITY) * ibi  # compensatory pause
+            while self._random.random() < self.missed_probability:
+                ibi += self._regular_ibi(time + ibi / 1000)
+            time += ibi / 1000
+            yield time, round(ibi)
+
+    def bundles(self) -> Iterator[tuple[float, list[int]]]:
+        """Yield (time of transmission in seconds, IBIs in milliseconds)
+        indefinitely, skipping bundles that are lost during dropouts."""
+        beats = self.beats()
+        beat_time, ibi = next(beats)
+        packet_time: float = 0.0
+        dropout_end: float = 0.0
+        while True:
+            packet_time += self.packet_interval
+            ibis: list[int] = []
+            while beat_time <= packet_time:
+                ibis.append(ibi)
+                beat_time, ibi = next(beats)
+            if packet_time < dropout_end:
+                continue
+            if self._random.random() < self.dropout_probability:
+                dropout_end = packet_time + self.dropout_duration
+                continue
+            yield packet_time, ibis
+
+    def packets(self) -> Iterator[tuple[float, bytes]]:
+        """Yield (time of transmission in seconds, encoded 0x2A37 Heart Rate
+        Measurement) indefinitely."""
+        for time, ibis in self.bundles():
+            heart_rate: int = round(60_000 / (sum(ibis) / len(ibis))) if ibis else 0
+            yield time, encode_heart_rate_measurement(ibis, heart_rate)
+
+    def ibis(self, n_samples: int) -> list[int]:
+        """Return the first `n_samples` received IBIs in bulk."""
+        return list(islice((i for _, ibis in self.bundles() for i in ibis), n_samples))
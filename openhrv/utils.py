@@ -2,7 +2,12 @@ import re
 import platform
 from pathlib import Path
 from collections import namedtuple
-from PySide6.QtBluetooth import QBluetoothDeviceInfo
+from PySide6.QtCore import QUuid
+from PySide6.QtBluetooth import (
+    QBluetoothDeviceInfo,
+    QBluetoothAddress,
+    QBluetoothUuid,
+)
 
 
 NamedSignal = namedtuple("NamedSignal", "name value")
@@ -20,6 +25,22 @@ def get_sensor_address(sensor: QBluetoothDeviceInfo) -> str:
     return sensor_address
 
 
+def sensor_from_address(address: str, name: str) -> QBluetoothDeviceInfo:
+    """Return sensor with MAC (Windows, Linux) or UUID (macOS) `address`, e.g.,
+    to connect to a known sensor without discovering it first."""
+    system = platform.system()
+    sensor = QBluetoothDeviceInfo()
+    if system in ["Linux", "Windows"]:
+        sensor = QBluetoothDeviceInfo(QBluetoothAddress(address), name, 0)
+    elif system == "Darwin":
+        sensor = QBluetoothDeviceInfo(QBluetoothUuid(QUuid(address)), name, 0)
+    sensor.setCoreConfigurations(
+        QBluetoothDeviceInfo.CoreConfiguration.LowEnergyCoreConfiguration
+    )
+
+    return sensor
+
+
 def get_sensor_remote_address(sensor) -> str:
     """Return MAC (Windows, Linux) or UUID (macOS)."""
     system = platform.system()
@@ -60,6 +81,16 @@ def valid_path(path: str) -> bool:
     return valid
 
 
+def latest_value(value):
+    """Return the most recent sample of a NamedSignal's value. Buffer updates
+    carry (seconds, samples) buffers, sensor updates a list of sensors."""
+    if isinstance(value, list):
+        return value[-1]
+    if isinstance(value, tuple):
+        return value[-1][-1]
+    return value
+
+
 def sign(value: int) -> int:
     if value > 0:
         return 1
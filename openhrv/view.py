@@ -1,3 +1,6 @@
+import time
+import math
+import logging
 from datetime import datetime
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -14,135 +17,117 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QProgressBar,
     QGridLayout,
-    QSizePolicy,
 )
-from PySide6.QtCore import Qt, QThread, Signal, QObject, QTimer, QMargins, QSize
-from PySide6.QtGui import QIcon, QLinearGradient, QBrush, QGradient, QColor
-from PySide6.QtCharts import QChartView, QChart, QSplineSeries, QValueAxis, QAreaSeries
+from PySide6.QtCore import (
+    Qt,
+    QThread,
+    Signal,
+    QObject,
+    QEvent,
+    QVariantAnimation,
+    QAbstractAnimation,
+    QTimer,
+)
+from PySide6.QtGui import (
+    QIcon,
+    QLinearGradient,
+    QBrush,
+    QGradient,
+    QColor,
+    QGuiApplication,
+    QKeySequence,
+    QShortcut,
+)
 from PySide6.QtBluetooth import QBluetoothDeviceInfo
-from typing import Iterable
-from openhrv.utils import valid_address, valid_path, get_sensor_address, NamedSignal
+from typing import Iterable, Union, TYPE_CHECKING
+from openhrv.utils import (
+    valid_address,
+    valid_path,
+    get_sensor_address,
+    sensor_from_address,
+    NamedSignal,
+)
 from openhrv.sensor import SensorScanner, SensorClient
 from openhrv.logger import Logger
+from openhrv.server import StreamServer
+from openhrv.outlet import Outlet
+from openhrv.replay import ReplayClient
+from openhrv.profiling import profiler, profiled
 from openhrv.pacer import Pacer
+from openhrv.plot import PlotWidget, PacerWidget, BLUE
 from openhrv.model import Model
 from openhrv.config import (
     breathing_rate_to_tick,
-    HRV_HISTORY_DURATION,
-    IBI_HISTORY_DURATION,
+    HRV_HISTORY_DURATIONS,
+    IBI_HISTORY_DURATIONS,
     MAX_BREATHING_RATE,
     MIN_BREATHING_RATE,
     MIN_HRV_TARGET,
     MAX_HRV_TARGET,
     MIN_PLOT_IBI,
     MAX_PLOT_IBI,
+    HRV_PLOT_HEADROOM,
+    COHERENCE_HISTORY_DURATION,
+    RENDERER,
+    PACER_PUBLISH_INTERVAL,
+    IDLE_TIMEOUT,
+    REPLAY_SPEEDS,
+    PROFILE_SHORTCUT,
 )
 from openhrv import __version__ as version, resources  # noqa
 
-BLUE = QColor(135, 206, 250)
+if TYPE_CHECKING:  # QtCharts is only imported when it's used
+    from openhrv.charts import XYSeriesWidget
+
 WHITE = QColor(255, 255, 255)
 GREEN = QColor(0, 255, 0)
 YELLOW = QColor(255, 255, 0)
 RED = QColor(255, 0, 0)
 
+log = logging.getLogger(__name__)
 
-class PacerWidget(QChartView):
-    def __init__(
-        self, x_values: Iterable[float], y_values: Iterable[float], color: QColor = BLUE
-    ):
-        super().__init__()
 
-        self.setSizePolicy(
-            QSizePolicy(
-                QSizePolicy.Fixed,  # enforce self.sizeHint by fixing horizontal (width) policy
-                QSizePolicy.Preferred,
-            )
+def use_opengl(renderer: str) -> bool:
+    """OpenGL rendering isn't available on platforms without a display, such
+    as offscreen, in which case charts fall back to software rendering."""
+    if renderer != "opengl":
+        return False
+    platform: str = QGuiApplication.platformName()
+    if platform in ["offscreen", "minimal"]:
+        log.info(
+            "OpenGL isn't available on %s platform, rendering in software.", platform
         )
+        return False
+    return True
 
-        self.plot = QChart()
-        self.plot.legend().setVisible(False)
-        self.plot.setBackgroundRoundness(0)
-        self.plot.setMargins(QMargins(0, 0, 0, 0))
-
-        self.disc_circumference_coord = QSplineSeries()
-        self._instantiate_series(x_values, y_values)
-        self.disk = QAreaSeries(self.disc_circumference_coord)
-        self.disk.setColor(color)
-        self.plot.addSeries(self.disk)
-
-        self.x_axis = QValueAxis()
-        self.x_axis.setRange(-1, 1)
-        self.x_axis.setVisible(False)
-        self.plot.addAxis(self.x_axis, Qt.AlignBottom)
-        self.disk.attachAxis(self.x_axis)
-
-        self.y_axis = QValueAxis()
-        self.y_axis.setRange(-1, 1)
-        self.y_axis.setVisible(False)
-        self.plot.addAxis(self.y_axis, Qt.AlignLeft)
-        self.disk.attachAxis(self.y_axis)
-
-        self.setChart(self.plot)
-
-    def _instantiate_series(self, x_values: Iterable[float], y_values: Iterable[float]):
-        for x, y in zip(x_values, y_values):
-            self.disc_circumference_coord.append(x, y)
-
-    def update_series(self, x_values: Iterable[float], y_values: Iterable[float]):
-        for i, (x, y) in enumerate(zip(x_values, y_values)):
-            self.disc_circumference_coord.replace(i, x, y)
-
-    def sizeHint(self):
-        height = self.size().height()
-        return QSize(height, height)  # force square aspect ratio
-
-    def resizeEvent(self, event):
-        if self.size().width() != self.size().height():
-            self.updateGeometry()  # adjusts geometry based on sizeHint
-        return super().resizeEvent(event)
-
-
-class XYSeriesWidget(QChartView):
-    def __init__(
-        self,
-        x_values: Iterable[float],
-        y_values: Iterable[float],
-        line_color: QColor = BLUE,
-    ):
-        super().__init__()
-
-        self.plot = QChart()
-        self.plot.legend().setVisible(False)
-        self.plot.setBackgroundRoundness(0)
-        self.plot.setMargins(QMargins(0, 0, 0, 0))
 
-        self.time_series = QSplineSeries()
-        self.plot.addSeries(self.time_series)
-        pen = self.time_series.pen()
-        pen.setWidth(4)
-        pen.setColor(line_color)
-        self.time_series.setPen(pen)
-        self._instantiate_series(x_values, y_values)
+def plot_widget(
+    x_values: Iterable[float],
+    y_values: Iterable[float],
+    line_color: QColor = BLUE,
+    opengl: bool = False,
+) -> Union[PlotWidget, "XYSeriesWidget"]:
+    """Return a chart rendered with OpenGL (QtCharts), or a lightweight plot
+    rendered in software."""
+    if opengl:
+        # Only import QtCharts when it's needed, it's slow to import.
+        from openhrv.charts import XYSeriesWidget
 
-        self.x_axis = QValueAxis()
-        self.x_axis.setLabelFormat("%i")
-        self.plot.addAxis(self.x_axis, Qt.AlignBottom)
-        self.time_series.attachAxis(self.x_axis)
+        return XYSeriesWidget(x_values, y_values, line_color)
+    return PlotWidget(x_values, y_values, line_color)
 
-        self.y_axis = QValueAxis()
-        self.y_axis.setLabelFormat("%i")
-        self.plot.addAxis(self.y_axis, Qt.AlignLeft)
-        self.time_series.attachAxis(self.y_axis)
 
-        self.setChart(self.plot)
+def history_menu(durations: list[int], current_duration: int) -> QComboBox:
+    """Menu of history durations (in seconds) with `current_duration` selected,
+    which is added if it isn't among the `durations` (e.g., if it was set from
+    the command line)."""
+    menu = QComboBox()
+    for duration in sorted(set(durations) | {current_duration}):
+        label: str = f"{duration} sec" if duration % 60 else f"{duration // 60} min"
+        menu.addItem(label, duration)
+    menu.setCurrentIndex(menu.findData(current_duration))
 
-    def _instantiate_series(self, x_values: Iterable[float], y_values: Iterable[float]):
-        for x, y in zip(x_values, y_values):
-            self.time_series.append(x, y)
-
-    def update_series(self, x_values: Iterable[float], y_values: Iterable[float]):
-        for i, (x, y) in enumerate(zip(x_values, y_values)):
-            self.time_series.replace(i, x, y)
+    return menu
 
 
 class ViewSignals(QObject):
@@ -151,10 +136,14 @@ class ViewSignals(QObject):
 
     annotation = Signal(tuple)
     start_recording = Signal(str)
+    start_streaming = Signal(str, int)
+    open_database = Signal(str, float)
+    pacer_update = Signal(tuple)
+    idle = Signal(bool)
 
 
 class View(QMainWindow):
-    def __init__(self, model: Model):
+    def __init__(self, model: Model, renderer: str = RENDERER):
         super().__init__()
 
         self.setWindowTitle(f"OpenHRV ({version})")
@@ -163,16 +152,28 @@ class View(QMainWindow):
         self.model = model
         self.model.ibis_buffer_update.connect(self.plot_ibis)
         self.model.hrv_update.connect(self.plot_hrv)
+        self.model.coherence_update.connect(self.plot_coherence)
         self.model.addresses_update.connect(self.list_addresses)
         self.model.pacer_rate_update.connect(self.update_pacer_label)
         self.model.hrv_target_update.connect(self.update_hrv_target)
+        self.model.ibi_history_update.connect(self.update_ibi_history)
+        self.model.hrv_history_update.connect(self.update_hrv_history)
+        self.model.corrections_update.connect(self.show_corrections)
 
         self.signals = ViewSignals()
 
         self.pacer = Pacer()
-        self.pacer_timer = QTimer()
-        self.pacer_timer.setInterval(int(1 / 8 * 1000))  # redraw pacer at 8Hz
-        self.pacer_timer.timeout.connect(self.plot_pacer_disk)
+        # Redraw the pacer on every frame of Qt's animation driver, rather than
+        # at a fixed interval, but only while it's visible (see
+        # self.update_pacer_animation). The animation's value is irrelevant,
+        # the radius is a function of real time.
+        self.pacer_animation = QVariantAnimation(self)
+        self.pacer_animation.setStartValue(0.0)
+        self.pacer_animation.setEndValue(1.0)
+        self.pacer_animation.setDuration(1000)
+        self.pacer_animation.setLoopCount(-1)  # run until stopped
+        self.pacer_animation.valueChanged.connect(lambda _: self.plot_pacer_disk())
+        self.pacer_published: float = 0.0  # time.monotonic()
 
         self.scanner = SensorScanner()
         self.scanner.sensor_update.connect(self.model.update_sensors)
@@ -181,13 +182,48 @@ class View(QMainWindow):
         self.sensor = SensorClient()
         self.sensor.ibi_update.connect(self.model.update_ibis_buffer)
         self.sensor.status_update.connect(self.show_status)
+        self.sensor.sensor_connected.connect(self.model.update_last_sensor)
+        self.sensor.sensor_disconnected.connect(self.model.mark_gap)
+        self.sensor.sensor_connected.connect(
+            lambda _: self.update_sensor_connection(True)
+        )
+        self.sensor.sensor_disconnected.connect(
+            lambda: self.update_sensor_connection(False)
+        )
+
+        self.replay = ReplayClient()
+        self.replay.ibi_update.connect(self.model.update_ibis_buffer)
+        self.replay.gap_update.connect(self.model.mark_gap)
+        self.replay.annotation_update.connect(self.replay_annotation)
+        self.replay.position_update.connect(self.update_replay_position)
+        self.replay.status_update.connect(self.show_status)
+        self.replay.replay_started.connect(self.enable_replay_position)
+        self.replay.replay_finished.connect(self.finish_replay)
+
+        # Idle mode: without a sensor or replay, pause the pacer and the
+        # logger's flush timers after IDLE_TIMEOUT without user interaction
+        # (see self.enter_idle_mode and self.eventFilter).
+        self.sensor_connected: bool = False
+        self.replaying: bool = False
+        self.idle: bool = False
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(IDLE_TIMEOUT)
+        self.idle_timer.timeout.connect(self.enter_idle_mode)
+        self.idle_timer.start()
+        # Chart updates are skipped while the window isn't on screen (see
+        # self.is_rendering), and caught up on once it's exposed again.
+        self.plots_stale: bool = False
 
         self.logger = Logger()
         self.logger.recording_status.connect(self.show_recording_status)
         self.logger.status_update.connect(self.show_status)
         self.logger_thread = QThread()
         self.logger_thread.finished.connect(self.logger.save_recording)
+        self.logger_thread.finished.connect(self.logger.close_database)
         self.signals.start_recording.connect(self.logger.start_recording)
+        self.signals.open_database.connect(self.logger.open_database)
+        self.signals.idle.connect(self.logger.set_idle)
         self.logger.moveToThread(self.logger_thread)
 
         self.model.ibis_buffer_update.connect(self.logger.write_to_file)
@@ -195,43 +231,67 @@ class View(QMainWindow):
         self.model.pacer_rate_update.connect(self.logger.write_to_file)
         self.model.hrv_target_update.connect(self.logger.write_to_file)
         self.model.hrv_update.connect(self.logger.write_to_file)
+        self.model.gap_update.connect(self.logger.write_to_file)
+        self.model.artifact_update.connect(self.logger.write_to_file)
+        self.model.metrics_update.connect(self.logger.write_to_file)
+        self.model.coherence_update.connect(self.logger.write_to_file)
         self.signals.annotation.connect(self.logger.write_to_file)
 
-        self.ibis_widget = XYSeriesWidget(
-            self.model.ibis_seconds, self.model.ibis_buffer
+        self.server: Union[None, StreamServer] = None
+        self.server_thread: Union[None, QThread] = None
+        self.outlet: Union[None, Outlet] = None
+
+        opengl: bool = use_opengl(renderer)
+        self.ibis_widget = plot_widget(
+            self.model.ibis_seconds, self.model.ibis_buffer, opengl=opengl
         )
         self.ibis_widget.x_axis.setTitleText("Seconds")
         # The time series displays only the samples within the last
-        # IBI_HISTORY_DURATION seconds,
+        # self.model.ibi_history_duration seconds,
         # even though there are more samples in self.model.ibis_seconds.
-        self.ibis_widget.x_axis.setRange(-IBI_HISTORY_DURATION, 0.0)
+        self.ibis_widget.x_axis.setRange(-self.model.ibi_history_duration, 0.0)
         self.ibis_widget.x_axis.setTickCount(7)
-        self.ibis_widget.x_axis.setTickInterval(10.0)
         self.ibis_widget.y_axis.setTitleText("Inter-Beat-Interval (msec)")
         self.ibis_widget.y_axis.setRange(MIN_PLOT_IBI, MAX_PLOT_IBI)
 
-        self.hrv_widget = XYSeriesWidget(
-            self.model.hrv_seconds, self.model.hrv_buffer, WHITE
+        self.hrv_widget = plot_widget(
+            self.model.hrv_seconds, self.model.hrv_buffer, WHITE, opengl
         )
         self.hrv_widget.x_axis.setTitleText("Seconds")
         # The time series displays only the samples within the last
-        # HRV_HISTORY_DURATION seconds,
-        # even though there are more samples in self.model.hrv_seconds.
-        self.hrv_widget.x_axis.setRange(-HRV_HISTORY_DURATION, 0)
+        # self.model.hrv_history_duration seconds, at a resolution that matches
+        # the width of the plot (see self.plot_hrv_history).
+        self.hrv_widget.x_axis.setRange(-self.model.hrv_history_duration, 0)
         self.hrv_widget.y_axis.setTitleText("HRV (msec)")
-        self.hrv_widget.y_axis.setRange(0, self.model.hrv_target)
+        self.hrv_widget.y_axis.setRange(
+            0, round(self.model.hrv_target * HRV_PLOT_HEADROOM)
+        )
+        self.hrv_widget.set_target(self.model.hrv_target)
         colorgrad = QLinearGradient(0, 0, 0, 1)  # horizontal gradient
         colorgrad.setCoordinateMode(QGradient.ObjectMode)
+        target: float = 1 - 1 / HRV_PLOT_HEADROOM  # position of the target line
         colorgrad.setColorAt(0, GREEN)
-        colorgrad.setColorAt(0.6, YELLOW)
+        colorgrad.setColorAt(target, GREEN)
+        colorgrad.setColorAt(target + 0.6 * (1 - target), YELLOW)
         colorgrad.setColorAt(1, RED)
         brush = QBrush(colorgrad)
-        self.hrv_widget.plot.setPlotAreaBackgroundBrush(brush)
-        self.hrv_widget.plot.setPlotAreaBackgroundVisible(True)
+        self.hrv_widget.set_background(brush)
 
-        self.pacer_widget = PacerWidget(*self.pacer.update(self.model.breathing_rate))
+        self.coherence_widget = plot_widget(
+            self.model.coherence_seconds, self.model.coherence_buffer, GREEN, opengl
+        )
+        self.coherence_widget.x_axis.setTitleText("Seconds")
+        self.coherence_widget.x_axis.setRange(-COHERENCE_HISTORY_DURATION, 0)
+        self.coherence_widget.y_axis.setTitleText("Coherence (%)")
+        self.coherence_widget.y_axis.setRange(0, 100)
+        self.coherence_widget.setVisible(False)
+
+        self.pacer_widget = PacerWidget()
+        self.pacer_widget.update_radius(
+            self.pacer.update_radius(self.model.breathing_rate)
+        )
 
-        self.pacer_label = QLabel()
+        self.pacer_label = QLabel(f"Rate: {self.model.breathing_rate}")
         self.pacer_rate = QSlider(Qt.Horizontal)
         self.pacer_rate.setTickPosition(QSlider.TicksBelow)
         self.pacer_rate.setTracking(False)
@@ -240,7 +300,7 @@ class View(QMainWindow):
             breathing_rate_to_tick(MAX_BREATHING_RATE),
         )
         self.pacer_rate.valueChanged.connect(self.model.update_breathing_rate)
-        self.pacer_rate.setValue(breathing_rate_to_tick(MAX_BREATHING_RATE))
+        self.pacer_rate.setValue(breathing_rate_to_tick(self.model.breathing_rate))
 
         self.pacer_toggle = QCheckBox("Show pacer", self)
         self.pacer_toggle.setChecked(True)
@@ -254,10 +314,33 @@ class View(QMainWindow):
         self.hrv_target.valueChanged.connect(self.model.update_hrv_target)
         self.hrv_target.setSliderPosition(self.model.hrv_target)
 
+        self.ibi_history_label = QLabel("IBI window")
+        self.ibi_history = history_menu(
+            IBI_HISTORY_DURATIONS, self.model.ibi_history_duration
+        )
+        self.ibi_history.currentIndexChanged.connect(self.select_ibi_history)
+
+        self.hrv_history_label = QLabel("HRV window")
+        self.hrv_history = history_menu(
+            HRV_HISTORY_DURATIONS, self.model.hrv_history_duration
+        )
+        self.hrv_history.currentIndexChanged.connect(self.select_hrv_history)
+
+        self.coherence_toggle = QCheckBox("Show coherence", self)
+        self.coherence_toggle.setChecked(False)
+        self.coherence_toggle.stateChanged.connect(self.toggle_coherence)
+
         self.scan_button = QPushButton("Scan")
         self.scan_button.clicked.connect(self.scanner.scan)
 
         self.address_menu = QComboBox()
+        # Offer the sensor that was connected last time, so that it can be
+        # connected right away without scanning.
+        last_sensor_name, last_sensor_address = self.model.last_sensor
+        if valid_address(last_sensor_address):
+            self.model.update_sensors(
+                [sensor_from_address(last_sensor_address, last_sensor_name)]
+            )
 
         self.connect_button = QPushButton("Connect")
         self.connect_button.clicked.connect(self.connect_sensor)
@@ -277,6 +360,29 @@ class View(QMainWindow):
         self.annotation_button = QPushButton("Annotate")
         self.annotation_button.clicked.connect(self.emit_annotation)
 
+        self.replay_button = QPushButton("Replay")
+        self.replay_button.clicked.connect(self.get_replay_filepath)
+        self.stop_replay_button = QPushButton("Stop replay")
+        self.stop_replay_button.setEnabled(False)
+        self.stop_replay_button.clicked.connect(self.stop_replay)
+        self.replay_speed = QComboBox()
+        for speed in REPLAY_SPEEDS:
+            self.replay_speed.addItem(
+                "max" if math.isinf(speed) else f"{speed:g}x", speed
+            )
+        self.replay_speed.currentIndexChanged.connect(
+            lambda index: self.replay.set_speed(self.replay_speed.itemData(index))
+        )
+        self.replay_position = QSlider(Qt.Horizontal)
+        self.replay_position.setEnabled(False)
+        self.replay_position.sliderReleased.connect(
+            lambda: self.replay.seek(self.replay_position.value())
+        )
+        self.replay.pacer_rate_update.connect(
+            lambda rate: self.pacer_rate.setValue(breathing_rate_to_tick(rate))
+        )
+        self.replay.hrv_target_update.connect(self.hrv_target.setValue)
+
         self.clear_button = QPushButton("Clear plots")
         self.clear_button.clicked.connect(self.clear_plots)
 
@@ -288,6 +394,22 @@ class View(QMainWindow):
         self.recording_statusbar.setRange(0, 1)
 
         self.statusbar = self.statusBar()
+        self.corrections_label = QLabel()
+        self.corrections_label.setToolTip(
+            "IBIs (outliers, ectopic and missed beats) and HRVs (outliers)"
+            " that were corrected since the session started"
+        )
+        self.statusbar.addPermanentWidget(self.corrections_label)
+        self.show_corrections(
+            NamedSignal(
+                "Corrections", (self.model.corrected_ibis, self.model.corrected_hrvs)
+            )
+        )
+
+        # Profile real sessions without restarting (see profiling.py).
+        self.profile_path: Union[None, str] = None
+        self.profile_shortcut = QShortcut(QKeySequence(PROFILE_SHORTCUT), self)
+        self.profile_shortcut.activated.connect(self.toggle_profiling)
 
         self.vlayout0 = QVBoxLayout(self.central_widget)
 
@@ -296,7 +418,10 @@ class View(QMainWindow):
         self.hlayout0.addWidget(self.pacer_widget)
         self.vlayout0.addLayout(self.hlayout0, stretch=50)
 
-        self.vlayout0.addWidget(self.hrv_widget, stretch=50)
+        self.hlayout2 = QHBoxLayout()
+        self.hlayout2.addWidget(self.hrv_widget, stretch=2)
+        self.hlayout2.addWidget(self.coherence_widget, stretch=1)
+        self.vlayout0.addLayout(self.hlayout2, stretch=50)
 
         self.hlayout1 = QHBoxLayout()
 
@@ -311,6 +436,9 @@ class View(QMainWindow):
 
         self.hrv_config = QFormLayout()
         self.hrv_config.addRow(self.hrv_target_label, self.hrv_target)
+        self.hrv_config.addRow(self.ibi_history_label, self.ibi_history)
+        self.hrv_config.addRow(self.hrv_history_label, self.hrv_history)
+        self.hrv_config.addRow(self.coherence_toggle)
         self.hrv_panel = QGroupBox("HRV Settings")
         self.hrv_panel.setLayout(self.hrv_config)
         self.hlayout1.addWidget(self.hrv_panel, stretch=25)
@@ -330,6 +458,10 @@ class View(QMainWindow):
         self.recording_config.addWidget(self.annotation, 1, 0, 1, 2)
         self.recording_config.addWidget(self.annotation_button, 1, 2)
         self.recording_config.addWidget(self.clear_button, 2, 0, 1, 3)
+        self.recording_config.addWidget(self.replay_button, 3, 0)
+        self.recording_config.addWidget(self.stop_replay_button, 3, 1)
+        self.recording_config.addWidget(self.replay_speed, 3, 2)
+        self.recording_config.addWidget(self.replay_position, 4, 0, 1, 3)
         self.recording_panel = QGroupBox("Recording")
         self.recording_panel.setLayout(self.recording_config)
         self.hlayout1.addWidget(self.recording_panel, stretch=25)
@@ -337,17 +469,194 @@ class View(QMainWindow):
         self.vlayout0.addLayout(self.hlayout1)
 
         self.logger_thread.start()
-        self.pacer_timer.start()
+
+    def showEvent(self, event):
+        # Input and expose events reach the window before its widgets.
+        self.windowHandle().installEventFilter(self)
+        self.update_pacer_animation()
+        return super().showEvent(event)
+
+    def eventFilter(self, watched, event):
+        event_type = event.type()
+        if event_type in (QEvent.MouseButtonPress, QEvent.KeyPress, QEvent.Wheel):
+            if not (self.sensor_connected or self.replaying):
+                self.exit_idle_mode()
+        elif event_type == QEvent.Expose and self.plots_stale and self.is_rendering():
+            self.refresh_plots()
+        return super().eventFilter(watched, event)
+
+    def hideEvent(self, event):
+        self.update_pacer_animation()
+        return super().hideEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:  # (un-)minimized
+            self.update_pacer_animation()
+            if self.plots_stale and self.is_rendering():
+                self.refresh_plots()
+        return super().changeEvent(event)
 
     def closeEvent(self, _):
         """Shut down all threads."""
-        print("Closing threads...")
+        log.info("Closing threads...")
+
+        if profiler.enabled:
+            self.stop_profiling()
+        self.pacer_animation.stop()
+        self.idle_timer.stop()
+        self.replay.stop()
 
         self.sensor.disconnect_client()
 
         self.logger_thread.quit()
         self.logger_thread.wait()
 
+        if self.server_thread is not None:
+            self.server_thread.quit()
+            self.server_thread.wait()
+
+        self.stop_outlet()
+
+    def start_streaming(self, host: str, port: int):
+        """Publish IBIs, HRV, the pacer, and annotations to subscribers on the
+        local network (see server.py)."""
+        if self.server is not None:
+            return
+        self.server = StreamServer()
+        self.server.status_update.connect(self.show_status)
+        self.server_thread = QThread()
+        self.server_thread.finished.connect(self.server.close)
+        self.signals.start_streaming.connect(self.server.listen)
+        self.server.moveToThread(self.server_thread)
+
+        self.model.ibis_buffer_update.connect(self.server.publish)
+        self.model.hrv_update.connect(self.server.publish)
+        self.model.pacer_rate_update.connect(self.server.publish)
+        self.model.hrv_target_update.connect(self.server.publish)
+        self.model.gap_update.connect(self.server.publish)
+        self.model.artifact_update.connect(self.server.publish)
+        self.model.metrics_update.connect(self.server.publish)
+        self.model.coherence_update.connect(self.server.publish)
+        self.signals.annotation.connect(self.server.publish)
+        self.signals.pacer_update.connect(self.server.publish)
+
+        self.server_thread.start()
+        self.signals.start_streaming.emit(host, port)
+        self.update_pacer_animation()
+
+    def open_database(self, database_path: str):
+        """Store the session in an SQLite database (see database.py)."""
+        self.signals.open_database.emit(database_path, self.model.breathing_rate)
+
+    def start_outlet(self, port: int):
+        """Publish IBIs, HRV, and the pacer with timestamps for synchronization
+        with other recordings (see outlet.py)."""
+        if self.outlet is not None:
+            return
+        try:
+            self.outlet = Outlet(port)
+        except OSError as e:
+            self.show_status(f"Couldn't open outlet on port {port}: {e}")
+            return
+        # Direct connections, such that samples are timestamped right away.
+        self.model.ibis_buffer_update.connect(self.outlet.push, Qt.DirectConnection)
+        self.model.hrv_update.connect(self.outlet.push, Qt.DirectConnection)
+        self.model.pacer_rate_update.connect(self.outlet.push, Qt.DirectConnection)
+        self.signals.pacer_update.connect(self.outlet.push, Qt.DirectConnection)
+        self.outlet.start()
+        self.update_pacer_animation()
+        self.show_status(f"Publishing samples on port {self.outlet.address()[1]}.")
+
+    def stop_outlet(self):
+        if self.outlet is None:
+            return
+        # Disconnect first, such that nothing is pushed to the closed outlet.
+        self.model.ibis_buffer_update.disconnect(self.outlet.push)
+        self.model.hrv_update.disconnect(self.outlet.push)
+        self.model.pacer_rate_update.disconnect(self.outlet.push)
+        self.signals.pacer_update.disconnect(self.outlet.push)
+        self.outlet.close()
+        self.outlet = None
+        self.update_pacer_animation()
+
+    def toggle_profiling(self):
+        if profiler.enabled:
+            self.stop_profiling()
+        else:
+            self.start_profiling()
+
+    def start_profiling(self, file_path: Union[None, str] = None):
+        """Time the model's, view's, and logger's slots until profiling is
+        stopped, at which point the timings are written to `file_path`
+        (default: a file named after the current time)."""
+        if file_path is None:
+            current_time: str = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+            file_path = f"OpenHRV_profile_{current_time}.csv"
+        self.profile_path = file_path
+        profiler.start()
+        self.show_status(
+            f"Profiling. Press {PROFILE_SHORTCUT} to stop and save to {file_path}."
+        )
+
+    def stop_profiling(self):
+        if self.profile_path is None:  # not profiling
+            return
+        try:
+            profiler.stop(self.profile_path)
+        except OSError as e:
+            self.show_status(f"Couldn't save profile to {self.profile_path}: {e}")
+            return
+        self.show_status(f"Saved profile to {self.profile_path}.")
+
+    def get_replay_filepath(self):
+        # native file dialog not reliable on Windows (most likely COM issues)
+        file_path: str = QFileDialog.getOpenFileName(
+            None,
+            "Replay recording",
+            filter="Recordings (*.csv *.csv.gz *.csv.xz *.json)",
+            options=QFileDialog.DontUseNativeDialog,
+        )[0]
+        if not file_path:  # user cancelled or closed file dialog
+            return
+        self.start_replay(file_path, self.replay_speed.currentData())
+
+    def start_replay(self, file_path: str, speed: float):
+        """Replay a recording instead of the sensor's data (see replay.py)."""
+        self.sensor.disconnect_client()
+        self.clear_plots()
+        if self.replay_speed.findData(speed) >= 0:
+            self.replay_speed.setCurrentIndex(self.replay_speed.findData(speed))
+        self.replay.start(file_path, speed)
+        self.replaying = True
+        self.stop_replay_button.setEnabled(True)
+        self.exit_idle_mode()
+
+    def enable_replay_position(self, duration: float):
+        self.replay_position.setRange(0, math.ceil(duration))
+        self.replay_position.setValue(0)
+        self.replay_position.setEnabled(True)
+
+    def stop_replay(self):
+        if not self.replay.is_replaying():
+            return
+        self.replay.stop()
+        self.show_status("Stopped replay.")
+        self.finish_replay()
+
+    def finish_replay(self):
+        self.replaying = False
+        self.stop_replay_button.setEnabled(False)
+        self.replay_position.setEnabled(False)
+        self.exit_idle_mode()
+
+    def update_replay_position(self, seconds: float):
+        if not self.replay_position.isSliderDown():
+            self.replay_position.setValue(round(seconds))
+
+    def replay_annotation(self, annotation: str):
+        self.show_status(f"Annotation: {annotation}")
+        self.signals.annotation.emit(NamedSignal("Annotation", annotation))
+
     def get_filepath(self):
         current_time: str = datetime.now().strftime("%Y-%m-%d-%H-%M")
         default_file_name: str = f"OpenHRV_{current_time}.csv"
@@ -371,21 +680,124 @@ class View(QMainWindow):
         # discard device name
         address: str = self.address_menu.currentText().split(",")[1].strip()
         if not valid_address(address):
-            print(f"Invalid sensor address: {address}.")
+            log.warning("Invalid sensor address: %s.", address)
             return
         sensor: list[QBluetoothDeviceInfo] = [
             s for s in self.model.sensors if get_sensor_address(s) == address
         ]
+        self.stop_replay()  # the sensor's IBIs replace the recorded ones
         self.sensor.connect_client(*sensor)
 
     def disconnect_sensor(self):
         self.sensor.disconnect_client()
 
+    def update_sensor_connection(self, connected: bool):
+        self.sensor_connected = connected
+        self.exit_idle_mode()
+
+    def enter_idle_mode(self):
+        """Without data, there's nothing to plot, compute (the model only
+        computes on beats), or flush. Hence, stop the pacer animation (unless
+        the pacer is published) and the logger's flush timers, such that the
+        app doesn't wake up until there's input or data. Plots aren't redrawn
+        while the window isn't on screen anyway (see self.is_rendering)."""
+        if self.sensor_connected or self.replaying:
+            return
+        self.idle = True
+        self.update_pacer_animation()
+        self.signals.idle.emit(True)
+        self.show_status(
+            "No sensor connected. Paused the pacer until you interact with OpenHRV."
+        )
+
+    def exit_idle_mode(self):
+        """Leave idle mode (if idle) and restart the idle countdown, unless
+        a sensor is connected or a recording is replaying."""
+        if self.sensor_connected or self.replaying:
+            self.idle_timer.stop()
+        else:
+            self.idle_timer.start()
+        if self.idle:
+            self.idle = False
+            self.update_pacer_animation()
+            self.signals.idle.emit(False)
+
+    def is_rendering(self) -> bool:
+        """Whether the window is on screen, i.e., neither minimized nor (on
+        platforms that report it) covered by other windows."""
+        window = self.windowHandle()
+        return window is not None and window.isExposed() and not self.isMinimized()
+
+    def refresh_plots(self):
+        """Catch up on the updates that were skipped while the window wasn't
+        on screen."""
+        self.plots_stale = False
+        self.plot_ibis_buffer()
+        self.plot_hrv_history()
+        if self.coherence_widget.isVisible():
+            self.plot_coherence_buffer()
+
+    def plot_ibis_buffer(self):
+        # Samples are timed since the start of the session, plot them relative
+        # to the most recent one.
+        self.ibis_widget.update_series(
+            self.model.ibis_seconds, self.model.ibis_buffer, -self.model.ibi_time
+        )
+
+    def plot_coherence_buffer(self):
+        self.coherence_widget.update_series(
+            self.model.coherence_seconds,
+            self.model.coherence_buffer,
+            -self.model.ibi_time,
+        )
+
+    @profiled("View.plot_ibis")
     def plot_ibis(self, ibis: NamedSignal):
-        self.ibis_widget.update_series(*ibis.value)
+        if not self.is_rendering():
+            self.plots_stale = True
+            return
+        self.plot_ibis_buffer()
 
+    @profiled("View.plot_hrv")
     def plot_hrv(self, hrv: NamedSignal):
-        self.hrv_widget.update_series(*hrv.value)
+        if not self.is_rendering():
+            self.plots_stale = True
+            return
+        self.plot_hrv_history()
+
+    @profiled("View.plot_coherence")
+    def plot_coherence(self, coherence: NamedSignal):
+        if not self.coherence_widget.isVisible():
+            return
+        if not self.is_rendering():
+            self.plots_stale = True
+            return
+        self.plot_coherence_buffer()
+
+    def plot_hrv_history(self):
+        """Plot the HRV history at a resolution that never draws more points
+        than the plot is wide, regardless of the duration of the session."""
+        hrv_time: float = self.model.hrv_time
+        seconds, values = self.model.hrv_history.select(
+            hrv_time - self.model.hrv_history_duration, self.hrv_widget.plot_width()
+        )
+        self.hrv_widget.replace_series(seconds, values, -hrv_time)
+
+    def select_ibi_history(self, index: int):
+        self.model.update_ibi_history_duration(self.ibi_history.itemData(index))
+
+    def select_hrv_history(self, index: int):
+        self.model.update_hrv_history_duration(self.hrv_history.itemData(index))
+
+    def update_ibi_history(self, duration: NamedSignal):
+        self.ibis_widget.x_axis.setRange(-duration.value, 0.0)
+        self.ibis_widget.replace_series(
+            self.model.ibis_seconds, self.model.ibis_buffer, -self.model.ibi_time
+        )
+
+    def update_hrv_history(self, duration: NamedSignal):
+        self.hrv_widget.x_axis.setRange(-duration.value, 0)
+        self.plot_hrv_history()
 
     def clear_plots(self):
         """Reset the IBI and HRV plots for a new session (issue #11).
@@ -395,36 +807,73 @@ class View(QMainWindow):
         to an ongoing recording.
         """
         self.model.reset_buffers()
-        self.ibis_widget.update_series(self.model.ibis_seconds, self.model.ibis_buffer)
-        self.hrv_widget.update_series(self.model.hrv_seconds, self.model.hrv_buffer)
+        self.plot_ibis_buffer()
+        self.plot_hrv_history()
+        self.plot_coherence_buffer()
+        self.model.emit_corrections()
 
     def list_addresses(self, addresses: NamedSignal):
+        # Sensors are listed as they're discovered, keep the current selection.
+        selected_address: str = self.address_menu.currentText()
         self.address_menu.clear()
         self.address_menu.addItems(addresses.value)
+        if selected_address in addresses.value:
+            self.address_menu.setCurrentText(selected_address)
+
+    def update_pacer_animation(self):
+        """Animate the pacer only while it's visible, or while it's published
+        to subscribers."""
+        visible: bool = (
+            self.pacer_widget.isVisible() and not self.isMinimized() and not self.idle
+        )
+        publishing: bool = self.server is not None or self.outlet is not None
+        if not (visible or publishing):
+            self.pacer_animation.stop()
+        elif self.pacer_animation.state() != QAbstractAnimation.Running:
+            self.pacer_animation.start()
 
+    @profiled("View.plot_pacer_disk")
     def plot_pacer_disk(self):
-        coordinates = self.pacer.update(self.model.breathing_rate)
-        self.pacer_widget.update_series(*coordinates)
+        radius: float = self.pacer.update_radius(self.model.breathing_rate)
+        self.pacer_widget.update_radius(radius)
+        if self.server is None and self.outlet is None:
+            return
+        now: float = time.monotonic()
+        if now - self.pacer_published >= PACER_PUBLISH_INTERVAL:
+            self.pacer_published = now
+            self.signals.pacer_update.emit(NamedSignal("PacerRadius", round(radius, 3)))
 
     def update_pacer_label(self, rate: NamedSignal):
         self.pacer_label.setText(f"Rate: {rate.value}")
 
     def update_hrv_target(self, target: NamedSignal):
-        self.hrv_widget.y_axis.setRange(0, target.value)
+        self.hrv_widget.y_axis.setRange(0, round(target.value * HRV_PLOT_HEADROOM))
+        self.hrv_widget.set_target(target.value)
         self.hrv_target_label.setText(f"Target: {target.value}")
 
+    def toggle_coherence(self):
+        visible: bool = self.coherence_toggle.isChecked()
+        self.coherence_widget.setVisible(visible)
+        if visible:  # catch up on what happened while the chart was hidden
+            self.plot_coherence_buffer()
+
     def toggle_pacer(self):
         visible = self.pacer_widget.isVisible()
         self.pacer_widget.setVisible(not visible)
+        self.update_pacer_animation()
 
     def show_recording_status(self, status: int):
         """Indicate busy state if `status` is 0."""
         self.recording_statusbar.setRange(0, status)
 
-    def show_status(self, status: str, print_to_terminal=True):
+    def show_status(self, status: str, log_status=True):
         self.statusbar.showMessage(status, 0)
-        if print_to_terminal:
-            print(status)
+        if log_status:
+            log.info(status, extra={"rate_limit": False})  # see RateLimiter
+
+    def show_corrections(self, corrections: NamedSignal):
+        ibis, hrvs = corrections.value
+        self.corrections_label.setText(f"Corrected: {ibis} IBIs, {hrvs} HRVs")
 
     def emit_annotation(self):
         self.signals.annotation.emit(
@@ -1,9 +1,9 @@
-import math
-import time
 import uuid
 from random import randint
 from PySide6.QtCore import QObject, Signal, QTimer
 from openhrv.utils import get_sensor_address
+from openhrv.sensor import decode_ibis
+from openhrv.simulator import SignalSimulator
 
 
 class MockBluetoothMac:
@@ -44,6 +44,9 @@ class MockSensorScanner(QObject):
     sensor_update = Signal(object)
     status_update = Signal(str)
 
+    def set_timeout(self, timeout):
+        pass
+
     def scan(self):
         polar_sensors = [MockSensor() for _ in range(3)]
         self.sensor_update.emit(polar_sensors)
@@ -53,42 +56,51 @@ class MockSensorScanner(QObject):
 class MockSensorClient(QObject):
     ibi_update = Signal(object)
     status_update = Signal(str)
+    sensor_connected = Signal(object)
+    sensor_disconnected = Signal()
 
     def __init__(self):
         super().__init__()
-        # Polar sensor emits a (package of) IBI(s) about every second.
-        # Here we "emit" / simulate IBI(s) in quicker succession in order to push the rendering.
-        self.mean_ibi = 900
+        # Like a Polar sensor, emit a packet of IBI(s) about every second.
+        # IBIs fluctuate at a breathing rate of 6 breaths per minute around a
+        # mean IBI of 900 msec. Occasional ectopic beats and dropouts push
+        # artifact correction.
+        self.simulator = SignalSimulator(
+            mean_ibi=900,
+            breathing_rate=6,
+            rsa_range=100,  # without noise and artifacts, HRV settles at this value
+            lf_range=40,
+            noise=5,
+            ectopic_probability=1 / 30,
+            dropout_probability=1 / 120,
+        )
+        self.packets = self.simulator.packets()
+        self.packet_time = 0.0
         self.timer = QTimer()
-        self.timer.setInterval(self.mean_ibi)
-        self.timer.timeout.connect(self.simulate_ibi)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.simulate_packet)
 
     def connect_client(self, sensor):
         self.status_update.emit(
             f"Connecting to sensor at {get_sensor_address(sensor)}."
         )
-        self.timer.start()
+        self.sensor_connected.emit(sensor)
+        self._schedule_packet()
 
     def disconnect_client(self):
         self.status_update.emit("Disconnecting from sensor.")
         self.timer.stop()
+        self.sensor_disconnected.emit()
 
-    def simulate_ibi(self):
-        # IBIs fluctuate at a rate of `breathing_rate`
-        # in a sinusoidal pattern around `mean_ibi`,
-        # in a range of `range_ibi`.
-        breathing_rate = 6
-        range_ibi = 100  # without noise, HRV settles at this value
-        ibi = self.mean_ibi + (range_ibi / 2) * math.sin(
-            2 * math.pi * breathing_rate / 60 * time.time()
-        )
-        # add noise spikes
-        if randint(1, 30) == 1:
-            if randint(1, 2) == 1:
-                ibi += 500
-            else:
-                ibi -= 500
-        self.ibi_update.emit(ibi)
+    def _schedule_packet(self):
+        packet_time, self.packet = next(self.packets)
+        self.timer.start(round((packet_time - self.packet_time) * 1000))
+        self.packet_time = packet_time
+
+    def simulate_packet(self):
+        for ibi in decode_ibis(self.packet):
+            self.ibi_update.emit(ibi)
+        self._schedule_packet()
 
 
 def main():
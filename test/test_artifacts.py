@@ -0,0 +1,56 @@
+"""Tests for detecting and correcting artifacts in IBIs."""
+
+from statistics import mean
+
+from openhrv.artifacts import ArtifactDetector
+from openhrv.model import Model
+from openhrv.simulator import SignalSimulator
+
+
+def correct_all(detector, ibis):
+    corrected, artifacts = [], []
+    for ibi in ibis:
+        artifact = detector.correct(ibi)
+        corrected.extend(detector.corrected)
+        artifacts.append(artifact)
+    return corrected, artifacts
+
+
+def test_ectopic_and_missed_beats_are_corrected():
+    detector = ArtifactDetector()
+    regular = [900, 910, 920, 910, 900]
+    ibis = regular + [630, 1170] + regular + [1810] + regular
+    corrected, artifacts = correct_all(detector, ibis)
+    assert artifacts[5:7] == [ArtifactDetector.ECTOPIC_BEAT] * 2
+    assert artifacts[12] == ArtifactDetector.MISSED_BEAT
+    assert artifacts.count(None) == len(artifacts) - 3
+    assert corrected[5:7] == [900, 900]  # replaced by the previous valid IBI
+    assert corrected[12:14] == [905, 905]  # split in two
+    assert sum(corrected[12:14]) == 1810
+
+
+def test_sustained_change_in_rhythm_is_accepted():
+    detector = ArtifactDetector()
+    corrected, artifacts = correct_all(detector, [900] * 10 + [600] * 10)
+    assert artifacts.count(ArtifactDetector.ECTOPIC_BEAT) == 3
+    assert corrected[-6:] == [600] * 6
+
+
+def test_artifacts_dont_inflate_hrv(qapp):
+    """Without noise and artifacts, HRV settles at `rsa_range`."""
+    model = Model()
+    artifacts = []
+    model.artifact_update.connect(artifacts.append)
+    simulator = SignalSimulator(
+        rsa_range=100,
+        noise=5,
+        ectopic_probability=1 / 30,
+        missed_probability=1 / 60,
+        seed=0,
+    )
+    hrvs = []
+    for ibi in simulator.ibis(2000):
+        model.update_ibis_buffer(ibi)
+        hrvs.append(model.ewma_hrv)
+    assert artifacts
+    assert 80 < mean(hrvs[1000:]) < 130
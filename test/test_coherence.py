@@ -0,0 +1,57 @@
+"""Tests for estimating coherence from the spectrum of IBIs."""
+
+import cmath
+import math
+import random
+
+import pytest
+
+from openhrv.coherence import CoherenceEstimator, RealFFT
+from openhrv.config import METRICS_INTERVAL
+from openhrv.model import Model
+from openhrv.simulator import SignalSimulator
+
+
+def test_real_fft_matches_dft():
+    n_samples = 64
+    samples = [random.Random(0).uniform(-1, 1) for _ in range(n_samples)]
+    expected = [
+        abs(
+            sum(
+                x * cmath.exp(-2j * math.pi * k * i / n_samples)
+                for i, x in enumerate(samples)
+            )
+        )
+        ** 2
+        for k in range(n_samples // 2 + 1)
+    ]
+    assert RealFFT(n_samples).power_spectrum(samples) == pytest.approx(expected)
+
+
+def coherence(breathing_rate, noise, pacer_rate):
+    estimator = CoherenceEstimator()
+    simulator = SignalSimulator(
+        breathing_rate=breathing_rate, lf_range=40, noise=noise, seed=0
+    )
+    for ibi in simulator.ibis(100):
+        estimator.update(ibi)
+    assert estimator.is_ready()
+    return estimator.coherence(pacer_rate)
+
+
+def test_coherence_peaks_at_breathing_rate():
+    assert coherence(6, 5, 6) > 0.9
+    assert coherence(6, 5, 4) < 0.1
+    assert coherence(6, 60, 6) < coherence(6, 5, 6)  # noise isn't coherent
+
+
+def test_model_emits_coherence_once_window_is_filled(qapp):
+    model = Model()
+    values = []
+    model.coherence_update.connect(lambda c: values.append(c.value[1][-1]))
+    for ibi in SignalSimulator(breathing_rate=7, seed=0).ibis(100):
+        model.update_ibis_buffer(ibi)
+    # The window spans 64 seconds, after which coherence is estimated every
+    # METRICS_INTERVAL seconds.
+    assert 0 < len(values) <= 100 // METRICS_INTERVAL
+    assert values[-1] > 90  # percent
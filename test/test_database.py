@@ -0,0 +1,77 @@
+"""Tests for storing sessions in an SQLite database."""
+
+import sqlite3
+import time
+
+from openhrv.config import DATABASE_BATCH_SIZE
+from openhrv.database import SessionStore, mean_hrv
+from openhrv.logger import Logger
+from openhrv.utils import NamedSignal
+
+
+def test_logger_inserts_events_in_batches(qapp, tmp_path):
+    path = str(tmp_path / "sessions.db")
+    logger = Logger()
+    logger.open_database(path, 6.0)
+    reader = sqlite3.connect(path)
+    try:
+        for i in range(DATABASE_BATCH_SIZE - 1):
+            logger.write_to_file(NamedSignal("InterBeatInterval", ([0.0], [900])))
+        assert reader.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 0
+        logger.write_to_file(NamedSignal("Annotation", "eyes closed"))
+        assert (
+            reader.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            == DATABASE_BATCH_SIZE
+        )
+        logger.write_to_file(NamedSignal("HeartRateVariability", ([0.0], [80.0])))
+        logger.close_database()
+        assert reader.execute("SELECT ended FROM sessions").fetchone()[0] is not None
+        assert reader.execute(
+            "SELECT value FROM events WHERE event = 'Annotation'"
+        ).fetchone() == ("eyes closed",)
+    finally:
+        reader.close()
+
+
+def test_idle_logger_flushes_and_stops_its_timer(qapp, tmp_path):
+    path = str(tmp_path / "sessions.db")
+    logger = Logger()
+    logger.open_database(path, 6.0)
+    reader = sqlite3.connect(path)
+    try:
+        assert logger.database_timer.isActive()
+        logger.write_to_file(NamedSignal("Annotation", "eyes closed"))
+        logger.set_idle(True)
+        assert not logger.database_timer.isActive()
+        assert reader.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+        logger.set_idle(False)
+        assert logger.database_timer.isActive()
+        logger.close_database()
+        logger.set_idle(True)  # nothing to flush once the database is closed
+        logger.set_idle(False)
+        assert not logger.database_timer.isActive()
+    finally:
+        reader.close()
+
+
+def test_minute_summary_by_breathing_rate(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    now = time.time()
+    month = 30 * 24 * 60 * 60
+    for started, hrvs in [(now - 2 * month, [500.0]), (now, [60.0, 80.0])]:
+        store = SessionStore(path, 6.0, started)
+        store.add_event("PacerRate", 5.5, started)
+        for i, hrv in enumerate(hrvs):
+            store.add_event("HeartRateVariability", hrv, started + 60 * i)
+        store.add_event("PacerRate", 6.5, started + 120)
+        store.add_event("HeartRateVariability", 200.0, started + 130)
+        store.close(started + 180)
+
+    connection = sqlite3.connect(path)
+    try:
+        assert mean_hrv(connection, 5.5, now - month) == 70.0
+        assert mean_hrv(connection, 5.5, now - 3 * month) == 640.0 / 3
+        assert mean_hrv(connection, 6.5, now - month) == 200.0
+        assert mean_hrv(connection, 4.0, now - month) is None
+    finally:
+        connection.close()
@@ -0,0 +1,73 @@
+"""Tests for logging diagnostics without blocking the GUI thread."""
+
+import io
+import logging
+import logging.handlers
+
+from openhrv.diagnostics import RateLimiter, start_logging, stop_logging
+from openhrv.model import Model
+from openhrv.view import View
+
+
+def test_repeated_messages_are_rate_limited(qapp):
+    stream = io.StringIO()
+    listener = start_logging(stream=stream)
+    try:
+        log = logging.getLogger("openhrv.model")
+        for ibi in range(5000, 5010):
+            log.info("Correcting outlier IBI %d to %d", ibi, 1000)
+        log.warning("Couldn't find HR service on %s.", "00:00:00:00:00:00")
+    finally:
+        stop_logging(listener)  # writes the queued records
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    assert "Correcting outlier IBI 5000 to 1000" in lines[0]
+    assert "WARNING openhrv.model: Couldn't find HR service" in lines[1]
+    assert not any(
+        isinstance(handler, logging.handlers.QueueHandler)
+        for handler in logging.getLogger().handlers
+    )
+
+
+def test_rate_limiter_reports_dropped_messages():
+    limiter = RateLimiter(interval=0.0)
+    record = logging.makeLogRecord({"name": "openhrv", "msg": "Outlier %d"})
+    assert limiter.filter(record)
+    limiter.interval = 60.0
+    assert not limiter.filter(record)
+    assert not limiter.filter(record)
+    limiter.interval = 0.0
+    assert limiter.filter(record)
+    assert record.msg == "Outlier %d (2 similar messages dropped)"
+
+
+def test_status_messages_are_not_rate_limited_and_sites_are_bounded():
+    limiter = RateLimiter(interval=60.0, max_sites=2)
+    status = logging.makeLogRecord(
+        {"name": "openhrv.view", "msg": "Finished replay.", "rate_limit": False}
+    )
+    assert all(limiter.filter(status) for _ in range(3))
+    assert not limiter.sites
+    for i in range(5):
+        record = logging.makeLogRecord({"name": "openhrv", "msg": f"Message {i}"})
+        assert limiter.filter(record)
+    assert list(limiter.sites) == [("openhrv", "Message 3"), ("openhrv", "Message 4")]
+
+
+def test_corrections_are_counted_and_shown(qapp):
+    model = Model()
+    view = View(model)
+    try:
+        for ibi in [1000, 1010, 5000, 990, 1000]:  # outlier
+            model.update_ibis_buffer(ibi)
+        assert model.corrected_ibis == 1
+        corrected_hrvs = model.corrected_hrvs
+        model.validate_hrv(10_000)  # outlier
+        assert model.corrected_hrvs == corrected_hrvs + 1
+        assert view.corrections_label.text() == (
+            f"Corrected: 1 IBIs, {corrected_hrvs + 1} HRVs"
+        )
+        view.clear_plots()
+        assert view.corrections_label.text() == "Corrected: 0 IBIs, 0 HRVs"
+    finally:
+        view.close()
@@ -0,0 +1,46 @@
+"""Tests for exporting recordings to Parquet."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from openhrv.export import export_parquet
+from openhrv.recording import SegmentedRecording, manifest_path
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_export_splits_events_into_typed_tables(tmp_path):
+    path = str(tmp_path / "session.csv.gz")
+    recording = SegmentedRecording(path, max_bytes=1024)
+    start = datetime(2025, 12, 19, 14, 30)
+    for i in range(100):
+        time = start + timedelta(seconds=i)
+        recording.write("InterBeatInterval", 1000 + i, time)
+        recording.write("HeartRateVariability", 50.5, time)
+    recording.write("PacerRate", 5.5, start)
+    recording.write("Annotation", "eyes closed, relaxed", start)
+    recording.write("Sensors", "Polar H10, 00:11:22", start)
+    recording.close()
+
+    paths = export_parquet(manifest_path(path), str(tmp_path), row_group_size=32)
+    tables = {p.split("/")[-1]: pq.ParquetFile(p) for p in paths}
+
+    beats = tables["beats.parquet"]
+    assert beats.metadata.num_rows == 100
+    assert beats.metadata.num_row_groups == 4  # streamed in row groups
+    beats = beats.read()
+    assert str(beats.schema.field("ibi").type) == "int32"
+    assert beats.column("ibi").to_pylist() == list(range(1000, 1100))
+    assert beats.column("timestamp")[1].as_py() == start + timedelta(seconds=1)
+
+    assert tables["hrv.parquet"].read().column("hrv").to_pylist() == [50.5] * 100
+    assert tables["settings.parquet"].read().to_pylist() == [
+        {"timestamp": start, "setting": "PacerRate", "value": 5.5}
+    ]
+    assert tables["annotations.parquet"].read().column("annotation").to_pylist() == [
+        "eyes closed, relaxed"
+    ]
+    assert tables["events.parquet"].read().column("value").to_pylist() == [
+        "Polar H10, 00:11:22"
+    ]
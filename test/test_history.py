@@ -0,0 +1,33 @@
+"""Tests for the multi-resolution HRV history."""
+
+from openhrv.history import DecimatedHistory
+
+
+def test_recent_samples_are_selected_at_full_resolution():
+    history = DecimatedHistory(capacity=100, n_levels=4, factor=4)
+    for i in range(1000):
+        history.append(float(i), float(i % 7))
+    times, values = history.select(start=950.0, max_points=100)
+    assert times == [float(i) for i in range(950, 1000)]
+    assert values == [float(i % 7) for i in range(950, 1000)]
+
+
+def test_long_history_is_decimated_to_max_points_keeping_extremes():
+    history = DecimatedHistory(capacity=100, n_levels=5, factor=4)
+    n_samples = 10_000
+    for i in range(n_samples):
+        history.append(float(i), 500.0 if i == 1234 else 100.0)
+    times, values = history.select(start=0.0, max_points=200)
+    assert 0 < len(times) <= 200
+    assert times == sorted(times)
+    assert times[0] < 100 and times[-1] > n_samples - 100  # spans whole session
+    assert max(values) == 500.0  # a single peak survives decimation
+    assert 1234.0 in times
+
+
+def test_select_falls_back_to_coarsest_level():
+    history = DecimatedHistory(capacity=10, n_levels=2, factor=2)
+    for i in range(101):
+        history.append(float(i), 1.0)
+    times, _ = history.select(start=0.0, max_points=5)
+    assert len(times) == 2 * 10 + 2  # 10 full buckets plus partial bucket
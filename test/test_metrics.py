@@ -0,0 +1,69 @@
+"""Tests for time-domain HRV metrics over sliding windows."""
+
+import math
+import statistics
+
+import pytest
+
+from openhrv import config
+from openhrv.metrics import SlidingWindowMetrics
+from openhrv.model import Model
+from openhrv.simulator import SignalSimulator
+
+
+def test_sliding_window_metrics_match_recomputation():
+    window = 30
+    metrics = SlidingWindowMetrics(window)
+    ibis = SignalSimulator(rsa_range=150, noise=20, seed=0).ibis(300)
+    for i, ibi in enumerate(ibis):
+        metrics.update(ibi)
+        # Most recent IBIs that span at most `window` seconds.
+        in_window = []
+        for recent_ibi in reversed(ibis[: i + 1]):
+            if sum(in_window) + recent_ibi > window * 1000 and in_window:
+                break
+            in_window.insert(0, recent_ibi)
+        if len(in_window) < 3:
+            continue
+        diffs = [b - a for a, b in zip(in_window, in_window[1:])]
+        if i >= len(in_window):  # diff to the IBI preceding the window counts
+            diffs.insert(0, in_window[0] - ibis[i - len(in_window)])
+        assert metrics.mean_hr() == pytest.approx(60_000 / statistics.mean(in_window))
+        assert metrics.sdnn() == pytest.approx(statistics.stdev(in_window))
+        assert metrics.rmssd() == pytest.approx(
+            math.sqrt(statistics.mean(d * d for d in diffs))
+        )
+        assert metrics.pnn50() == pytest.approx(
+            100 * sum(abs(d) > 50 for d in diffs) / len(diffs)
+        )
+
+
+def test_gap_has_no_successive_difference():
+    metrics = SlidingWindowMetrics(60)
+    for ibi in [800, 820, 800]:
+        metrics.update(ibi)
+    metrics.mark_gap()
+    metrics.update(1200)
+    assert metrics.rmssd() == 20.0
+    assert metrics.pnn50() == 0.0
+
+
+def test_model_emits_metrics_per_window(qapp):
+    model = Model()
+    events = {}
+    n_events = 0
+
+    def collect(event):
+        nonlocal n_events
+        events[event.name] = event.value
+        n_events += 1
+
+    model.metrics_update.connect(collect)
+    for ibi in SignalSimulator(mean_ibi=1000, rsa_range=0, seed=0).ibis(100):
+        model.update_ibis_buffer(ibi)
+    assert len(events) == 4 * len(config.METRICS_WINDOWS)
+    # Emitted every METRICS_INTERVAL seconds, rather than every beat.
+    n_intervals = 100 // config.METRICS_INTERVAL
+    assert n_events == n_intervals * len(events)
+    assert events["MeanHR_60s"] == 60.0
+    assert events["RMSSD_30s"] == 0.0
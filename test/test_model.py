@@ -0,0 +1,117 @@
+"""Tests for the model's handling of IBI and HRV data."""
+
+import tracemalloc
+
+import pytest
+
+from openhrv import config
+from openhrv.app import parse_args
+from openhrv.model import Model
+from openhrv.simulator import SignalSimulator
+from openhrv.view import View
+
+
+def test_history_durations_resize_buffers_keeping_recent_samples(qapp):
+    model = Model()
+    for ibi in SignalSimulator(seed=0).ibis(300):
+        model.update_ibis_buffer(ibi)
+    recent_ibis = list(model.ibis_buffer)[-50:]
+    recent_seconds = list(model.ibis_seconds)[-50:]
+
+    model.update_ibi_history_duration(20)
+    size = config.history_buffer_size(20)
+    assert len(model.ibis_buffer) == len(model.ibis_seconds) == size
+    assert list(model.ibis_buffer)[-50:] == recent_ibis
+    assert list(model.ibis_seconds)[-50:] == recent_seconds
+
+    model.update_ibi_history_duration(300)
+    size = config.history_buffer_size(300)
+    assert len(model.ibis_buffer) == len(model.ibis_seconds) == size
+    assert list(model.ibis_buffer)[-50:] == recent_ibis
+    seconds = list(model.ibis_seconds)
+    assert seconds == sorted(seconds)  # padding precedes the recent samples
+
+    hrv_buffer = model.hrv_buffer
+    model.update_hrv_history_duration(10800)  # plotted from the HRV history
+    assert model.hrv_buffer is hrv_buffer
+    assert len(model.hrv_buffer) == config.HRV_BUFFER_SIZE
+    model.update_ibis_buffer(900)  # buffers keep working after resizing
+    assert len(model.ibis_buffer) == size
+
+
+def test_ibi_history_is_limited_to_the_menu_durations(qapp):
+    assert parse_args(["--ibi-history", "300"]).ibi_history == 300
+    with pytest.raises(SystemExit):
+        parse_args(["--ibi-history", "3600"])
+    assert parse_args(["--hrv-history", "3600"]).hrv_history == 3600
+
+
+def test_reset_buffers_preserves_history_durations(qapp):
+    model = Model()
+    model.update_ibi_history_duration(30)
+    model.reset_buffers()
+    assert model.ibi_history_duration == 30
+    assert len(model.ibis_buffer) == config.history_buffer_size(30)
+
+
+def test_gap_restarts_local_hrv_and_is_marked(qapp):
+    model = Model()
+    local_hrvs = []
+    update_hrv_buffer = model.update_hrv_buffer
+    model.update_hrv_buffer = lambda hrv: (
+        local_hrvs.append(hrv),
+        update_hrv_buffer(hrv),
+    )
+    gaps = []
+    model.gap_update.connect(gaps.append)
+
+    model.mark_gap()  # no data yet, nothing to mark
+    for ibi in SignalSimulator(mean_ibi=900, rsa_range=100, seed=0).ibis(100):
+        model.update_ibis_buffer(ibi)
+    n_before_gap = len(local_hrvs)
+    model.mark_gap()
+    model.mark_gap()  # marking is idempotent
+    # Heart rate changed while disconnected.
+    for ibi in SignalSimulator(mean_ibi=700, rsa_range=100, seed=1).ibis(100):
+        model.update_ibis_buffer(ibi)
+
+    assert len(gaps) == 1
+    assert gaps[0].name == "Gap" and gaps[0].value >= 0
+    assert max(local_hrvs[n_before_gap:]) < 150
+
+
+def test_beats_dont_allocate_beyond_the_new_samples(qapp):
+    """Once the buffers are full, a beat replaces the oldest samples, rather
+    than allocating copies of the buffers, in the model as well as in the
+    view's plots (see PlotWidget.update_series)."""
+    model = Model()
+    view = View(model)
+    hrvs = []
+    model.hrv_update.connect(lambda _: hrvs.append(None))
+    n_beats = 400
+    ibis = SignalSimulator(rsa_range=100, seed=0).ibis(600 + n_beats)
+    only_openhrv = [
+        tracemalloc.Filter(True, "*/openhrv/*"),
+        # Holds the HRV of the whole session, i.e., grows by design.
+        tracemalloc.Filter(False, "*/openhrv/history.py"),
+    ]
+    try:
+        view.show()
+        qapp.processEvents()
+        assert view.is_rendering()  # beats are plotted
+        tracemalloc.start()
+        for ibi in ibis[:600]:  # fill the buffers with traced samples
+            model.update_ibis_buffer(ibi)
+        before = tracemalloc.take_snapshot().filter_traces(only_openhrv)
+        hrvs.clear()
+        for ibi in ibis[600:]:
+            model.update_ibis_buffer(ibi)
+        after = tracemalloc.take_snapshot().filter_traces(only_openhrv)
+    finally:
+        tracemalloc.stop()
+        view.close()
+    n_blocks = sum(stat.count_diff for stat in after.compare_to(before, "lineno"))
+    # The HRV history keeps the time and value of each HRV sample. Beyond that,
+    # the only blocks retained are freed floats that CPython keeps for reuse (at
+    # most 100), whereas a copy of a buffer retains hundreds of blocks.
+    assert (n_blocks - 2 * len(hrvs)) / n_beats < 0.5
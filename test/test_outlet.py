@@ -0,0 +1,65 @@
+"""Tests for publishing timestamped samples to subscribers."""
+
+from openhrv.outlet import Inlet, Outlet, local_clock
+from openhrv.utils import NamedSignal
+
+
+def test_outlet_delivers_samples_stamped_when_pushed():
+    outlet = Outlet(0)
+    outlet.start()
+    inlet = Inlet(outlet.address())
+    try:
+        inlet.subscribe()
+        assert inlet.time_correction() is not None  # subscription was processed
+        before = local_clock()
+        outlet.push(NamedSignal("InterBeatInterval", ([-0.9, 0.0], [880, 912])))
+        outlet.push(NamedSignal("PacerRadius", 0.5))
+        after = local_clock()
+
+        stream, value, timestamp = inlet.pull_sample()
+        assert (stream, value) == ("InterBeatInterval", 912)
+        assert before <= timestamp <= after
+        assert inlet.pull_sample()[:2] == ("PacerRadius", 0.5)
+    finally:
+        inlet.close()
+        outlet.close()
+
+
+def test_time_correction_estimates_clock_offset():
+    outlet = Outlet(0)
+    outlet.start()
+    inlet = Inlet(outlet.address())
+    try:
+        # Outlet and inlet share the clock, so the offset is close to zero.
+        offset = inlet.time_correction(n_probes=4)
+        assert abs(offset) < 0.01
+    finally:
+        inlet.close()
+        outlet.close()
+
+
+def test_malformed_datagrams_are_ignored():
+    outlet = Outlet(0)
+    outlet.start()
+    inlet = Inlet(outlet.address())
+    try:
+        inlet.socket.sendto(b"[1, 2]", outlet.address())  # JSON, but no message
+        inlet.socket.sendto(b"not JSON", inlet.socket.getsockname())
+        assert inlet.time_correction(n_probes=1) is not None
+    finally:
+        inlet.close()
+        outlet.close()
+
+
+def test_closing_the_view_disconnects_the_outlet(qapp):
+    from openhrv.model import Model
+    from openhrv.view import View
+
+    model = Model()
+    view = View(model)
+    view.start_outlet(0)
+    outlet = view.outlet
+    view.close()
+    assert view.outlet is None
+    model.update_ibis_buffer(1000)  # isn't pushed to the closed outlet
+    outlet.push(NamedSignal("PacerRadius", 0.5))  # dropped
@@ -0,0 +1,34 @@
+"""Tests for profiling real sessions."""
+
+import csv
+
+from openhrv.app import parse_args
+from openhrv.model import Model
+from openhrv.profiling import STATS, profiler
+from openhrv.view import View
+
+
+def test_profiling_times_slots_while_enabled(qapp, tmp_path):
+    path = str(tmp_path / "profile.csv")
+    assert parse_args(["--profile", path]).profile == path
+    model = Model()
+    view = View(model)
+    try:
+        model.update_ibis_buffer(1000)  # not profiled yet
+        assert STATS["Model.update_ibis_buffer"][0] == 0
+
+        view.start_profiling(path)
+        for _ in range(10):
+            model.update_ibis_buffer(1000)
+        view.toggle_profiling()  # stop
+        model.update_ibis_buffer(1000)
+    finally:
+        view.close()
+
+    with open(path) as f:
+        assert f.readline().startswith("# profiled for")
+        rows = {row["slot"]: row for row in csv.DictReader(f)}
+    assert rows["Model.update_ibis_buffer"]["calls"] == "10"
+    assert float(rows["Model.update_ibis_buffer"]["mean_ms"]) > 0
+    assert rows["View.plot_ibis"]["calls"] == "10"
+    assert not profiler.enabled
@@ -0,0 +1,163 @@
+"""Tests for recording sessions to segmented CSV files."""
+
+import json
+import os
+
+import pytest
+from datetime import datetime, timedelta
+
+from openhrv.logger import Logger
+from openhrv.recording import (
+    HEADER,
+    RecordingReader,
+    SegmentedRecording,
+    index_path,
+    manifest_path,
+    read_manifest,
+    read_recording,
+)
+from openhrv.utils import NamedSignal
+
+
+def test_recording_rotates_segments_by_size_and_duration(tmp_path):
+    path = str(tmp_path / "session.csv")
+    recording = SegmentedRecording(path, max_bytes=1024, max_duration=60)
+    start = datetime(2025, 12, 19, 14, 30)
+    for i in range(100):  # 40 bytes per row, rotate after ~25 rows
+        recording.write("InterBeatInterval", 1000, start + timedelta(seconds=i / 10))
+    recording.write("InterBeatInterval", 1000, start + timedelta(seconds=100))
+    recording.close()
+
+    segments = read_manifest(manifest_path(path))
+    assert segments[0] == path
+    assert len(segments) == 6  # 4 by size, another one after more than 60 sec
+    rows = []
+    for segment in segments:
+        with open(segment) as f:
+            assert f.readline() == HEADER
+            rows.extend(f.readlines())
+    assert len(rows) == 101
+    assert rows == sorted(rows, key=lambda row: row.split(",")[2])
+
+    with open(manifest_path(path)) as f:
+        manifest = json.load(f)
+    assert manifest["complete"]
+    assert sum(segment["events"] for segment in manifest["segments"]) == 101
+    assert (
+        manifest["segments"][-1]["start"]
+        == (start + timedelta(seconds=100)).isoformat()
+    )
+
+
+def test_logger_writes_rows_in_batches(qapp, tmp_path):
+    path = str(tmp_path / "session.csv")
+    logger = Logger()
+    logger.start_recording(path)
+    logger.write_to_file(NamedSignal("InterBeatInterval", ([0.0], [900])))
+    with open(path) as f:
+        assert f.read() == HEADER  # queued, not written yet
+    with open(manifest_path(path)) as f:
+        assert not json.load(f)["complete"]
+
+    logger.recording.flush()  # e.g., by the timer
+    with open(path) as f:
+        assert f.read().startswith(f"{HEADER}InterBeatInterval,900,")
+    logger.write_to_file(NamedSignal("Annotation", "eyes closed"))
+    logger.save_recording()
+    with open(path) as f:
+        assert len(f.readlines()) == 3
+    with open(manifest_path(path)) as f:
+        assert json.load(f)["complete"]
+
+
+@pytest.mark.parametrize("extension", [".csv.gz", ".csv.xz"])
+def test_compressed_recording_is_readable_up_to_last_batch(tmp_path, extension):
+    path = str(tmp_path / f"session{extension}")
+    recording = SegmentedRecording(path, max_bytes=1024, queue_size=10)
+    start = datetime(2025, 12, 19, 14, 30)
+    for i in range(50):
+        recording.write("InterBeatInterval", 1000 + i, start + timedelta(seconds=i))
+    recording.write("Annotation", "eyes closed, relaxed", start)
+    recording.close()
+
+    segments = read_manifest(manifest_path(path))
+    assert manifest_path(path) == str(tmp_path / "session.json")
+    assert segments[1] == str(tmp_path / f"session.2{extension}")
+    rows = list(read_recording(manifest_path(path)))
+    assert len(rows) == 51
+    assert rows[0] == ("InterBeatInterval", "1000", start.isoformat())
+    assert rows[-1] == ("Annotation", "eyes closed, relaxed", start.isoformat())
+
+    n_rows = sum(1 for _ in read_recording(segments[0]))
+    with open(segments[0], "rb") as f:  # simulate crash while writing a batch
+        data = f.read()
+    magic = {".csv.gz": b"\x1f\x8b", ".csv.xz": b"\xfd7zXZ\x00"}[extension]
+    last_batch = data.rfind(magic)
+    with open(segments[0], "wb") as f:
+        f.write(data[: (last_batch + len(data)) // 2])
+    assert n_rows - 10 <= sum(1 for _ in read_recording(segments[0])) < n_rows
+
+
+def test_reader_seeks_with_time_index(tmp_path):
+    path = str(tmp_path / "session.csv")
+    recording = SegmentedRecording(path, max_bytes=4096, index_interval=60)
+    start = datetime(2025, 12, 19, 14, 30)
+    for i in range(600):
+        recording.write("InterBeatInterval", 1000, start + timedelta(seconds=i))
+    recording.close()
+
+    reader = RecordingReader(path, index_interval=30)  # scans first segment
+    row_length = len("InterBeatInterval,1000,2025-12-19T14:30:00\n")
+    assert reader.index[1] == (30.0, 0, 0, len(HEADER) + 30 * row_length)
+    assert 0 < reader.duration < 599
+
+    reader = RecordingReader(manifest_path(path), index_interval=60)  # loads index
+    assert reader.duration == 599
+    assert len(reader.paths) > 1
+    assert [seconds for seconds, _, _, _ in reader.index] == list(range(0, 600, 60))
+    assert [seconds for seconds, _, _ in reader.rows(450.5)] == list(range(451, 600))
+    assert [seconds for seconds, _, _ in reader.rows(100, 103)] == [100, 101, 102]
+    assert len(list(reader.rows())) == 600
+
+
+def test_index_offsets_are_exact_with_non_ascii_values(tmp_path):
+    path = str(tmp_path / "session.csv.xz")
+    recording = SegmentedRecording(path, index_interval=1)
+    start = datetime(2025, 12, 19, 14, 30)
+    for i in range(20):
+        recording.write("Annotation", "Atemübung, ruhig", start + timedelta(seconds=i))
+    with open(index_path(path)) as f:
+        assert len(f.readlines()) == 1  # entries are written with their rows
+    recording.flush()
+    recording.close()
+
+    with open(index_path(path)) as f:
+        assert len(f.readlines()) == 21
+    reader = RecordingReader(manifest_path(path))
+    assert list(reader.rows(19)) == [(19.0, "Annotation", "Atemübung, ruhig")]
+
+
+def test_existing_segment_leaves_no_index_behind(tmp_path):
+    path = tmp_path / "session.csv"
+    path.write_text("recorded earlier\n")
+    with pytest.raises(FileExistsError):
+        SegmentedRecording(str(path))
+    assert not os.path.exists(index_path(str(path)))
+    assert path.read_text() == "recorded earlier\n"
+
+
+@pytest.mark.parametrize("extension", [".csv.gz", ".csv.xz"])
+def test_index_decompresses_from_the_batch_of_the_position(tmp_path, extension):
+    path = str(tmp_path / f"session{extension}")
+    recording = SegmentedRecording(path, queue_size=10, index_interval=10)
+    start = datetime(2025, 12, 19, 14, 30)
+    for i in range(100):
+        recording.write("InterBeatInterval", 1000, start + timedelta(seconds=i))
+    recording.close()
+    reader = RecordingReader(manifest_path(path))
+    assert [batch > 0 for _, _, batch, _ in reader.index] == [True] * 10
+
+    with open(path, "r+b") as f:  # corrupt all batches before the last one
+        f.seek(reader.index[0][2])
+        f.write(b"\0" * (reader.index[-1][2] - reader.index[0][2]))
+    assert [seconds for seconds, _, _ in reader.rows(95)] == list(range(95, 100))
@@ -0,0 +1,125 @@
+"""Tests for replaying recordings."""
+
+import math
+import time
+from datetime import datetime, timedelta
+
+from openhrv.app import parse_args
+from openhrv.config import breathing_rate_to_tick
+from openhrv.model import Model
+from openhrv.recording import SegmentedRecording
+from openhrv.replay import ReplayClient
+from openhrv.view import View
+
+
+def record_session(path: str, n_beats: int) -> None:
+    recording = SegmentedRecording(path)
+    start = datetime(2025, 12, 19, 14, 30)
+    recording.write("PacerRate", 5.5, start)
+    for i in range(n_beats):
+        recording.write(
+            "InterBeatInterval", 900 + i % 3 * 50, start + timedelta(seconds=i)
+        )
+        recording.write("HeartRateVariability", 80.0, start + timedelta(seconds=i))
+    recording.write(
+        "Annotation", "eyes closed, relaxed", start + timedelta(seconds=n_beats)
+    )
+    recording.close()
+
+
+def replay(qapp, replay_client: ReplayClient, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while replay_client.is_replaying() and time.monotonic() < deadline:
+        qapp.processEvents()
+
+
+def test_replay_at_max_speed_drives_model(qapp, tmp_path):
+    path = str(tmp_path / "session.csv")
+    record_session(path, 300)
+    model = Model()
+    ibis = []
+    replay_client = ReplayClient()
+    replay_client.ibi_update.connect(ibis.append)
+    replay_client.ibi_update.connect(model.update_ibis_buffer)
+    rates, annotations = [], []
+    replay_client.pacer_rate_update.connect(rates.append)
+    replay_client.annotation_update.connect(annotations.append)
+
+    replay_client.start(path, math.inf)
+    replay(qapp, replay_client)
+    assert not replay_client.is_replaying()
+    assert len(ibis) == 300
+    assert list(model.ibis_buffer)[-3:] == ibis[-3:]
+    assert rates == [5.5]
+    assert annotations == ["eyes closed, relaxed"]
+
+
+def test_replay_seeks_and_paces(qapp, tmp_path):
+    assert math.isinf(parse_args(["--replay-speed", "max"]).replay_speed)
+    path = str(tmp_path / "session.csv")
+    record_session(path, 300)
+    ibis = []
+    replay_client = ReplayClient()
+    replay_client.ibi_update.connect(ibis.append)
+
+    replay_client.start(path, 100.0)  # 300 seconds in 3 seconds
+    replay_client.seek(290.0)
+    started = time.monotonic()
+    replay(qapp, replay_client)
+    elapsed = time.monotonic() - started
+    assert len(ibis) == 10
+    assert 0.05 < elapsed < 2.0  # about 10 seconds at 100x
+
+
+def test_view_replays_recording(qapp, tmp_path):
+    path = str(tmp_path / "session.csv")
+    record_session(path, 100)
+    view = View(Model())
+    try:
+        view.start_replay(path, math.inf)
+        assert view.replaying and view.stop_replay_button.isEnabled()
+        view.enter_idle_mode()
+        assert not view.idle  # replaying, i.e., not idle
+        replay(qapp, view.replay)
+        assert view.replay_position.maximum() == 100
+        assert not view.replay_position.isEnabled()
+        assert not view.replaying and not view.stop_replay_button.isEnabled()
+        assert view.pacer_rate.value() == breathing_rate_to_tick(5.5)
+        assert view.model.ibis_buffer[-1] in (900, 950, 1000)
+    finally:
+        view.close()
+
+
+def test_stopped_replay_ignores_loaded_recording(qapp, tmp_path):
+    path = str(tmp_path / "session.csv")
+    record_session(path, 100)
+    view = View(Model())
+    ibis = []
+    view.replay.ibi_update.connect(ibis.append)
+    try:
+        view.start_replay(path, math.inf)
+        view.stop_replay()  # before the recording is loaded
+        assert not view.replaying and not view.replay.is_replaying()
+        deadline = time.monotonic() + 1.0
+        while time.monotonic() < deadline:
+            qapp.processEvents()
+        assert not view.replay.is_replaying()
+        assert not view.replay_position.isEnabled()
+        assert ibis == []
+    finally:
+        view.close()
+
+
+def test_replay_reports_corrupt_recording(qapp, tmp_path):
+    path = tmp_path / "session.csv.xz"
+    path.write_bytes(b"not xz")
+    replay_client = ReplayClient()
+    statuses, finished = [], []
+    replay_client.status_update.connect(statuses.append)
+    replay_client.replay_finished.connect(lambda: finished.append(True))
+
+    replay_client.start(str(path))
+    replay(qapp, replay_client)
+    assert not replay_client.is_replaying()
+    assert finished == [True]
+    assert statuses[-1].startswith(f"Couldn't replay {path}")
@@ -0,0 +1,62 @@
+"""Tests for sensor discovery without Bluetooth hardware."""
+
+from PySide6.QtBluetooth import (
+    QBluetoothAddress,
+    QBluetoothDeviceInfo,
+    QBluetoothUuid,
+)
+
+from openhrv import config
+from openhrv.sensor import SensorClient, SensorScanner, is_compatible_sensor
+
+
+def le_device(address: str, name: str, service_uuids=()) -> QBluetoothDeviceInfo:
+    device = QBluetoothDeviceInfo(QBluetoothAddress(address), name, 0)
+    device.setCoreConfigurations(
+        QBluetoothDeviceInfo.CoreConfiguration.LowEnergyCoreConfiguration
+    )
+    device.setServiceUuids(list(service_uuids))
+    return device
+
+
+HEART_RATE = QBluetoothUuid(QBluetoothUuid.ServiceClassUuid.HeartRate)
+BATTERY = QBluetoothUuid(QBluetoothUuid.ServiceClassUuid.BatteryService)
+
+
+def test_sensors_are_identified_by_heart_rate_service():
+    assert is_compatible_sensor(le_device("00:11:22:33:44:55", "Strap", [HEART_RATE]))
+    assert not is_compatible_sensor(
+        le_device("00:11:22:33:44:55", "Polar H10", [BATTERY])
+    )
+    # Without advertised services, fall back to identifying sensors by name.
+    assert is_compatible_sensor(le_device("00:11:22:33:44:55", "Polar H10"))
+    assert not is_compatible_sensor(le_device("00:11:22:33:44:55", "Headphones"))
+
+
+def test_scanner_reports_sensors_as_they_are_discovered(qapp):
+    scanner = SensorScanner()
+    updates = []
+    scanner.sensor_update.connect(updates.append)
+    scanner._handle_discovered_sensor(le_device("00:11:22:33:44:55", "A", [HEART_RATE]))
+    scanner._handle_discovered_sensor(le_device("00:11:22:33:44:55", "A", [HEART_RATE]))
+    scanner._handle_discovered_sensor(le_device("00:11:22:33:44:66", "Mouse"))
+    scanner._handle_discovered_sensor(le_device("00:11:22:33:44:77", "B", [HEART_RATE]))
+    assert [[s.name() for s in sensors] for sensors in updates] == [["A"], ["A", "B"]]
+
+
+def test_sensor_client_backs_off_exponentially(qapp):
+    client = SensorClient()
+    delays = []
+    for _ in range(8):
+        client._schedule_reconnect()
+        delays.append(client.reconnect_timer.interval())
+    client.reconnect_timer.stop()
+    assert delays[:3] == [
+        config.RECONNECT_INITIAL_DELAY,
+        2 * config.RECONNECT_INITIAL_DELAY,
+        4 * config.RECONNECT_INITIAL_DELAY,
+    ]
+    assert delays[-1] == config.RECONNECT_MAX_DELAY
+
+    client.disconnect_client()  # user disconnects, stop reconnecting
+    assert not client.reconnect
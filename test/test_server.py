@@ -0,0 +1,79 @@
+"""Tests for streaming events to subscribers."""
+
+import json
+
+from PySide6.QtCore import QCoreApplication, QElapsedTimer
+from PySide6.QtNetwork import QTcpSocket, QHostAddress
+
+from openhrv.config import STREAM_QUEUE_SIZE
+from openhrv.server import StreamClient, StreamServer
+from openhrv.utils import NamedSignal
+
+
+def process_events_until(condition, timeout=2000):
+    timer = QElapsedTimer()
+    timer.start()
+    while not condition() and timer.elapsed() < timeout:
+        QCoreApplication.processEvents()
+    return condition()
+
+
+def test_server_fans_out_newline_delimited_json(qapp):
+    server = StreamServer()
+    server.listen("127.0.0.1", 0)
+    server.publish(NamedSignal("PacerRate", 6.0))
+    subscribers = [QTcpSocket() for _ in range(3)]
+    for subscriber in subscribers:
+        subscriber.connectToHost(QHostAddress.LocalHost, server.port())
+    try:
+        assert process_events_until(lambda: len(server.clients) == 3)
+        server.publish(NamedSignal("InterBeatInterval", ([-0.9, 0.0], [880, 912])))
+        server.publish(NamedSignal("Annotation", "eyes closed"))
+        for subscriber in subscribers:
+            assert process_events_until(
+                lambda: subscriber.bytesAvailable()
+                and bytes(subscriber.peek(1 << 16)).count(b"\n") == 3
+            )
+            frames = [
+                json.loads(line) for line in bytes(subscriber.readAll()).splitlines()
+            ]
+            assert [(f["event"], f["value"]) for f in frames] == [
+                ("PacerRate", 6.0),  # sent on connection
+                ("InterBeatInterval", 912),
+                ("Annotation", "eyes closed"),
+            ]
+    finally:
+        for subscriber in subscribers:
+            subscriber.abort()
+        server.close()
+
+
+class StalledSocket:
+    """Socket whose write buffer never drains."""
+
+    def __init__(self):
+        self.written = []
+
+    def bytesToWrite(self):
+        return 1 << 30
+
+    def write(self, frame):
+        self.written.append(frame)
+
+
+def test_slow_client_drops_oldest_frames(qapp):
+    client = StreamClient(StalledSocket())
+    frames = [f"{i}\n".encode() for i in range(STREAM_QUEUE_SIZE + 10)]
+    for frame in frames:
+        client.send(frame)
+    assert not client.socket.written
+    assert list(client.queue) == frames[10:]
+    assert client.dropped == 10
+
+    client.socket.bytesToWrite = lambda: 0  # subscriber caught up
+    client.flush()
+    dropped, *written = client.socket.written
+    assert json.loads(dropped)["event"] == "Dropped"
+    assert json.loads(dropped)["value"] == 10
+    assert written == frames[10:]
+    assert client.dropped == 0
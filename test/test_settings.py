@@ -0,0 +1,53 @@
+"""Tests for persisting settings and the last connected sensor."""
+
+from PySide6.QtCore import QSettings
+
+from openhrv import config
+from openhrv.model import Model
+from openhrv.utils import get_sensor_address
+from openhrv.view import View
+
+from app import MockSensor
+
+
+def ini_settings(path) -> QSettings:
+    return QSettings(str(path / "OpenHRV.ini"), QSettings.IniFormat)
+
+
+def test_settings_are_restored(qapp, tmp_path):
+    model = Model(ini_settings(tmp_path))
+    model.update_breathing_rate(config.breathing_rate_to_tick(5.5))
+    model.update_hrv_target(250)
+    model.update_ibi_history_duration(30)
+    sensor = MockSensor()
+    model.update_last_sensor(sensor)
+    model.settings.sync()
+
+    restored = Model(ini_settings(tmp_path))
+    assert restored.breathing_rate == 5.5
+    assert restored.hrv_target == 250
+    assert restored.ibi_history_duration == 30
+    assert len(restored.ibis_buffer) == config.history_buffer_size(30)
+    assert restored.last_sensor == ("MockSensor", get_sensor_address(sensor))
+
+
+def test_invalid_settings_fall_back_to_defaults(qapp, tmp_path):
+    settings = ini_settings(tmp_path)
+    settings.setValue("hrv_target", 10 * config.MAX_HRV_TARGET)
+    settings.setValue("breathing_rate", "fast")
+    model = Model(settings)
+    assert model.hrv_target == Model().hrv_target
+    assert model.breathing_rate == Model().breathing_rate
+
+
+def test_view_offers_last_sensor_without_scanning(qapp, tmp_path):
+    address = get_sensor_address(MockSensor())
+    settings = ini_settings(tmp_path)
+    settings.setValue("last_sensor_name", "Polar H10")
+    settings.setValue("last_sensor_address", address)
+    view = View(Model(settings))
+    try:
+        assert view.address_menu.currentText().lower() == f"polar h10, {address}"
+        assert get_sensor_address(view.model.sensors[0]).lower() == address
+    finally:
+        view.close()
@@ -0,0 +1,63 @@
+"""Tests for the synthetic signal generator and the model fed with it."""
+
+from itertools import islice
+
+import pytest
+
+from openhrv import config
+from openhrv.model import Model
+from openhrv.sensor import decode_ibis
+from openhrv.simulator import SignalSimulator, encode_heart_rate_measurement
+
+
+def test_packets_roundtrip_through_decoder():
+    simulator = SignalSimulator(noise=20, ectopic_probability=0.1, seed=1)
+    for (_, ibis), (_, packet) in zip(
+        islice(simulator.bundles(), 100),
+        islice(
+            SignalSimulator(noise=20, ectopic_probability=0.1, seed=1).packets(), 100
+        ),
+    ):
+        # 1/1024 sec format loses at most one millisecond.
+        assert all(abs(a - b) <= 1 for a, b in zip(decode_ibis(packet), ibis))
+        assert len(decode_ibis(packet)) == len(ibis)
+
+
+def test_packet_without_ibis_decodes_to_nothing():
+    assert decode_ibis(encode_heart_rate_measurement([], 60)) == []
+
+
+def test_simulator_is_reproducible_with_seed():
+    kwargs = dict(noise=10, missed_probability=0.05, dropout_probability=0.05, seed=42)
+    assert SignalSimulator(**kwargs).ibis(500) == SignalSimulator(**kwargs).ibis(500)
+
+
+def test_model_hrv_settles_at_rsa_range(qapp):
+    model = Model()
+    for ibi in SignalSimulator(rsa_range=100, seed=0).ibis(2000):
+        model.update_ibis_buffer(ibi)
+    assert abs(model.ewma_hrv - 100) < 10
+
+
+def test_model_keeps_values_in_range_under_artifacts(qapp):
+    simulator = SignalSimulator(
+        noise=30,
+        lf_range=80,
+        ectopic_probability=0.1,
+        missed_probability=0.1,
+        dropout_probability=0.05,
+        seed=3,
+    )
+    model = Model()
+    for ibi in simulator.ibis(5000):
+        model.update_ibis_buffer(ibi)
+        assert config.MIN_IBI <= model.ibis_buffer[-1] <= config.MAX_IBI
+    assert all(hrv <= config.MAX_HRV_TARGET for hrv in model.hrv_buffer)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"missed_probability": 1}, {"dropout_probability": 1}]
+)
+def test_simulator_rejects_probabilities_that_never_yield(kwargs):
+    with pytest.raises(ValueError):
+        SignalSimulator(**kwargs)
@@ -0,0 +1,141 @@
+"""Tests for rendering the charts and the pacer."""
+
+from collections import deque
+
+from PySide6.QtCore import Qt, QEvent, QAbstractAnimation, QPointF
+from PySide6.QtGui import QKeyEvent
+from openhrv.app import parse_args
+from openhrv.model import Model
+from openhrv.plot import PlotWidget, PacerWidget, BLUE
+from openhrv.view import View
+
+
+def test_opengl_renderer_falls_back_to_software_offscreen(qapp):
+    assert parse_args(["--renderer", "opengl"]).renderer == "opengl"
+    view = View(Model(), "opengl")
+    try:
+        assert isinstance(view.ibis_widget, PlotWidget)
+        assert isinstance(view.pacer_widget, PacerWidget)
+    finally:
+        view.close()
+
+
+def test_plot_widget_draws_series_over_cached_static_layer(qapp):
+    plot = PlotWidget([0.0, 1.0], [0.0, 1.0])
+    plot.resize(300, 200)
+    plot.x_axis.setRange(0, 1)
+    plot.y_axis.setRange(0, 1)
+    image = plot.grab().toImage()
+    static_layer = plot.static_layer
+    area = plot.plot_area()
+    center = area.center().toPoint()
+    assert image.pixelColor(center) == BLUE  # diagonal passes through center
+
+    plot.replace_series([0.0, 1.0], [1.0, 1.0])
+    image = plot.grab().toImage()
+    assert image.pixelColor(center) != BLUE
+    assert plot.static_layer is static_layer  # series updates reuse the cache
+    assert plot.polygon.size() == 2
+
+    plot.y_axis.setRange(0, 2)
+    plot.grab()
+    assert plot.static_layer is not static_layer
+
+
+def test_plot_widget_only_appends_new_points(qapp):
+    x_values, y_values = deque([0.0, 1.0, 2.0], 3), deque([5.0, 6.0, 7.0], 3)
+    plot = PlotWidget(x_values, y_values)
+    x_values.extend([3.0, 4.0])
+    y_values.extend([8.0, 9.0])
+    plot.update_series(x_values, y_values, -4.0)
+    assert plot.polygon.toList() == [QPointF(2, 7), QPointF(3, 8), QPointF(4, 9)]
+    assert plot.x_offset == -4.0
+    plot.update_series(x_values, y_values, -4.0)  # nothing new
+    assert plot.polygon.size() == 3
+
+    plot.update_series([0.0, 1.0, 2.0], [1.0, 1.0, 1.0])  # e.g., reset buffers
+    assert plot.polygon.toList() == [QPointF(0, 1), QPointF(1, 1), QPointF(2, 1)]
+
+
+def test_hrv_target_redraws_target_line(qapp):
+    view = View(Model())
+    try:
+        plot = view.hrv_widget
+        plot.resize(300, 200)
+        plot.grab()
+        static_layer = plot.static_layer
+        assert static_layer.devicePixelRatio() == plot.devicePixelRatioF()
+        assert plot.target == view.model.hrv_target
+        assert plot.y_axis.maximum > plot.target  # target line is visible
+
+        view.model.update_hrv_target(view.model.hrv_target + 50)
+        plot.grab()
+        assert plot.target == view.model.hrv_target
+        assert plot.static_layer is not static_layer
+    finally:
+        view.close()
+
+
+def test_pacer_animates_only_while_visible(qapp):
+    view = View(Model())
+    try:
+        assert view.pacer_animation.state() != QAbstractAnimation.Running
+        view.show()
+        assert view.pacer_animation.state() == QAbstractAnimation.Running
+
+        view.toggle_pacer()  # hide pacer
+        assert view.pacer_animation.state() != QAbstractAnimation.Running
+        view.toggle_pacer()
+        assert view.pacer_animation.state() == QAbstractAnimation.Running
+
+        view.showMinimized()
+        qapp.processEvents()
+        assert view.pacer_animation.state() != QAbstractAnimation.Running
+        view.showNormal()
+        qapp.processEvents()
+        assert view.pacer_animation.state() == QAbstractAnimation.Running
+    finally:
+        view.close()
+
+
+def test_idle_mode_pauses_pacer_until_interaction(qapp):
+    view = View(Model())
+    try:
+        view.show()
+        idle_updates = []
+        view.signals.idle.connect(idle_updates.append)  # the logger's flush timers
+        assert view.idle_timer.isActive()
+        view.idle_timer.timeout.emit()
+        assert view.idle
+        assert view.pacer_animation.state() != QAbstractAnimation.Running
+
+        key = QKeyEvent(QEvent.KeyPress, Qt.Key_Space, Qt.NoModifier)
+        qapp.sendEvent(view.windowHandle(), key)
+        assert not view.idle
+        assert view.pacer_animation.state() == QAbstractAnimation.Running
+        assert idle_updates == [True, False]
+
+        view.sensor.sensor_connected.emit(None)
+        assert not view.idle_timer.isActive()
+        view.sensor.sensor_disconnected.emit()
+        assert view.idle_timer.isActive()
+    finally:
+        view.close()
+
+
+def test_charts_catch_up_after_minimized(qapp):
+    view = View(Model())
+    try:
+        view.show()
+        view.showMinimized()
+        qapp.processEvents()
+        view.model.update_ibis_buffer(1200)
+        assert view.plots_stale
+        assert view.ibis_widget.polygon.last().y() != 1200
+
+        view.showNormal()
+        qapp.processEvents()
+        assert not view.plots_stale
+        assert view.ibis_widget.polygon.last().y() == 1200
+    finally:
+        view.close()